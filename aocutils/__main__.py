@@ -0,0 +1,221 @@
+"""
+Command line entry point: python -m aocutils run 15 --part 2 --input path
+
+Only the requested day module gets imported, heavier modules (process pool, generators, model cache)
+are imported by the sub-commands needing them.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from os.path import abspath, dirname, join
+from typing import Any, Optional
+
+from aocutils.aoc import Exercise, Verbosity
+
+ROOT_DIR = dirname(dirname(abspath(__file__)))
+PARTS = {1: 'part_one', 2: 'part_two'}
+
+
+def _verbosity(arguments: argparse.Namespace) -> Verbosity:
+    if arguments.quiet:
+        return Verbosity.QUIET
+    if arguments.verbose:
+        return Verbosity.DEBUG
+    return Verbosity.NORMAL
+
+
+def _use_model_cache(directory: Optional[str]) -> None:
+    if directory is None:
+        return
+
+    from aocutils.cache import DEFAULT_CACHE_DIR, ModelCache
+    Exercise.set_model_cache(ModelCache(directory or DEFAULT_CACHE_DIR))
+
+
+def _use_answer_store(file_path: Optional[str]) -> None:
+    if file_path is None:
+        return
+
+    from aocutils.cache import DEFAULT_ANSWER_STORE, AnswerStore
+    Exercise.set_answer_store(AnswerStore(file_path or DEFAULT_ANSWER_STORE))
+
+
+def run(arguments: argparse.Namespace) -> int:
+    from aocutils.days import input_file_path, load_exercise
+
+    Exercise.set_verbosity(_verbosity(arguments))
+    _use_model_cache(arguments.model_cache)
+    _use_answer_store(arguments.answer_store)
+    if arguments.profile is not None:
+        Exercise.set_profiling(arguments.profile, arguments.profile_mode)
+    exercise_class = load_exercise(arguments.day)
+    input_data = exercise_class.read_input(arguments.input or input_file_path(arguments.day),
+                                           streaming=arguments.stream)
+    try:
+        return _solve(exercise_class, input_data, arguments)
+    finally:
+        # Streamed inputs hold their file open until solving is done
+        if hasattr(input_data, 'close'):
+            input_data.close()
+
+
+def _solve(exercise_class: type[Exercise], input_data: Any, arguments: argparse.Namespace) -> int:
+    parts = [PARTS[part] for part in arguments.part] if arguments.part else list(PARTS.values())
+
+    if arguments.measure:
+        report = exercise_class.solve_measured(input_data, track_memory=arguments.memory, parts=parts)
+        report.write(sys.stdout, arguments.format)
+        return 0
+
+    answers = exercise_class.stored_answers(input_data, parts)
+    if answers is None:
+        exercise = exercise_class(input_data)
+        answers = {part: exercise.solve_part(part) for part in parts}
+    for part, answer in answers.items():
+        print(f"» Solution for {part.replace('_', ' ')} is {answer}.")
+    return 0
+
+
+def run_all(arguments: argparse.Namespace) -> int:
+    from aocutils.runner import run_days
+
+    report = run_days(arguments.days or None, arguments.workers, arguments.memory,
+                      model_cache_dir=arguments.model_cache, answer_store_path=arguments.answer_store)
+    report.write(sys.stdout, arguments.format)
+    return 1 if any(result.error is not None for result in report.results) else 0
+
+
+def bench(arguments: argparse.Namespace) -> int:
+    from aocutils.benchmark import DEFAULT_SCALE, Baseline, compare, run_benchmarks, write_comparisons
+
+    if os.path.exists(arguments.baseline):
+        baseline = Baseline.load(arguments.baseline)
+    elif arguments.update:
+        baseline = Baseline(arguments.scale or DEFAULT_SCALE)
+    else:
+        print(f'No baseline in {arguments.baseline}, record one with --update', file=sys.stderr)
+        return 2
+
+    scale = arguments.scale if arguments.scale is not None else baseline.scale
+    if scale != baseline.scale:
+        if not arguments.update:
+            print(f'Baseline was recorded at scale {baseline.scale}, not {scale}', file=sys.stderr)
+            return 2
+        baseline = Baseline(scale)
+
+    results = run_benchmarks(arguments.names or None, scale, arguments.rounds, not arguments.no_memory)
+    comparisons = compare(results, baseline, arguments.tolerance)
+    write_comparisons(comparisons, sys.stdout, arguments.format)
+    if arguments.update:
+        baseline.update(results)
+        baseline.save(arguments.baseline)
+        return 0
+    return 1 if any(comparison.regressed for comparison in comparisons) else 0
+
+
+def forget(arguments: argparse.Namespace) -> int:
+    from aocutils.cache import DEFAULT_ANSWER_STORE, AnswerStore
+    from aocutils.days import load_exercise
+
+    store = AnswerStore(arguments.answer_store or DEFAULT_ANSWER_STORE)
+    parts = [PARTS[part] for part in arguments.part] if arguments.part else [None]
+    exercises = [load_exercise(day).__qualname__ for day in arguments.days] if arguments.days else [None]
+    removed = sum(store.invalidate(exercise, part) for exercise in exercises for part in parts)
+    store.close()
+    print(f'{removed} stored answer(s) removed')
+    return 0
+
+
+def list_days(_: argparse.Namespace) -> int:
+    from aocutils.days import discover_days
+
+    for day, module_name in discover_days().items():
+        print(f'{day:2d}\t{module_name}')
+    return 0
+
+
+def generate(arguments: argparse.Namespace) -> int:
+    from aocutils.generate import generate as generate_input, write_input
+
+    if arguments.output:
+        write_input(arguments.day, arguments.output, arguments.scale, arguments.seed)
+    else:
+        for line in generate_input(arguments.day, arguments.scale, arguments.seed):
+            sys.stdout.write(line + "\n")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m aocutils', description='Advent of Code 2021 solvers')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Solve a single day')
+    run_parser.add_argument('day', type=int)
+    run_parser.add_argument('--part', type=int, choices=sorted(PARTS), action='append',
+                            help='Part to solve, both by default (repeatable)')
+    run_parser.add_argument('--input', help='Input file, input_data/dayNN.txt by default')
+    run_parser.add_argument('--stream', action='store_true', help='Read the input through a memory-mapped file')
+    run_parser.add_argument('--measure', action='store_true', help='Report construction and parts timings')
+    run_parser.add_argument('--profile', metavar='DIR',
+                            help='Save each part pstats and collapsed stacks (flamegraph input) in DIR')
+    run_parser.add_argument('--profile-mode', choices=('cprofile', 'sampling'), default='cprofile',
+                            help='cprofile traces every call, sampling snapshots the stack every millisecond: '
+                                 'its pstats call counts are sample counts')
+    verbosity = run_parser.add_mutually_exclusive_group()
+    verbosity.add_argument('-q', '--quiet', action='store_true', help='Only print the answers')
+    verbosity.add_argument('-v', '--verbose', action='store_true', help='Print debug traces')
+    run_parser.set_defaults(handler=run)
+
+    all_parser = commands.add_parser('all', help='Solve several days over a process pool')
+    all_parser.add_argument('days', type=int, nargs='*', help='Days to solve, all of them by default')
+    all_parser.add_argument('--workers', type=int, help='Process pool size, CPU count by default')
+    all_parser.set_defaults(handler=run_all)
+
+    for measured_parser in (run_parser, all_parser):
+        measured_parser.add_argument('--memory', action='store_true', help='Record peak memory when measuring')
+        measured_parser.add_argument('--format', choices=('text', 'json'), default='text')
+        measured_parser.add_argument('--model-cache', nargs='?', const='', metavar='DIR',
+                                     help='Reuse parsed input models stored on disk')
+        measured_parser.add_argument('--answer-store', nargs='?', const='', metavar='FILE',
+                                     help='Reuse stored answers when the input and the solver did not change')
+
+    bench_parser = commands.add_parser('bench', help='Compare days and primitives timings with the baseline')
+    bench_parser.add_argument('names', nargs='*', help='Benchmarks to run (day15, matrix.neighbors...), all by default')
+    bench_parser.add_argument('--scale', type=float, help='Input scale, the baseline one by default')
+    bench_parser.add_argument('--rounds', type=int, default=3, help='Timed rounds, the best one is compared')
+    bench_parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown fraction')
+    bench_parser.add_argument('--baseline', default=join(ROOT_DIR, 'benchmark_baseline.json'))
+    bench_parser.add_argument('--update', action='store_true', help='Store the results as the new baseline')
+    bench_parser.add_argument('--no-memory', action='store_true', help='Skip the peak memory round')
+    bench_parser.add_argument('--format', choices=('text', 'json'), default='text')
+    bench_parser.set_defaults(handler=bench)
+
+    forget_parser = commands.add_parser('forget', help='Remove stored answers')
+    forget_parser.add_argument('days', type=int, nargs='*', help='Days to forget, all of them by default')
+    forget_parser.add_argument('--part', type=int, choices=sorted(PARTS), action='append')
+    forget_parser.add_argument('--answer-store', metavar='FILE',
+                               help='Answer store, .aoc_cache/answers.sqlite3 by default')
+    forget_parser.set_defaults(handler=forget)
+
+    list_parser = commands.add_parser('list', help='List the available days')
+    list_parser.set_defaults(handler=list_days)
+
+    generate_parser = commands.add_parser('generate', help='Generate a synthetic input')
+    generate_parser.add_argument('day', type=int)
+    generate_parser.add_argument('--scale', type=float, default=1)
+    generate_parser.add_argument('--seed', type=int, default=0)
+    generate_parser.add_argument('--output', help='Output file, standard output by default')
+    generate_parser.set_defaults(handler=generate)
+
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    arguments = build_parser().parse_args(argv)
+    return arguments.handler(arguments)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,18 +3,247 @@ from __future__ import annotations
 import logging
 import sys
 from abc import ABC, abstractmethod
-from typing import Iterable, Sized
+from dataclasses import dataclass, field, asdict
+from enum import IntEnum
+from time import perf_counter_ns
+from os.path import dirname
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, Sized, TextIO, TypeVar
+
+from aocutils.file import MappedLines
+
+if TYPE_CHECKING:
+    from aocutils.cache import AnswerStore, ModelCache
+
+T = TypeVar('T')
+
+# Modules only some runs need (json, tracemalloc, the model cache) are imported where they are used,
+# keeping a single day start-up short
+_logging_configured = False
+
+
+def configure_logging(level: int) -> None:
+    global _logging_configured
+    if _logging_configured:
+        return
+    logging.basicConfig(
+        stream=sys.stdout,
+        level=level,
+        format='%(message)s'
+    )
+    _logging_configured = True
+
+
+@dataclass
+class StepMeasurement:
+    """
+    Wall-clock duration and peak allocation of one solving step
+    """
+    name: str
+    duration_ns: int
+    peak_memory: int = 0
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_ns / 1_000_000
+
+
+@dataclass
+class ExerciseReport:
+    exercise: str
+    answers: dict[str, Any] = field(default_factory=dict)
+    steps: list[StepMeasurement] = field(default_factory=list)
+
+    @property
+    def total_ns(self) -> int:
+        return sum(step.duration_ns for step in self.steps)
+
+    def to_text(self) -> str:
+        lines = [f'== {self.exercise}']
+        for step in self.steps:
+            lines.append(f'{step.name:<12} {step.duration_ms:>12.3f} ms {step.peak_memory / 1024:>12.1f} KiB')
+        lines.append(f"{'total':<12} {self.total_ns / 1_000_000:>12.3f} ms")
+        for part, answer in self.answers.items():
+            lines.append(f'» Solution for {part.replace("_", " ")} is {answer}.')
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        import json
+        return json.dumps(asdict(self), default=str, indent=2)
+
+    def write(self, stream: TextIO = sys.stdout, output_format: str = 'text') -> None:
+        if output_format == 'json':
+            stream.write(self.to_json() + "\n")
+        elif output_format == 'text':
+            stream.write(self.to_text() + "\n")
+        else:
+            raise ValueError(f'Unknown report format: {output_format}')
+
+
+def measure(name: str, function: Callable[[], Any], track_memory: bool = True) -> tuple[Any, StepMeasurement]:
+    """
+    Run a callable, timing it with perf_counter_ns and recording its peak allocation through tracemalloc
+    :param name: Step name used in the report
+    :param function: Zero-argument callable to run
+    :param track_memory: Record peak allocation (tracemalloc slows down the measured code)
+
+    :return: The callable result and its measurement
+    :rtype: tuple[Any, StepMeasurement]
+    """
+    if not track_memory:
+        start = perf_counter_ns()
+        result = function()
+        return result, StepMeasurement(name, perf_counter_ns() - start)
+
+    import tracemalloc
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    try:
+        start = perf_counter_ns()
+        result = function()
+        duration = perf_counter_ns() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+
+    return result, StepMeasurement(name, duration, max(0, peak - baseline))
+
+
+class Verbosity(IntEnum):
+    """
+    QUIET only keeps the answers, NORMAL adds the solvers progress traces, DEBUG adds the detailed ones
+    """
+    QUIET = 0
+    NORMAL = 1
+    DEBUG = 2
+
+    @property
+    def log_level(self) -> int:
+        return {
+            Verbosity.QUIET: logging.WARNING,
+            Verbosity.NORMAL: logging.INFO,
+            Verbosity.DEBUG: logging.DEBUG,
+        }[self]
 
 
 class Exercise(ABC):
-    def __init__(self, input_data: Iterable | Sized | list[str]) -> None:
+    verbosity: Verbosity = Verbosity.NORMAL
+    model_cache: Optional[ModelCache] = None
+    answer_store: Optional[AnswerStore] = None
+    profiling: Optional[tuple[str, str]] = None
+    _code_versions: dict[type, str] = {}
+
+    def __init__(self, input_data: Iterable | Sized | list[str] | MappedLines) -> None:
         super().__init__()
         self.input_data = input_data
-        logging.basicConfig(
-            stream=sys.stdout,
-            level=logging.INFO
-        )
+        configure_logging(Exercise.verbosity.log_level)
         self.log = logging.getLogger(self.__class__.__name__)
+        self._input_digest: Optional[str] = None
+
+    @staticmethod
+    def set_verbosity(verbosity: Verbosity | int) -> None:
+        """
+        Traces are emitted through logging with lazy %-formatting, hot loops check the level once before iterating:
+        nothing gets rendered below the chosen verbosity.
+        """
+        Exercise.verbosity = Verbosity(verbosity)
+        logging.getLogger().setLevel(Exercise.verbosity.log_level)
+
+    @staticmethod
+    def set_model_cache(model_cache: Optional[ModelCache]) -> None:
+        Exercise.model_cache = model_cache
+
+    @staticmethod
+    def set_answer_store(answer_store: Optional[AnswerStore]) -> None:
+        """
+        Answer parts from this store when it knows the input and the solver code did not change since
+        """
+        Exercise.answer_store = answer_store
+
+    @staticmethod
+    def set_profiling(directory: Optional[str], mode: str = 'cprofile') -> None:
+        """
+        Profile every part solved through solve_part(), saving <directory>/<Exercise>.<part>.pstats and .collapsed
+        :param directory: Output directory, None disables profiling
+        :param mode: 'cprofile' or 'sampling'
+        """
+        Exercise.profiling = None if directory is None else (directory, mode)
+
+    @classmethod
+    def code_version(cls) -> str:
+        """
+        Digest of the exercise module and aocutils sources: any code change invalidates the cached models
+        """
+        if cls not in Exercise._code_versions:
+            import glob
+            from aocutils.cache import digest
+            sources = [sys.modules[cls.__module__].__file__] + sorted(glob.glob(dirname(__file__) + '/*.py'))
+            contents = []
+            for source in sources:
+                with open(source, 'rb') as source_file:
+                    contents.append(source_file.read())
+            Exercise._code_versions[cls] = digest(*contents)
+
+        return Exercise._code_versions[cls]
+
+    @staticmethod
+    def digest_input(input_data: Iterable) -> str:
+        from aocutils.cache import digest
+        return digest(*[str(line) for line in input_data])
+
+    def input_digest(self) -> str:
+        if self._input_digest is None:
+            self._input_digest = self.digest_input(self.input_data)
+
+        return self._input_digest
+
+    @classmethod
+    def stored_answers(cls, input_data: Iterable, parts: Iterable[str],
+                       input_digest: Optional[str] = None) -> Optional[dict[str, Any]]:
+        """
+        Look the parts answers up in the answer store, without building the exercise
+        :return: Answers by part, None unless every part is stored
+        """
+        if Exercise.answer_store is None:
+            return None
+
+        input_digest = input_digest or cls.digest_input(input_data)
+        try:
+            return {part: Exercise.answer_store.get(cls.__qualname__, part, input_digest, cls.code_version())
+                    for part in parts}
+        except KeyError:
+            return None
+
+    def model(self, name: str, builder: Callable[[], T]) -> T:
+        """
+        Build a parsed input model, or load it from the model cache when one is set
+        :param name: Model name, unique within the exercise
+        :param builder: Zero-argument callable building the model from the input data
+
+        :return: A model that is never shared with another caller, so it can be mutated
+        """
+        if Exercise.model_cache is None:
+            return builder()
+
+        from aocutils.cache import digest
+        key = digest(self.__class__.__qualname__, name, self.input_digest(), self.code_version())
+        return Exercise.model_cache.get_or_build(key, builder)
+
+    @classmethod
+    def read_input(cls, file_path: str, streaming: bool = False) -> Iterable | Sized | list[str]:
+        """
+        Load the puzzle input this exercise expects from a file
+        :param file_path: Input file
+        :param streaming: Serve lines lazily from a memory-mapped file instead of loading them all
+        """
+        if streaming:
+            return MappedLines(file_path)
+
+        with open(file_path) as input_file:
+            return input_file.readlines()
 
     @abstractmethod
     def part_one(self) -> int:
@@ -24,16 +253,67 @@ class Exercise(ABC):
     def part_two(self) -> int:
         pass
 
+    def solve_part(self, part: str) -> Any:
+        """
+        Solve 'part_one' or 'part_two', under a profiler when profiling is enabled.
+        With an answer store set, a stored answer is returned without solving, and a computed one gets stored.
+        """
+        if Exercise.answer_store is None:
+            return self._run_part(part)
+
+        stored = self.stored_answers(self.input_data, (part,), self.input_digest())
+        if stored is not None:
+            self.log.debug('Stored %s answer', part)
+            return stored[part]
+
+        answer = self._run_part(part)
+        Exercise.answer_store.put(self.__class__.__qualname__, part, self.input_digest(), self.code_version(), answer)
+        return answer
+
+    def _run_part(self, part: str) -> Any:
+        solver = getattr(self, part)
+        if Exercise.profiling is None:
+            return solver()
+
+        from aocutils.profiling import profile, profile_output_prefix
+        directory, mode = Exercise.profiling
+        return profile(solver, profile_output_prefix(directory, self.__class__.__name__, part), mode)
+
     def solve_all(self) -> None:
         print("== Solving Part One:")
-        solution_part_one = self.part_one()
+        solution_part_one = self.solve_part('part_one')
         print("\n" + ("—" * 80) + "\n")
 
         print("== Solving Part Two:")
-        solution_part_two = self.part_two()
+        solution_part_two = self.solve_part('part_two')
         print("\n" + ("—" * 80) + "\n")
 
         print(f"» Solution for part one is {solution_part_one}.")
         print(f"» Solution for part two is {solution_part_two}.")
 
+    @classmethod
+    def solve_measured(cls, input_data: Iterable | Sized | list[str], track_memory: bool = True,
+                       parts: Iterable[str] = ('part_one', 'part_two')) -> ExerciseReport:
+        """
+        Build the exercise and solve its parts, measuring construction (input parsing) and each part separately.
+        When the answer store knows every part, the exercise is not even built and only the lookup is measured.
+        """
+        report = ExerciseReport(cls.__name__)
+        parts = tuple(parts)
+
+        if Exercise.answer_store is not None:
+            stored, step = measure('stored answers', lambda: cls.stored_answers(input_data, parts), track_memory)
+            if stored is not None:
+                report.steps.append(step)
+                report.answers.update(stored)
+                return report
+
+        exercise, step = measure('construction', lambda: cls(input_data), track_memory)
+        report.steps.append(step)
+
+        for part in parts:
+            answer, step = measure(part, lambda: exercise.solve_part(part), track_memory)
+            report.steps.append(step)
+            report.answers[part] = answer
 
+        return report
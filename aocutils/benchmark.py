@@ -0,0 +1,323 @@
+"""
+Performance regression suite: times every day and the core aocutils primitives on seeded synthetic inputs,
+and compares the results against the baseline stored in benchmark_baseline.json.
+
+    python -m aocutils bench                  # compare against the baseline, exit status 1 on regression
+    python -m aocutils bench day15 --update   # record new baseline values
+"""
+from __future__ import annotations
+
+import gc
+import json
+import os
+import platform
+import sys
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from os.path import join
+from random import Random
+from statistics import median
+from tempfile import TemporaryDirectory
+from typing import Any, Callable, Iterable, Optional, TextIO
+
+from aocutils.aoc import Exercise, Verbosity, measure
+from aocutils.days import ROOT_DIR, day_module_name, discover_days, load_exercise
+from aocutils.generate import GENERATORS, generate, write_input
+from aocutils.matrix import Automaton, Matrix
+from aocutils.pathfinding import Dijkstra
+from aocutils.string import hex2bin
+
+BASELINE_FORMAT = 1
+DEFAULT_BASELINE_PATH = join(ROOT_DIR, 'benchmark_baseline.json')
+DEFAULT_SCALE = 0.05
+DEFAULT_ROUNDS = 3
+DEFAULT_TOLERANCE = 0.25
+# Differences below these floors are timer and allocator noise, whatever the relative change
+MIN_TIME_DELTA_NS = 500_000
+MIN_MEMORY_DELTA = 64 * 1024
+
+# A builder prepares the benchmark input for a scale, and returns the zero-argument callable to time
+Builder = Callable[[float], Callable[[], Any]]
+
+BENCHMARKS: dict[str, Builder] = {}
+
+
+def benchmark(name: str) -> Callable[[Builder], Builder]:
+    def register(function: Builder) -> Builder:
+        BENCHMARKS[name] = function
+        return function
+
+    return register
+
+
+def _grid(scale: float) -> list[str]:
+    # Day 15 risk levels are a square grid of digits, 100x100 at scale 1
+    return generate(15, scale)
+
+
+class _WeightedGrid(Matrix):
+    def _init_value(self, x, y, value) -> Matrix.Cell:
+        return self._cell_from_value(x, y, int(value))
+
+
+@benchmark('matrix.construction')
+def _matrix_construction(scale: float) -> Callable[[], Any]:
+    lines = _grid(scale * 20)
+    return lambda: Matrix(lines)
+
+
+@benchmark('matrix.neighbors')
+def _matrix_neighbors(scale: float) -> Callable[[], Any]:
+    matrix = Matrix(_grid(scale * 20))
+    return lambda: [cell.neighbors() for cell in matrix.cells]
+
+
+def _life(value: str, neighbors: list[str]) -> str:
+    alive = neighbors.count('#')
+    return '#' if alive == 3 or (alive == 2 and value == '#') else '.'
+
+
+@benchmark('matrix.automaton')
+def _matrix_automaton(scale: float) -> Callable[[], Any]:
+    random = Random('automaton')
+    size = max(3, round(scale * 400))
+    matrix = Matrix([''.join(random.choice('.#') for _ in range(size)) for _ in range(size)])
+    return lambda: Automaton(matrix, _life).run(20)
+
+
+@benchmark('ndmatrix.construction')
+def _ndmatrix_construction(scale: float) -> Callable[[], Any]:
+    from aocutils.ndmatrix import ArrayMatrix
+    lines = _grid(scale * 20)
+    return lambda: ArrayMatrix(lines)
+
+
+@benchmark('ndmatrix.neighbor_values')
+def _ndmatrix_neighbor_values(scale: float) -> Callable[[], Any]:
+    from aocutils.ndmatrix import ArrayMatrix
+    matrix = ArrayMatrix(_grid(scale * 20))
+    return lambda: matrix.neighbor_values()
+
+
+@benchmark('dijkstra.find_path_to')
+def _dijkstra(scale: float) -> Callable[[], Any]:
+    grid = _WeightedGrid(_grid(scale * 8), allow_diagonal=False)
+    return lambda: Dijkstra(grid, grid.cells[0]).find_path_to(grid.cells[-1])
+
+
+@benchmark('string.hex2bin')
+def _hex2bin(scale: float) -> Callable[[], Any]:
+    random = Random('hex2bin')
+    values = [''.join(random.choice('0123456789ABCDEF') for _ in range(random.randint(1, 64)))
+              for _ in range(max(1, round(scale * 200_000)))]
+    return lambda: [hex2bin(value) for value in values]
+
+
+def _day_builder(day: int, root_dir: str) -> Builder:
+    def build(scale: float) -> Callable[[], Any]:
+        exercise_class = load_exercise(day, root_dir)
+        with TemporaryDirectory() as directory:
+            # Going through a file so that each day parses its input the way it does for real puzzles
+            input_path = join(directory, day_module_name(day) + '.txt')
+            write_input(day, input_path, scale)
+            input_data = exercise_class.read_input(input_path)
+            if not isinstance(input_data, list):
+                input_data = list(input_data)
+
+        return lambda: exercise_class.solve_measured(input_data, track_memory=False)
+
+    return build
+
+
+def collect_benchmarks(root_dir: str = ROOT_DIR) -> dict[str, Builder]:
+    """
+    :return: Every day having an input generator, then the primitives benchmarks
+    """
+    days = {day_module_name(day): _day_builder(day, root_dir)
+            for day in discover_days(root_dir) if day in GENERATORS}
+    return days | BENCHMARKS
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    best_ns: int
+    median_ns: int
+    peak_memory: Optional[int] = None
+    rounds: int = 1
+
+    def to_json(self) -> dict:
+        return {'best_ns': self.best_ns, 'median_ns': self.median_ns, 'peak_memory': self.peak_memory,
+                'rounds': self.rounds}
+
+
+def run_benchmark(name: str, builder: Builder, scale: float = DEFAULT_SCALE, rounds: int = DEFAULT_ROUNDS,
+                  track_memory: bool = True) -> BenchmarkResult:
+    """
+    Time a benchmark over several rounds, then record its peak allocation in an extra round,
+    as tracemalloc slows down the measured code
+    """
+    function = builder(scale)
+    durations = []
+    for _ in range(max(1, rounds)):
+        # Like timeit, keep collection pauses out of the timings
+        gc.collect()
+        gc.disable()
+        try:
+            durations.append(measure(name, function, track_memory=False)[1].duration_ns)
+        finally:
+            gc.enable()
+    peak_memory = measure(name, function, track_memory=True)[1].peak_memory if track_memory else None
+
+    return BenchmarkResult(name, min(durations), round(median(durations)), peak_memory, len(durations))
+
+
+def run_benchmarks(names: Optional[Iterable[str]] = None, scale: float = DEFAULT_SCALE,
+                   rounds: int = DEFAULT_ROUNDS, track_memory: bool = True,
+                   root_dir: str = ROOT_DIR) -> dict[str, BenchmarkResult]:
+    """
+    Run benchmarks in quiet mode, without model cache, answer store nor profiling so that only the solving is measured
+    :param names: Benchmarks to run, all of them when None
+    :param scale: Input scale, see aocutils.generate
+    :param rounds: Timed rounds per benchmark, the best one is compared to the baseline
+    :param track_memory: Record each benchmark peak allocation
+    :param root_dir: Directory holding the dayNN.py scripts
+
+    :return: Results by benchmark name
+    :rtype: dict[str, BenchmarkResult]
+    """
+    available = collect_benchmarks(root_dir)
+    names = list(available) if names is None else list(names)
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise KeyError(f'Unknown benchmarks: {", ".join(unknown)}')
+
+    verbosity, model_cache, profiling = Exercise.verbosity, Exercise.model_cache, Exercise.profiling
+    answer_store = Exercise.answer_store
+    Exercise.set_verbosity(Verbosity.QUIET)
+    Exercise.set_model_cache(None)
+    Exercise.set_answer_store(None)
+    Exercise.set_profiling(None)
+    try:
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            return {name: run_benchmark(name, available[name], scale, rounds, track_memory) for name in names}
+    finally:
+        Exercise.set_verbosity(verbosity)
+        Exercise.set_model_cache(model_cache)
+        Exercise.set_answer_store(answer_store)
+        Exercise.profiling = profiling
+
+
+@dataclass
+class Baseline:
+    """
+    Reference results, only comparable with runs made at the same scale
+    """
+    scale: float = DEFAULT_SCALE
+    results: dict[str, dict] = field(default_factory=dict)
+    python: str = platform.python_version()
+    machine: str = platform.machine()
+
+    @classmethod
+    def load(cls, file_path: str = DEFAULT_BASELINE_PATH) -> Baseline:
+        with open(file_path) as baseline_file:
+            content = json.load(baseline_file)
+
+        if content.get('format') != BASELINE_FORMAT:
+            raise ValueError(f'Unsupported baseline format {content.get("format")} in {file_path}, '
+                             f'expected {BASELINE_FORMAT}')
+        return cls(content['scale'], content['benchmarks'], content.get('python', ''), content.get('machine', ''))
+
+    def save(self, file_path: str = DEFAULT_BASELINE_PATH) -> None:
+        content = {'format': BASELINE_FORMAT, 'scale': self.scale, 'python': self.python, 'machine': self.machine,
+                   'benchmarks': dict(sorted(self.results.items()))}
+        with open(file_path, 'w') as baseline_file:
+            json.dump(content, baseline_file, indent=2)
+            baseline_file.write("\n")
+
+    def update(self, results: dict[str, BenchmarkResult]) -> None:
+        self.python, self.machine = platform.python_version(), platform.machine()
+        for name, result in results.items():
+            self.results[name] = result.to_json()
+
+
+@dataclass
+class Comparison:
+    name: str
+    result: BenchmarkResult
+    baseline: Optional[dict] = None
+    slower: bool = False
+    heavier: bool = False
+
+    @property
+    def regressed(self) -> bool:
+        return self.slower or self.heavier
+
+    @property
+    def time_ratio(self) -> Optional[float]:
+        if not self.baseline or not self.baseline.get('best_ns'):
+            return None
+        return self.result.best_ns / self.baseline['best_ns']
+
+    def to_text(self) -> str:
+        line = f'{self.name:<24} {self.result.best_ns / 1_000_000:>10.3f} ms'
+        if self.result.peak_memory is not None:
+            line += f' {self.result.peak_memory / 1024:>10.1f} KiB'
+        if self.baseline is None:
+            return line + '  (no baseline)'
+
+        line += f'  {self.time_ratio:>6.2f}x baseline' if self.time_ratio is not None else ''
+        if self.slower:
+            line += '  SLOWER'
+        if self.heavier:
+            line += '  MORE MEMORY'
+        return line
+
+
+def compare(results: dict[str, BenchmarkResult], baseline: Baseline, tolerance: float = DEFAULT_TOLERANCE,
+            memory_tolerance: Optional[float] = None) -> list[Comparison]:
+    """
+    Compare results to a baseline, a benchmark regresses when it gets slower (or allocates more)
+    than its baseline value by more than the tolerance fraction
+    :param results: Benchmark results, run at the baseline scale
+    :param baseline: Reference results
+    :param tolerance: Allowed relative slowdown, 0.25 accepts up to 25% slower
+    :param memory_tolerance: Allowed relative peak memory growth, the time tolerance by default
+
+    :return: A comparison per result
+    :rtype: list[Comparison]
+    """
+    if memory_tolerance is None:
+        memory_tolerance = tolerance
+
+    comparisons = []
+    for name, result in results.items():
+        reference = baseline.results.get(name)
+        comparison = Comparison(name, result, reference)
+        if reference is not None:
+            reference_time = reference['best_ns']
+            comparison.slower = (result.best_ns > reference_time * (1 + tolerance)
+                                 and result.best_ns - reference_time > MIN_TIME_DELTA_NS)
+            reference_memory = reference.get('peak_memory')
+            if result.peak_memory is not None and reference_memory is not None:
+                comparison.heavier = (result.peak_memory > reference_memory * (1 + memory_tolerance)
+                                      and result.peak_memory - reference_memory > MIN_MEMORY_DELTA)
+        comparisons.append(comparison)
+
+    return comparisons
+
+
+def write_comparisons(comparisons: list[Comparison], stream: TextIO = sys.stdout,
+                      output_format: str = 'text') -> None:
+    if output_format == 'json':
+        content = {comparison.name: {**comparison.result.to_json(), 'baseline': comparison.baseline,
+                                     'slower': comparison.slower, 'heavier': comparison.heavier}
+                   for comparison in comparisons}
+        stream.write(json.dumps(content, indent=2) + "\n")
+    elif output_format == 'text':
+        for comparison in comparisons:
+            stream.write(comparison.to_text() + "\n")
+        regressions = sum(comparison.regressed for comparison in comparisons)
+        stream.write(f'{regressions} regression(s) in {len(comparisons)} benchmark(s)\n')
+    else:
+        raise ValueError(f'Unknown report format: {output_format}')
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from os.path import abspath, dirname, join
+from tempfile import NamedTemporaryFile
+from typing import Any, Callable, Optional, TypeVar
+
+log = logging.getLogger(__name__)
+
+ROOT_DIR = dirname(dirname(abspath(__file__)))
+DEFAULT_CACHE_DIR = join(ROOT_DIR, '.aoc_cache', 'models')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+T = TypeVar('T')
+
+
+def digest(*parts: str | bytes) -> str:
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(part if isinstance(part, bytes) else part.encode())
+        hasher.update(b'\0')
+    return hasher.hexdigest()
+
+
+class ModelCache:
+    """
+    On-disk pickle store of parsed input models, evicting the least recently used entries
+    once the directory grows past max_bytes
+    """
+
+    SUFFIX = '.pickle'
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return join(self.directory, key + self.SUFFIX)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def get(self, key: str) -> Any:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as cache_file:
+                model = pickle.load(cache_file)
+        except FileNotFoundError:
+            raise KeyError(key)
+        # Access time drives the LRU eviction, and atime is not reliable on every mount
+        os.utime(path)
+        return model
+
+    def put(self, key: str, model: Any) -> bool:
+        try:
+            payload = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, RecursionError, TypeError, ValueError) as error:
+            log.warning('Model %s cannot be cached: %s', key, error)
+            return False
+
+        with NamedTemporaryFile(dir=self.directory, delete=False) as temporary_file:
+            temporary_file.write(payload)
+        os.replace(temporary_file.name, self._path(key))
+        self.evict()
+        return True
+
+    def get_or_build(self, key: str, builder: Callable[[], T]) -> T:
+        try:
+            return self.get(key)
+        except KeyError:
+            log.debug('Model cache miss for %s', key)
+
+        model = builder()
+        self.put(key, model)
+        return model
+
+    def entries(self) -> list[os.DirEntry]:
+        with os.scandir(self.directory) as entries:
+            return [entry for entry in entries if entry.name.endswith(self.SUFFIX)]
+
+    def size(self) -> int:
+        return sum(entry.stat().st_size for entry in self.entries())
+
+    def evict(self) -> None:
+        entries = sorted(self.entries(), key=lambda entry: entry.stat().st_mtime_ns)
+        total = sum(entry.stat().st_size for entry in entries)
+        while entries and total > self.max_bytes:
+            oldest = entries.pop(0)
+            total -= oldest.stat().st_size
+            os.remove(oldest.path)
+
+    def clear(self) -> None:
+        for entry in self.entries():
+            os.remove(entry.path)
+
+
+DEFAULT_ANSWER_STORE = join(ROOT_DIR, '.aoc_cache', 'answers.sqlite3')
+DEFAULT_MAX_ANSWERS = 10_000
+
+
+class AnswerStore:
+    """
+    SQLite store of puzzle answers keyed by exercise, part and input digest. Each answer keeps the solver version
+    it was computed with, an answer from another version is stale and treated as missing.
+    The least recently used answers are evicted past max_entries.
+    """
+
+    def __init__(self, file_path: str = DEFAULT_ANSWER_STORE, max_entries: int = DEFAULT_MAX_ANSWERS) -> None:
+        import sqlite3
+
+        self.file_path = file_path
+        self.max_entries = max_entries
+        if dirname(file_path):
+            os.makedirs(dirname(file_path), exist_ok=True)
+        # Several runner processes may share the store
+        self.connection = sqlite3.connect(file_path, timeout=30, isolation_level=None)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS answers ('
+                                'exercise TEXT NOT NULL, part TEXT NOT NULL, input_digest TEXT NOT NULL, '
+                                'version TEXT NOT NULL, answer TEXT NOT NULL, last_used INTEGER NOT NULL, '
+                                'PRIMARY KEY (exercise, part, input_digest))')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS answers_last_used ON answers (last_used)')
+
+    def __getstate__(self) -> dict:
+        return {'file_path': self.file_path, 'max_entries': self.max_entries}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state['file_path'], state['max_entries'])
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _tick(self) -> int:
+        # A counter rather than a clock, so that two accesses in the same clock tick still get ordered
+        row = self.connection.execute('SELECT COALESCE(MAX(last_used), 0) + 1 FROM answers').fetchone()
+        return row[0]
+
+    def get(self, exercise: str, part: str, input_digest: str, version: str) -> Any:
+        row = self.connection.execute('SELECT version, answer FROM answers '
+                                      'WHERE exercise = ? AND part = ? AND input_digest = ?',
+                                      (exercise, part, input_digest)).fetchone()
+        if row is None:
+            raise KeyError((exercise, part, input_digest))
+        if row[0] != version:
+            log.debug('Stale %s.%s answer from solver version %s', exercise, part, row[0])
+            self.invalidate(exercise, part, input_digest)
+            raise KeyError((exercise, part, input_digest))
+
+        self.connection.execute('UPDATE answers SET last_used = ? WHERE exercise = ? AND part = ? AND input_digest = ?',
+                                (self._tick(), exercise, part, input_digest))
+        return json.loads(row[1])
+
+    def put(self, exercise: str, part: str, input_digest: str, version: str, answer: Any) -> bool:
+        try:
+            payload = json.dumps(answer)
+        except (TypeError, ValueError) as error:
+            log.warning('%s.%s answer cannot be stored: %s', exercise, part, error)
+            return False
+
+        self.connection.execute('INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?)',
+                                (exercise, part, input_digest, version, payload, self._tick()))
+        self.evict()
+        return True
+
+    def invalidate(self, exercise: Optional[str] = None, part: Optional[str] = None,
+                   input_digest: Optional[str] = None) -> int:
+        """
+        Forget the answers matching every given criterion, all of them when none is given
+        :return: Number of answers removed
+        """
+        criteria = {'exercise': exercise, 'part': part, 'input_digest': input_digest}
+        conditions = [f'{column} = ?' for column, value in criteria.items() if value is not None]
+        query = 'DELETE FROM answers' + (' WHERE ' + ' AND '.join(conditions) if conditions else '')
+        cursor = self.connection.execute(query, [value for value in criteria.values() if value is not None])
+        return cursor.rowcount
+
+    def evict(self) -> None:
+        self.connection.execute('DELETE FROM answers WHERE rowid IN '
+                                '(SELECT rowid FROM answers ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+                                (self.max_entries,))
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM answers').fetchone()[0]
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import importlib
+import os
+import re
+import sys
+from os.path import abspath, dirname, join
+from types import ModuleType
+
+from aocutils.aoc import Exercise
+
+ROOT_DIR = dirname(dirname(abspath(__file__)))
+DAY_MODULE_PATTERN = re.compile(r'^day(?P<day>\d{2})\.py$')
+
+
+def day_module_name(day: int) -> str:
+    return f'day{day:02d}'
+
+
+def discover_days(root_dir: str = ROOT_DIR) -> dict[int, str]:
+    """
+    List the dayNN modules available in a directory
+    :param root_dir: Directory holding the dayNN.py scripts
+
+    :return: Module names indexed by day number
+    :rtype: dict[int, str]
+    """
+    days = {}
+    for file_name in os.listdir(root_dir):
+        if matches := DAY_MODULE_PATTERN.match(file_name):
+            day = int(matches['day'])
+            days[day] = day_module_name(day)
+
+    return dict(sorted(days.items()))
+
+
+def find_exercise(module: ModuleType) -> type[Exercise]:
+    exercises = [member for member in vars(module).values()
+                 if isinstance(member, type)
+                 and issubclass(member, Exercise)
+                 and member.__module__ == module.__name__
+                 and not member.__abstractmethods__]
+    if len(exercises) != 1:
+        raise LookupError(f'Expected a single Exercise in {module.__name__}, found {exercises}')
+
+    return exercises[0]
+
+
+def load_exercise(day: int, root_dir: str = ROOT_DIR) -> type[Exercise]:
+    """
+    Import a single dayNN module and return its Exercise
+    """
+    if root_dir not in sys.path:
+        sys.path.insert(0, root_dir)
+
+    return find_exercise(importlib.import_module(day_module_name(day)))
+
+
+def input_file_path(day: int, root_dir: str = ROOT_DIR) -> str:
+    return join(root_dir, 'input_data', f'{day_module_name(day)}.txt')
@@ -1,5 +1,13 @@
+from __future__ import annotations
+
+import logging
+import mmap
+from array import array
+from collections.abc import Iterable, Sequence
 from os.path import dirname, basename, splitext
-from typing import Generator
+from typing import Generator, Iterator, Optional
+
+log = logging.getLogger(__name__)
 
 
 def get_input_data_filepath(script_path: str) -> str:
@@ -12,7 +20,126 @@ def read_integer_file(file_path: str) -> Generator[int, None, None]:
     with open(file_path) as fp:
         for line in fp:
             if not line.strip().isnumeric():
-                print(f"Line {line} is not numeric")
+                log.warning('Line %s is not numeric', line)
                 continue
 
             yield int(line.strip())
+
+
+class MappedLines(Sequence):
+    """
+    Memory-mapped file read line by line: iterating yields lines lazily at constant memory, while indexing builds
+    a compact table of line offsets on first use.
+    Lines keep their line break, like readlines() does.
+    """
+
+    def __init__(self, file_path: str, as_bytes: bool = False, encoding: str = 'utf-8') -> None:
+        self.file_path = file_path
+        self.as_bytes = as_bytes
+        self.encoding = encoding
+        self._file = None
+        self._map: Optional[mmap.mmap | bytes] = None
+        self._offsets: Optional[array] = None
+
+    def __enter__(self) -> MappedLines:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict:
+        return {'file_path': self.file_path, 'as_bytes': self.as_bytes, 'encoding': self.encoding}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._map = None
+
+    def _mapping(self) -> mmap.mmap | bytes:
+        if self._map is None:
+            self._file = open(self.file_path, 'rb')
+            try:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                self._map = b''
+        return self._map
+
+    def _line(self, start: int, end: int) -> str | bytes:
+        line = self._mapping()[start:end]
+        if self.as_bytes:
+            return line
+        return line.decode(self.encoding)
+
+    def _line_bounds(self) -> Iterator[tuple[int, int]]:
+        mapping = self._mapping()
+        size = len(mapping)
+        start = 0
+        while start < size:
+            end = mapping.find(b'\n', start)
+            end = size if end < 0 else end + 1
+            yield start, end
+            start = end
+
+    def __iter__(self) -> Iterator[str | bytes]:
+        for start, end in self._line_bounds():
+            yield self._line(start, end)
+
+    def offsets(self) -> array:
+        if self._offsets is None:
+            offsets = array('q', [0])
+            for _, end in self._line_bounds():
+                offsets.append(end)
+            self._offsets = offsets
+        return self._offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets()) - 1
+
+    def __getitem__(self, index: int | slice) -> str | bytes | list[str | bytes]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+
+        offsets = self.offsets()
+        line_count = len(offsets) - 1
+        if index < 0:
+            index += line_count
+        if not 0 <= index < line_count:
+            raise IndexError(index)
+
+        return self._line(offsets[index], offsets[index + 1])
+
+
+class MappedIntegers(Iterable):
+    """
+    Integers of a memory-mapped file, one per line, parsed while iterating: every pass reads the file again at
+    constant memory instead of keeping a list of the values.
+    Non-numeric lines are skipped, like read_integer_file() does.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.lines = MappedLines(file_path, as_bytes=True)
+
+    def __enter__(self) -> MappedIntegers:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.lines.close()
+
+    def __iter__(self) -> Iterator[int]:
+        for line in self.lines:
+            line = line.strip()
+            if not line.isdigit():
+                log.warning('Line %s is not numeric', line)
+                continue
+
+            yield int(line)
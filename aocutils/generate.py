@@ -0,0 +1,406 @@
+"""
+Seeded synthetic puzzle inputs, written in the formats the dayNN parsers read.
+A scale factor of 1 gives roughly the size of a real puzzle input, sizes grow linearly with the scale.
+"""
+from __future__ import annotations
+
+import math
+import string
+from itertools import permutations
+from random import Random
+from typing import Callable, Optional
+
+Generator = Callable[[Random, float], list[str]]
+
+GENERATORS: dict[int, Generator] = {}
+
+
+def generator(day: int) -> Callable[[Generator], Generator]:
+    def register(function: Generator) -> Generator:
+        GENERATORS[day] = function
+        return function
+
+    return register
+
+
+def generate(day: int, scale: float = 1, seed: int = 0) -> list[str]:
+    """
+    Generate an input for a day
+    :param day: Day number
+    :param scale: Size factor, 1 being about the size of a real puzzle input
+    :param seed: Random seed, the same (day, scale, seed) always gives the same input
+
+    :return: Input lines, without line breaks
+    :rtype: list[str]
+    """
+    if day not in GENERATORS:
+        raise KeyError(f'No input generator for day {day}')
+    if scale <= 0:
+        raise ValueError(f'Scale must be positive, got {scale}')
+
+    return GENERATORS[day](Random(f'{day}:{seed}'), scale)
+
+
+def write_input(day: int, file_path: str, scale: float = 1, seed: int = 0) -> None:
+    with open(file_path, 'w') as input_file:
+        for line in generate(day, scale, seed):
+            input_file.write(line + "\n")
+
+
+def _count(base: int, scale: float) -> int:
+    return max(1, round(base * scale))
+
+
+def _side(base: int, scale: float) -> int:
+    """
+    Side of a square grid whose area scales linearly
+    """
+    return max(2, round(base * math.sqrt(scale)))
+
+
+@generator(1)
+def sonar_sweep(rng: Random, scale: float) -> list[str]:
+    depth = rng.randint(100, 200)
+    depths = []
+    for _ in range(_count(2000, scale)):
+        depth = max(0, depth + rng.randint(-10, 20))
+        depths.append(str(depth))
+    return depths
+
+
+@generator(2)
+def submarine_commands(rng: Random, scale: float) -> list[str]:
+    commands = []
+    aim = 0
+    for _ in range(_count(1000, scale)):
+        action, amount = rng.choice(('forward', 'down', 'up')), rng.randint(1, 9)
+        # The submarine never goes above the surface
+        if action == 'up' and amount > aim:
+            action = 'down'
+        aim += {'forward': 0, 'down': amount, 'up': -amount}[action]
+        commands.append(f'{action} {amount}')
+    return commands
+
+
+@generator(3)
+def diagnostic_report(rng: Random, scale: float) -> list[str]:
+    count = _count(1000, scale)
+    width = max(2, math.ceil(math.log2(count)) + 2)
+    report = {format(rng.getrandbits(width), f'0{width}b') for _ in range(count)}
+
+    # Both rating filters expect the two bit values at each rank while more than one line remains
+    while missing := _unfiltered_rank_line(report, width):
+        report.add(missing)
+
+    report = sorted(report)
+    rng.shuffle(report)
+    return report
+
+
+def _unfiltered_rank_line(report: set[str], width: int) -> Optional[str]:
+    for keep_most_common in (True, False):
+        lines = list(report)
+        for rank in range(width):
+            if len(lines) <= 1:
+                break
+            ones = [line for line in lines if line[rank] == '1']
+            zeros = [line for line in lines if line[rank] == '0']
+            if not ones or not zeros:
+                line = lines[0]
+                return line[:rank] + ('0' if line[rank] == '1' else '1') + line[rank + 1:]
+            if keep_most_common:
+                lines = ones if len(ones) >= len(zeros) else zeros
+            else:
+                lines = zeros if len(zeros) <= len(ones) else ones
+    return None
+
+
+@generator(4)
+def bingo(rng: Random, scale: float) -> list[str]:
+    numbers = list(range(max(100, _count(25, scale))))
+    draws = numbers.copy()
+    rng.shuffle(draws)
+    lines = [','.join(str(number) for number in draws), '']
+    for _ in range(_count(100, scale)):
+        card = rng.sample(numbers, 25)
+        for row in range(5):
+            lines.append(' '.join(f'{number:2d}' for number in card[row * 5:(row + 1) * 5]))
+        # The parser only stores a card once it reaches the following blank line
+        lines.append('')
+    return lines
+
+
+@generator(5)
+def hydrothermal_vents(rng: Random, scale: float) -> list[str]:
+    side = _side(1000, scale)
+    lines = []
+    for _ in range(_count(500, scale)):
+        start_x, start_y = rng.randrange(side), rng.randrange(side)
+        direction = rng.choice(('horizontal', 'vertical', 'diagonal'))
+        if direction == 'horizontal':
+            end_x, end_y = rng.randrange(side), start_y
+        elif direction == 'vertical':
+            end_x, end_y = start_x, rng.randrange(side)
+        else:
+            step_x, step_y = rng.choice((-1, 1)), rng.choice((-1, 1))
+            max_length = min(start_x if step_x < 0 else side - 1 - start_x,
+                             start_y if step_y < 0 else side - 1 - start_y)
+            length = rng.randint(0, max_length)
+            end_x, end_y = start_x + step_x * length, start_y + step_y * length
+        lines.append(f'{start_x},{start_y} -> {end_x},{end_y}')
+    return lines
+
+
+@generator(6)
+def lantern_fishes(rng: Random, scale: float) -> list[str]:
+    return [','.join(str(rng.randint(1, 5)) for _ in range(_count(300, scale)))]
+
+
+@generator(7)
+def crab_positions(rng: Random, scale: float) -> list[str]:
+    return [','.join(str(min(1999, int(rng.expovariate(1 / 400)))) for _ in range(_count(1000, scale)))]
+
+
+@generator(8)
+def seven_segments(rng: Random, scale: float) -> list[str]:
+    digits = ('abcefg', 'cf', 'acdeg', 'acdfg', 'bcdf', 'abdfg', 'abdefg', 'acf', 'abcdefg', 'abcdfg')
+    lines = []
+    for _ in range(_count(200, scale)):
+        wiring = dict(zip('abcdefg', rng.sample('abcdefg', 7)))
+        signals = [''.join(rng.sample([wiring[wire] for wire in digit], len(digit))) for digit in digits]
+        patterns = signals.copy()
+        rng.shuffle(patterns)
+        output = [rng.choice(signals) for _ in range(4)]
+        lines.append(f"{' '.join(patterns)} | {' '.join(output)}")
+    return lines
+
+
+def _cuts(rng: Random, size: int) -> list[int]:
+    cuts = []
+    position = rng.randint(2, 7)
+    while position < size:
+        cuts.append(position)
+        position += rng.randint(3, 8)
+    return cuts
+
+
+@generator(9)
+def height_map(rng: Random, scale: float) -> list[str]:
+    # Rectangular basins walled by 9s, heights growing from a single low point per basin
+    side = _side(100, scale)
+    column_cuts = set(_cuts(rng, side))
+    row_cuts = set(_cuts(rng, side))
+    column_spans = _spans(column_cuts, side)
+    row_spans = _spans(row_cuts, side)
+    grid = [[9] * side for _ in range(side)]
+    for top, bottom in row_spans:
+        for left, right in column_spans:
+            low_x, low_y = rng.randint(left, right), rng.randint(top, bottom)
+            for y in range(top, bottom + 1):
+                for x in range(left, right + 1):
+                    grid[y][x] = min(8, abs(x - low_x) + abs(y - low_y))
+    return [''.join(str(height) for height in row) for row in grid]
+
+
+def _spans(cuts: set[int], size: int) -> list[tuple[int, int]]:
+    spans = []
+    start = 0
+    for position in sorted(cuts) + [size]:
+        if position > start:
+            spans.append((start, position - 1))
+        start = position + 1
+    return spans
+
+
+@generator(10)
+def navigation_subsystem(rng: Random, scale: float) -> list[str]:
+    closing = {'(': ')', '[': ']', '{': '}', '<': '>'}
+    lines = []
+    for index in range(_count(100, scale)):
+        corrupted = index % 2 == 1
+        corrupt_at = rng.randint(10, 90)
+        stack: list[str] = []
+        line = ''
+        for position in range(rng.randint(90, 110)):
+            if not stack or rng.random() < 0.55:
+                opening = rng.choice('([{<')
+                stack.append(opening)
+                line += opening
+            elif corrupted and position >= corrupt_at:
+                expected = closing[stack.pop()]
+                line += rng.choice([token for token in closing.values() if token != expected])
+                break
+            else:
+                line += closing[stack.pop()]
+        if not stack:
+            line += rng.choice('([{<')
+        lines.append(line)
+    return lines
+
+
+@generator(11)
+def octopuses(rng: Random, scale: float) -> list[str]:
+    # Most uniform random grids never synchronize and part two would loop forever:
+    # energy levels are drawn from narrower bands until a grid flashes all at once within the step limit
+    side = max(3, _side(10, scale))
+    for band in (10, 10, 10, 8, 8, 7, 7, 6, 6, 5, 4, 3, 2, 1):
+        low = rng.randint(0, 10 - band)
+        grid = [low + rng.randrange(band) for _ in range(side * side)]
+        if _octopuses_synchronize(grid, side, 400):
+            break
+
+    return [''.join(str(energy) for energy in grid[row * side:(row + 1) * side]) for row in range(side)]
+
+
+def _octopuses_synchronize(grid: list[int], side: int, max_steps: int) -> bool:
+    neighbors = [[ny * side + nx
+                  for ny in range(max(0, y - 1), min(side, y + 2))
+                  for nx in range(max(0, x - 1), min(side, x + 2))
+                  if (nx, ny) != (x, y)]
+                 for y in range(side) for x in range(side)]
+    energies = grid.copy()
+    for _ in range(max_steps):
+        energies = [energy + 1 for energy in energies]
+        flashing = [index for index, energy in enumerate(energies) if energy > 9]
+        flashed = set(flashing)
+        while flashing:
+            for neighbor in neighbors[flashing.pop()]:
+                energies[neighbor] += 1
+                if energies[neighbor] > 9 and neighbor not in flashed:
+                    flashed.add(neighbor)
+                    flashing.append(neighbor)
+        if len(flashed) == len(energies):
+            return True
+        for index in flashed:
+            energies[index] = 0
+    return False
+
+
+@generator(12)
+def cave_system(rng: Random, scale: float) -> list[str]:
+    names = [''.join(name) for name in permutations(string.ascii_lowercase, 3)]
+    rng.shuffle(names)
+    small = names[:_count(5, scale) + 1]
+    big = [name.upper() for name in names[len(small):len(small) + _count(1.5, scale)]]
+
+    edges: set[tuple[str, str]] = set()
+
+    def connect(left: str, right: str) -> None:
+        if left != right and (right, left) not in edges:
+            edges.add((left, right))
+
+    # A chain through the small caves keeps the end reachable, big caves never touch each other
+    chain = ['start'] + small + ['end']
+    for left, right in zip(chain, chain[1:]):
+        connect(left, right)
+    for cave in big:
+        for neighbor in rng.sample(small, min(len(small), 3)):
+            connect(cave, neighbor)
+    connect(rng.choice(big), 'start')
+    connect('end', rng.choice(big))
+    for _ in range(len(small) // 2):
+        connect(*rng.sample(small, 2))
+
+    lines = [f'{left}-{right}' for left, right in edges]
+    rng.shuffle(lines)
+    return lines
+
+
+@generator(13)
+def transparent_origami(rng: Random, scale: float) -> list[str]:
+    width, height = 40, 6
+    dots = {(x, y) for x in range(width) for y in range(height) if rng.random() < 0.4}
+    dots.add((0, 0))
+
+    # Unfold a 40x6 picture until the sheet is large enough, last fold first
+    folds = []
+    axis = 'x'
+    while width * height < 1_000_000 * scale or len(folds) < 2:
+        if axis == 'x':
+            folds.append(f'fold along x={width}')
+            dots = _unfold(rng, dots, lambda x, y: (2 * width - x, y))
+            width = 2 * width + 1
+        else:
+            folds.append(f'fold along y={height}')
+            dots = _unfold(rng, dots, lambda x, y: (x, 2 * height - y))
+            height = 2 * height + 1
+        axis = 'y' if axis == 'x' else 'x'
+
+    points = [f'{x},{y}' for x, y in dots]
+    rng.shuffle(points)
+    return points + [''] + list(reversed(folds))
+
+
+def _unfold(rng: Random, dots: set[tuple[int, int]],
+            mirror: Callable[[int, int], tuple[int, int]]) -> set[tuple[int, int]]:
+    unfolded = set()
+    for dot in dots:
+        # The corner dot is kept on both sides so the sheet spans its full size
+        side = 'both' if dot == (0, 0) else rng.choice(('kept', 'mirrored', 'both'))
+        if side != 'mirrored':
+            unfolded.add(dot)
+        if side != 'kept':
+            unfolded.add(mirror(*dot))
+    return unfolded
+
+
+@generator(14)
+def polymer(rng: Random, scale: float) -> list[str]:
+    elements = 'BCFHKNOPSV'
+    template = ''.join(rng.choice(elements) for _ in range(_count(20, scale)))
+    rules = [f'{left}{right} -> {rng.choice(elements)}' for left in elements for right in elements]
+    rng.shuffle(rules)
+    return [template, ''] + rules
+
+
+@generator(15)
+def risk_map(rng: Random, scale: float) -> list[str]:
+    side = _side(100, scale)
+    return [''.join(str(rng.randint(1, 9)) for _ in range(side)) for _ in range(side)]
+
+
+def _literal_bits(version: int, value: int) -> str:
+    groups = format(value, 'b')
+    groups = groups.zfill(-(-len(groups) // 4) * 4)
+    chunks = [groups[index:index + 4] for index in range(0, len(groups), 4)]
+    content = ''.join(('0' if index == len(chunks) - 1 else '1') + chunk for index, chunk in enumerate(chunks))
+    return format(version, '03b') + '100' + content
+
+
+def _operator_bits(version: int, type_id: int, subpackets: list[str], rng: Random) -> str:
+    content = ''.join(subpackets)
+    header = format(version, '03b') + format(type_id, '03b')
+    if len(content) < 2 ** 15 and (len(subpackets) >= 2 ** 11 or rng.random() < 0.5):
+        return header + '0' + format(len(content), '015b') + content
+    return header + '1' + format(len(subpackets), '011b') + content
+
+
+def _packet_bits(rng: Random, depth: int) -> str:
+    if depth <= 0 or rng.random() < 0.3:
+        return _literal_bits(rng.randrange(8), rng.randrange(2 ** 16))
+
+    type_id = rng.choice((0, 1, 2, 3, 5, 6, 7))
+    count = 2 if type_id >= 5 else rng.randint(1, 4)
+    return _operator_bits(rng.randrange(8), type_id, [_packet_bits(rng, depth - 1) for _ in range(count)], rng)
+
+
+@generator(16)
+def bits_transmission(rng: Random, scale: float) -> list[str]:
+    packets = [_packet_bits(rng, 5) for _ in range(_count(8, scale))]
+    # Sum packets of at most 2047 subpackets each, nested until a single root remains
+    while len(packets) > 1:
+        packets = [_operator_bits(rng.randrange(8), 0, packets[index:index + 2047], rng)
+                   for index in range(0, len(packets), 2047)]
+    bits = packets[0]
+    bits += '0' * (-len(bits) % 4)
+    return [format(int(bits, 2), 'X').zfill(len(bits) // 4)]
+
+
+@generator(17)
+def trick_shot(rng: Random, scale: float) -> list[str]:
+    factor = math.sqrt(scale)
+    left = round(rng.randint(20, 150) * factor)
+    right = left + round(rng.randint(10, 40) * factor)
+    bottom = -round(rng.randint(50, 100) * factor)
+    top = min(-1, bottom + round(rng.randint(10, 30) * factor))
+    return [f'target area: x={left}..{right}, y={bottom}..{top}']
@@ -1,38 +1,200 @@
 from __future__ import annotations
 
+import logging
+import mmap
+import struct
+import sys
+import zlib
 from abc import abstractmethod
-from typing import Hashable, Any, Optional
+from array import array
+from collections.abc import MutableSequence, Sequence
+from functools import lru_cache
+from time import perf_counter_ns
+from typing import Hashable, Any, Callable, Iterable, Iterator, Optional, Sized
+
+log = logging.getLogger(__name__)
+
+# (dx, dy) offsets, in the order Cell.neighbors() lists them
+DIAGONAL_OFFSETS = ((-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0))
+ORTHOGONAL_OFFSETS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+
+# Biggest grid whose neighbor table is cached for every matrix of its shape, bigger ones only live in their matrix
+NEIGHBOR_TABLE_CACHE_CELLS = 10_000
+
+
+def neighbor_table(width: int, height: int, allow_diagonal: bool) -> tuple[array, array]:
+    """
+    CSR table of the neighbors of every position of a width x height grid:
+    the row-major indices of the neighbors of position i are indices[offsets[i]:offsets[i + 1]].
+    Tables of small grids are shared by every matrix of that shape, see NEIGHBOR_TABLE_CACHE_CELLS.
+    :return: offsets, indices
+    """
+    if width * height <= NEIGHBOR_TABLE_CACHE_CELLS:
+        return _shared_neighbor_table(width, height, allow_diagonal)
+    return _build_neighbor_table(width, height, allow_diagonal)
+
+
+@lru_cache(maxsize=32)
+def _shared_neighbor_table(width: int, height: int, allow_diagonal: bool) -> tuple[array, array]:
+    return _build_neighbor_table(width, height, allow_diagonal)
+
+
+def _build_neighbor_table(width: int, height: int, allow_diagonal: bool) -> tuple[array, array]:
+    typecode = 'i' if width * height < 2 ** 31 else 'q'
+    directions = DIAGONAL_OFFSETS if allow_diagonal else ORTHOGONAL_OFFSETS
+    offsets = array(typecode, [0])
+    indices = array(typecode)
+    for y in range(height):
+        for x in range(width):
+            indices.extend([(y + dy) * width + x + dx for dx, dy in directions
+                            if 0 <= x + dx < width and 0 <= y + dy < height])
+            offsets.append(len(indices))
+
+    return offsets, indices
+
+
+FINGERPRINT_MASK = 2 ** 64 - 1
+# Component label of the barrier cells, see Matrix.label_components()
+NO_COMPONENT = -1
+
+
+def position_key(index: int) -> int:
+    """
+    Pseudo-random odd 64-bit key of a row-major position (splitmix64 of the index): computed rather than stored,
+    and the same in every process
+    """
+    key = (index + 1) * 0x9E3779B97F4A7C15 & FINGERPRINT_MASK
+    key = (key ^ (key >> 30)) * 0xBF58476D1CE4E5B9 & FINGERPRINT_MASK
+    key = (key ^ (key >> 27)) * 0x94D049BB133111EB & FINGERPRINT_MASK
+    return key ^ (key >> 31) | 1
+
+
+def value_hash(value: Any) -> int:
+    """
+    Hash of a value that does not change between processes, unlike hash() of strings: integers hash to themselves,
+    characters to their ordinal and other strings to their CRC32
+    """
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, str):
+        return ord(value) if len(value) == 1 else zlib.crc32(value.encode())
+    return hash(value)
+
+
+def fingerprint(values: Sequence[Any]) -> int:
+    """
+    Hash of row-major values, equal to the fingerprint of a matrix holding them: the sum of each value hash
+    times its position key, which a single value change updates in O(1)
+    """
+    return sum(position_key(index) * value_hash(value) for index, value in enumerate(values)) & FINGERPRINT_MASK
+
+
+def stencil_rows(values: Sequence[Any], width: int, height: int, weights: dict[tuple[int, int], Any],
+                 first_row: int, last_row: int) -> list[Any]:
+    """
+    Weighted sums of Matrix.stencil() for rows first_row to last_row (excluded) of a width x height grid,
+    reading the rows around them as needed
+    :return: Row-major sums of these rows
+    """
+    result = [0] * ((last_row - first_row) * width)
+    for (dx, dy), weight in weights.items():
+        first_x, last_x = max(0, -dx), min(width, width - dx)
+        for y in range(max(first_row, -dy), min(last_row, height - dy)):
+            start, source = (y - first_row) * width, (y + dy) * width + dx
+            result[start + first_x:start + last_x] = [
+                total + weight * value
+                for total, value in zip(result[start + first_x:start + last_x],
+                                        values[source + first_x:source + last_x])]
+    return result
+
+
+def fill_components(labels: MutableSequence[int], offsets: Sequence[int], indices: Sequence[int], first: int,
+                    last: int, unlabelled: int, first_label: int = 0) -> list[int]:
+    """
+    Flood fill the unlabelled positions from first to last (excluded) without leaving that range,
+    numbering components from first_label in order of first position
+    :param labels: Row-major labels, updated in place
+    :param offsets: CSR neighbor table offsets, see neighbor_table()
+    :param indices: CSR neighbor table indices
+    :return: Size of each component
+    """
+    sizes = []
+    for start in range(first, last):
+        if labels[start] != unlabelled:
+            continue
+
+        label = first_label + len(sizes)
+        labels[start] = label
+        pending = [start]
+        size = 0
+        while pending:
+            index = pending.pop()
+            size += 1
+            for neighbor in indices[offsets[index]:offsets[index + 1]]:
+                if first <= neighbor < last and labels[neighbor] == unlabelled:
+                    labels[neighbor] = label
+                    pending.append(neighbor)
+        sizes.append(size)
+
+    return sizes
 
 
 class Matrix:
     class Cell(Hashable):
+        """
+        Grid position identified by its row-major index in the matrix: hashing and equality are integer operations,
+        and two cells of the same matrix are equal only when they are the same position.
+        Writing value keeps the matrix fingerprint up to date, see Matrix.fingerprint.
+        Subclasses adding attributes declare them in __slots__ too.
+        """
+        __slots__ = ('matrix', 'x', 'y', '_value', 'index')
 
         def __init__(self, matrix: Matrix, x: int, y: int, value: Any) -> None:
             self.matrix = matrix
             self.x = x
             self.y = y
-            self.value = value
+            self._value = value
+            self.index = y * (matrix.max_x + 1) + x
+
+        @property
+        def value(self) -> Any:
+            return self._value
+
+        @value.setter
+        def value(self, value: Any) -> None:
+            # Only dense matrices keep a fingerprint, and only once it was asked for
+            current = getattr(self.matrix, '_fingerprint', None)
+            if current is not None and value != self._value:
+                change = position_key(self.index) * (value_hash(value) - value_hash(self._value))
+                self.matrix._fingerprint = (current + change) & FINGERPRINT_MASK
+            self._value = value
 
         def __repr__(self):
             return str(self.value)
 
         def __hash__(self) -> int:
-            return hash(f'({str(self.x)}, {str(self.y)})={str(self.value)}')
+            return self.index
 
         def __eq__(self, other: Matrix.Cell):
-            return self.value == other.value
+            if not isinstance(other, Matrix.Cell):
+                return NotImplemented
+            return self.index == other.index and self.matrix is other.matrix
 
         def __lt__(self, other: Matrix.Cell):
             return self.value < other.value
 
         def neighbors(self) -> list[Matrix.Cell]:
-            if self.matrix.allow_diagonal:
-                neighbors = [self.top_left(), self.top(), self.top_right(), self.right(),
-                             self.bottom_right(), self.bottom(), self.bottom_left(), self.left()]
-            else:
-                neighbors = [self.top(), self.right(), self.bottom(), self.left()]
+            cells = self.matrix.cells
+            return [cells[index] for index in self.matrix.neighbor_indices(self.index)]
 
-            return [neighbor for neighbor in neighbors if neighbor is not None]
+        def iter_neighbors(self) -> Iterator[Matrix.Cell]:
+            """
+            Same cells as neighbors(), without building a list
+            """
+            cells = self.matrix.cells
+            for index in self.matrix.neighbor_indices(self.index):
+                yield cells[index]
 
         def top_left(self) -> Optional[Matrix.Cell]:
             if self.x <= 0 or self.y <= 0:
@@ -74,16 +236,58 @@ class Matrix:
                 return None
             return self.matrix[(self.x - 1, self.y)]
 
+    cell_class = Cell
+
     def __init__(self, input_data: list[str], allow_diagonal: bool = True) -> None:
         self.allow_diagonal = allow_diagonal
         self.input_data = input_data
         self.max_x = len(input_data[0].strip()) - 1
         self.max_y = len(input_data) - 1
+        self._neighbor_table: Optional[tuple[array, array]] = None
+        self._fingerprint: Optional[int] = None
+
+        if type(self)._init_value is Matrix._init_value and type(self)._cell_from_value is Matrix._cell_from_value:
+            # Plain matrices skip the _init_value() call, a good part of the cost of each cell
+            cell = self.cell_class
+            self.cells = [cell(self, x, y, value)
+                          for y, row in enumerate(input_data)
+                          for x, value in enumerate(row.strip())
+                          ]
+        else:
+            self.cells = [self._init_value(x, y, value)
+                          for y, row in enumerate(input_data)
+                          for x, value in enumerate(row.strip())
+                          ]
+
+    @property
+    def neighbor_table(self) -> tuple[array, array]:
+        """
+        CSR neighbor table of this matrix shape and connectivity, see neighbor_table()
+        """
+        if self._neighbor_table is None:
+            self._neighbor_table = neighbor_table(self.max_x + 1, self.max_y + 1, self.allow_diagonal)
+        return self._neighbor_table
+
+    def neighbor_indices(self, index: int) -> memoryview:
+        """
+        :return: Row-major indices of the neighbors of the cell at index, as a view over the shared table
+        """
+        offsets, indices = self.neighbor_table
+        return memoryview(indices)[offsets[index]:offsets[index + 1]]
 
-        self.cells = [self._init_value(x, y, value)
-                      for y, row in enumerate(input_data)
-                      for x, value in enumerate(row.strip())
-                      ]
+    @property
+    def width(self) -> int:
+        return self.max_x + 1
+
+    @property
+    def height(self) -> int:
+        return self.max_y + 1
+
+    def _layout(self) -> tuple[list[Matrix.Cell], int, int, int]:
+        """
+        :return: Cell storage, index of the (0, 0) cell in it, index steps between rows and between columns
+        """
+        return self.cells, 0, self.width, 1
 
     def __getitem__(self, coordinates: tuple[int, int]) -> Optional[Any]:
         col, row = coordinates
@@ -93,53 +297,1042 @@ class Matrix:
         value_index = self.max_x * row + col + row
         return self.cells[value_index]
 
+    def value_at(self, x: int, y: int) -> Any:
+        """
+        Read a value, without materializing views
+        """
+        if not (0 <= x <= self.max_x and 0 <= y <= self.max_y):
+            raise KeyError((x, y))
+        storage, offset, row_stride, column_stride = self._layout()
+        return storage[offset + y * row_stride + x * column_stride].value
+
+    def iter_rows(self) -> Iterator[list[Matrix.Cell]]:
+        """
+        Rows of cells, for reading only: the cells of a view belong to the matrix it was taken from
+        """
+        storage, offset, row_stride, column_stride = self._layout()
+        width = self.width
+        for y in range(self.height):
+            start = offset + y * row_stride
+            if column_stride == 1:
+                yield storage[start:start + width]
+            else:
+                yield storage[start - width + 1:start + 1][::-1] if width else []
+
+    def iter_cells(self) -> Iterator[Matrix.Cell]:
+        for row in self.iter_rows():
+            yield from row
+
+    def values(self) -> list[Any]:
+        """
+        Row-major values, the operand of the bulk operations below
+        """
+        return [cell.value for cell in self.iter_cells()]
+
+    def set_values(self, values: Iterable[Any]) -> None:
+        """
+        Write row-major values
+        """
+        for cell, value in zip(self.cells, values):
+            cell.value = value
+
+    def set_value(self, x: int, y: int, value: Any) -> None:
+        self[(x, y)].value = value
+
+    @property
+    def fingerprint(self) -> int:
+        """
+        Content hash, computed once then updated in O(1) by every write of a cell value
+        """
+        if self._fingerprint is None:
+            self._fingerprint = fingerprint(self.values())
+        return self._fingerprint
+
+    def invalidate_fingerprint(self) -> None:
+        """
+        Forget the fingerprint, for code writing the cells storage without going through Cell.value
+        """
+        self._fingerprint = None
+
+    def map_values(self, function: Callable[[Any], Any]) -> list[Any]:
+        return [function(value) for value in self.values()]
+
+    def count(self, predicate: Optional[Callable[[Any], bool]] = None, values: Optional[list[Any]] = None) -> int:
+        """
+        :return: Number of values matching the predicate, or of truthy values (a mask) without predicate
+        """
+        values = self.values() if values is None else values
+        if predicate is None:
+            return sum(1 for value in values if value)
+        return sum(1 for value in values if predicate(value))
+
+    def neighbor_reduce(self, reducer: Callable[[list[Any]], Any], values: Optional[list[Any]] = None) -> list[Any]:
+        """
+        Reduce the values of every cell neighbors, read straight from the neighbor table slices.
+        neighbor_min(), neighbor_max() and neighbor_sum() work a row at a time instead, and are faster.
+        :param reducer: Function of the list of a cell neighbor values
+        :param values: Row-major values, the matrix values by default
+        :return: Row-major reductions
+        """
+        values = self.values() if values is None else values
+        offsets, indices = self.neighbor_table
+        value_at = values.__getitem__
+        return [reducer(list(map(value_at, indices[start:end]))) for start, end in zip(offsets, offsets[1:])]
+
+    def neighbor_min(self, values: Optional[list[Any]] = None) -> list[Any]:
+        """
+        :return: Row-major lowest neighbor values, None for cells without neighbors
+        """
+        return self._neighbor_extremes(self.values() if values is None else values, True)
+
+    def neighbor_max(self, values: Optional[list[Any]] = None) -> list[Any]:
+        """
+        :return: Row-major highest neighbor values, None for cells without neighbors
+        """
+        return self._neighbor_extremes(self.values() if values is None else values, False)
+
+    def neighbor_sum(self, values: Optional[list[Any]] = None) -> list[Any]:
+        return self.stencil({offset: 1 for offset in self._offsets()}, values)
+
+    def _offsets(self) -> tuple[tuple[int, int], ...]:
+        return DIAGONAL_OFFSETS if self.allow_diagonal else ORTHOGONAL_OFFSETS
+
+    def _neighbor_extremes(self, values: list[Any], lowest: bool) -> list[Any]:
+        # Like stencil_rows(): each neighbor direction is compared over whole row slices
+        width, height = self.width, self.height
+        result = [None] * len(values)
+        for dx, dy in self._offsets():
+            first_x, last_x = max(0, -dx), min(width, width - dx)
+            for y in range(max(0, -dy), min(height, height - dy)):
+                start, source = y * width + first_x, (y + dy) * width + dx + first_x
+                end = start + last_x - first_x
+                pairs = zip(result[start:end], values[source:source + last_x - first_x])
+                if lowest:
+                    result[start:end] = [value if extreme is None or value < extreme else extreme
+                                         for extreme, value in pairs]
+                else:
+                    result[start:end] = [value if extreme is None or value > extreme else extreme
+                                         for extreme, value in pairs]
+        return result
+
+    def stencil(self, weights: dict[tuple[int, int], Any], values: Optional[list[Any]] = None) -> list[Any]:
+        """
+        Convolution-style weighted sum of each cell surroundings, positions outside the matrix counting as 0
+        :param weights: Weight by (dx, dy) offset, (0, 0) being the cell itself
+        :param values: Row-major values, the matrix values by default
+        :return: Row-major sums
+        """
+        values = self.values() if values is None else values
+        return stencil_rows(values, self.width, self.height, weights, 0, self.height)
+
+    def label_components(self, barrier: Optional[Callable[[Any], bool]] = None,
+                         values: Optional[list[Any]] = None) -> tuple[array, list[int]]:
+        """
+        Label the connected components with an iterative flood fill over the neighbor table,
+        in linear time and without recursion whatever their shape
+        :param barrier: Predicate on values telling the cells belonging to no component, none by default
+        :param values: Row-major values, the matrix values by default
+        :return: Row-major labels, numbered in order of first cell with NO_COMPONENT for barrier cells,
+            and the size of each component by label
+        """
+        values = self.values() if values is None else values
+        offsets, indices = self.neighbor_table
+        unlabelled = NO_COMPONENT - 1
+        labels = array(indices.typecode, [unlabelled]) * len(values)
+        if barrier is not None:
+            for index, value in enumerate(values):
+                if barrier(value):
+                    labels[index] = NO_COMPONENT
+
+        return labels, fill_components(labels, offsets, indices, 0, len(values), unlabelled)
+
+    @classmethod
+    def from_values(cls, values: Sequence[Any], width: int, height: int, allow_diagonal: bool = True) -> Matrix:
+        """
+        Build a matrix from already parsed row-major values, cells created by _cell_from_value()
+        """
+        matrix = cls.__new__(cls)
+        matrix.allow_diagonal = allow_diagonal
+        matrix.input_data = None
+        matrix._neighbor_table = None
+        matrix._fingerprint = None
+        matrix._restore(values, width, height)
+        return matrix
+
+    def _restore(self, values: Sequence[Any], width: int, height: int) -> None:
+        self.max_x = width - 1
+        self.max_y = height - 1
+        self.cells = [self._cell_from_value(index % width, index // width, value)
+                      for index, value in enumerate(values)]
+
+    def save(self, file_path: str, compress: bool = False) -> None:
+        """
+        Write the values as a binary snapshot, see encode_snapshot()
+        """
+        save_snapshot(file_path, self.values(), self.width, self.height, compress)
+
+    @classmethod
+    def load(cls, file_path: str, allow_diagonal: bool = True) -> Matrix:
+        return cls.from_values(*load_snapshot(file_path), allow_diagonal)
+
+    def __getstate__(self) -> dict:
+        """
+        Pickle the values as a snapshot rather than one object per cell: cells are rebuilt through _cell_from_value(),
+        so the attributes they add are reset
+        """
+        try:
+            snapshot = encode_snapshot(self.values(), self.width, self.height)
+        except TypeError:
+            return self.__dict__
+
+        state = {name: value for name, value in self.__dict__.items()
+                 if name not in ('cells', '_neighbor_table', '_fingerprint')}
+        state['snapshot'] = snapshot
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        snapshot = state.pop('snapshot', None)
+        self.__dict__.update(state)
+        if snapshot is not None:
+            self._neighbor_table = None
+            self._fingerprint = None
+            self._restore(*decode_snapshot(snapshot))
+
+    def iter_lines(self) -> Iterator[str]:
+        """
+        Text of each row, one at a time, see aocutils.render
+        """
+        for row in self.iter_rows():
+            yield ''.join([str(cell) for cell in row])
+
     def __repr__(self) -> str:
-        output = ''
-        for value in self.cells:
-            output += str(value)
-            if value.x == self.max_x:
-                output += "\n"
-        return output.strip()
+        return "\n".join(self.iter_lines()).strip()
 
     def __eq__(self, other: Matrix):
-        return str(self) == str(other)
+        if not isinstance(other, Matrix):
+            return str(self) == str(other)
+        # Different fingerprints are a cheap proof of difference, equal ones could still collide
+        if (self.width, self.height) != (other.width, other.height) or self.fingerprint != other.fingerprint:
+            return False
+        return self.values() == other.values()
 
     @abstractmethod
-    def _init_value(self, x, y, value) -> Matrix.Cell:
-        return Matrix.Cell(self, x, y, value)
+    def _init_value(self, x, y, value: str) -> Matrix.Cell:
+        """
+        Cell of a character of the input text: subclasses parse it here and pass the result to _cell_from_value()
+        """
+        return self._cell_from_value(x, y, value)
 
-    def vsplit(self, x: int) -> tuple[Matrix, Matrix]:
-        matrix_lines = str(self).split("\n")
-        for line in matrix_lines:
-            for column, value in enumerate(line):
-                if column == x:
-                    print(' | ', end='')
-                else:
-                    print(value, end='')
-            print('')
-        print('')
+    def _cell_from_value(self, x, y, value) -> Matrix.Cell:
+        """
+        Cell of an already parsed value, as given to from_values() or restored from a snapshot or a view
+        """
+        return self.cell_class(self, x, y, value)
 
-        left_half = [line[0:x] for line in matrix_lines]
-        right_half = [line[x + 1:] for line in matrix_lines]
+    @classmethod
+    def view_class(cls) -> type[MatrixView]:
+        """
+        MatrixView subclass of this matrix class, so that views keep the methods of the matrix they come from
+        """
+        if issubclass(cls, MatrixView):
+            return cls
+        if cls not in _VIEW_CLASSES:
+            _VIEW_CLASSES[cls] = type(cls.__name__ + 'View', (MatrixView, cls), {'__module__': cls.__module__})
+        return _VIEW_CLASSES[cls]
 
-        return self.__class__(left_half), self.__class__(right_half)
+    def view(self, x: int, y: int, width: int, height: int, flip_x: bool = False, flip_y: bool = False) -> Matrix:
+        """
+        Window over this matrix cells, optionally mirrored, without copying anything
+        """
+        storage, offset, row_stride, column_stride = self._layout()
+        offset += y * row_stride + x * column_stride
+        if flip_y and height:
+            offset += (height - 1) * row_stride
+            row_stride = -row_stride
+        if flip_x and width:
+            offset += (width - 1) * column_stride
+            column_stride = -column_stride
 
-    def hsplit(self, y: int) -> tuple[Matrix, Matrix]:
-        matrix_lines = str(self).split("\n")
-        for line, value in enumerate(matrix_lines):
-            if line == y:
-                print('—' * len(value))
-            else:
-                print(value)
-        print('')
+        return self.view_class()(self, storage, offset, width, height, row_stride, column_stride)
 
-        top_half = matrix_lines[0:y]
-        bottom_half = matrix_lines[y + 1:]
+    def vsplit(self, x: int) -> tuple[Matrix, Matrix]:
+        """
+        Views on each side of column x
+        """
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('%s\n', "\n".join(line[:x] + ' | ' + line[x + 1:] for line in str(self).split("\n")))
 
-        return self.__class__(top_half), self.__class__(bottom_half)
+        return (self.view(0, 0, x, self.height),
+                self.view(x + 1, 0, self.width - x - 1, self.height))
+
+    def hsplit(self, y: int) -> tuple[Matrix, Matrix]:
+        """
+        Views on each side of row y
+        """
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('%s\n', "\n".join('—' * len(value) if line == y else value
+                                         for line, value in enumerate(str(self).split("\n"))))
+
+        return (self.view(0, 0, self.width, y),
+                self.view(0, y + 1, self.width, self.height - y - 1))
 
     def vflip(self) -> Matrix:
-        return self.__class__(list(reversed(self.input_data)))
+        return self.view(0, 0, self.width, self.height, flip_y=True)
 
     def hflip(self) -> Matrix:
-        return self.__class__([line[::-1] for line in self.input_data])
\ No newline at end of file
+        return self.view(0, 0, self.width, self.height, flip_x=True)
+
+
+_VIEW_CLASSES: dict[type, type] = {}
+
+
+class MatrixView(Matrix):
+    """
+    Matrix reading its cells from another matrix storage through an offset and strides.
+    Reading values (value_at, iter_rows, iter_cells, str) goes to the shared storage, while reaching for cell
+    objects (cells, matrix[(x, y)], neighbors), which can be written to, first materializes a copy of its own.
+    """
+
+    def __init__(self, source: Matrix, storage: list[Matrix.Cell], offset: int, width: int, height: int,
+                 row_stride: int, column_stride: int) -> None:
+        self.allow_diagonal = source.allow_diagonal
+        self.max_x = width - 1
+        self.max_y = height - 1
+        self._neighbor_table: Optional[tuple[array, array]] = None
+        self._fingerprint: Optional[int] = None
+        self._storage = storage
+        self._offset = offset
+        self._row_stride = row_stride
+        self._column_stride = column_stride
+        self._cells: Optional[list[Matrix.Cell]] = None
+
+    @property
+    def materialized(self) -> bool:
+        return self._cells is not None
+
+    @property
+    def input_data(self) -> list[str]:
+        return str(self).split("\n")
+
+    @property
+    def cells(self) -> list[Matrix.Cell]:
+        if self._cells is None:
+            self.materialize()
+        return self._cells
+
+    @property
+    def fingerprint(self) -> int:
+        # The viewed storage can be written through the source matrix: only a materialized copy keeps its own
+        if self._cells is None:
+            return fingerprint(self.values())
+        return super().fingerprint
+
+    def materialize(self) -> None:
+        """
+        Copy the viewed cells, rebuilt from their values like Matrix.from_values() does
+        """
+        if self._cells is not None:
+            return
+
+        self._cells = [self._cell_from_value(x, y, cell.value)
+                       for y, row in enumerate(self.iter_rows())
+                       for x, cell in enumerate(row)]
+        self._storage = None
+
+    def _layout(self) -> tuple[list[Matrix.Cell], int, int, int]:
+        if self._cells is not None:
+            return self._cells, 0, self.width, 1
+        return self._storage, self._offset, self._row_stride, self._column_stride
+
+
+class StateHistory(Sized):
+    """
+    Index of the configurations a simulation went through, by matrix fingerprint, to detect a repeated one.
+    With verify, the default, each configuration is also kept as a tuple of values, so that a fingerprint collision
+    cannot pass for a repetition; without it, lookups cost O(1) whatever the matrix size.
+    """
+
+    def __init__(self, verify: bool = True) -> None:
+        self.verify = verify
+        self.steps: dict[int, list[int]] = {}
+        self.snapshots: dict[int, tuple] = {}
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def record(self, matrix: Matrix) -> Optional[int]:
+        """
+        Record the matrix configuration as the next step
+        :return: First step having the same configuration, None when it was never seen
+        """
+        step = self._length
+        self._length += 1
+        snapshot = tuple(matrix.values()) if self.verify else None
+        seen = self.steps.setdefault(matrix.fingerprint, [])
+        for earlier in seen:
+            if not self.verify or self.snapshots[earlier] == snapshot:
+                return earlier
+
+        seen.append(step)
+        if self.verify:
+            self.snapshots[step] = snapshot
+        return None
+
+
+class Automaton:
+    """
+    Synchronous cellular automaton over the cells of a matrix: each step computes the next values from the
+    current ones into a second buffer, then swaps the two buffers.
+    Only the cells having a changed neighbor or value in the previous step are computed again, so quiescent
+    areas cost nothing. This requires the rule to be a pure function of the cell value and its neighbor values.
+
+    The rule is either called once per active cell, or once per step with all the active cells (batch): a batch rule
+    computes the whole batch at once, for instance by converting the buffer into a numpy array.
+    """
+
+    def __init__(self, matrix: Matrix, rule: Callable[..., Any], values: Optional[list[Any]] = None,
+                 batch: bool = False) -> None:
+        """
+        :param matrix: Matrix giving the shape, the connectivity and by default the initial values
+        :param rule: Next value of a cell from its value and its neighbor values, in the neighbor table order.
+            With batch, next values of the active cells from the current row-major values and the active indices,
+            in the order of these indices
+        :param values: Initial row-major values, the matrix values by default
+        """
+        self.matrix = matrix
+        self.rule = rule
+        self.batch = batch
+        self.steps = 0
+        self.elapsed_ns = 0
+        self._allocate(matrix.values() if values is None else values)
+
+    def _allocate(self, values: list[Any]) -> None:
+        """
+        Create the two buffers holding the initial values, and mark every cell as active
+        """
+        self.values = list(values)
+        self._next = list(values)
+        self.active = list(range(len(values)))
+
+    def __enter__(self) -> Automaton:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Free what the buffers hold outside of this object, nothing for list buffers
+        """
+
+    @property
+    def stable(self) -> bool:
+        return not self.active
+
+    @property
+    def steps_per_second(self) -> float:
+        return self.steps * 1_000_000_000 / self.elapsed_ns if self.elapsed_ns else 0.0
+
+    def step(self) -> int:
+        """
+        :return: Number of cells whose value changed
+        """
+        start = perf_counter_ns()
+        current, following, rule = self.values, self._next, self.rule
+        offsets, indices = self.matrix.neighbor_table
+
+        if self.batch:
+            for index, value in zip(self.active, rule(current, self.active)):
+                following[index] = value
+        else:
+            for index in self.active:
+                following[index] = rule(current[index],
+                                        [current[neighbor] for neighbor in indices[offsets[index]:offsets[index + 1]]])
+        changed = [index for index in self.active if following[index] != current[index]]
+
+        # The buffer being retired only lags behind on the changed cells
+        self.values, self._next = following, current
+        for index in changed:
+            current[index] = following[index]
+
+        # Next step, only the changed cells and their neighbors can change
+        marked = bytearray(len(current))
+        active = []
+        for index in changed:
+            for position in (index, *indices[offsets[index]:offsets[index + 1]]):
+                if not marked[position]:
+                    marked[position] = 1
+                    active.append(position)
+        self.active = active
+
+        self.steps += 1
+        self.elapsed_ns += perf_counter_ns() - start
+        return len(changed)
+
+    def run(self, steps: int) -> int:
+        """
+        Step until the given number of steps, or until nothing changes anymore
+        :return: Number of steps run
+        """
+        run_steps = 0
+        while run_steps < steps and not self.stable:
+            self.step()
+            run_steps += 1
+
+        log.debug('%d automaton steps, %.1f steps/s', self.steps, self.steps_per_second)
+        return run_steps
+
+    def write_back(self) -> None:
+        """
+        Store the current values in the matrix cells
+        """
+        self.matrix.set_values(self.values)
+
+
+class SparseMatrix(Sized):
+    """
+    Matrix keeping only its occupied positions, in a dict keyed by (x, y): memory grows with the number of
+    occupied cells, not with the bounding box. Every other position holds the default value and renders as blank.
+    """
+    blank = '.'
+    default: Any = None
+
+    class Cell(Matrix.Cell):
+        __slots__ = ()
+
+        def neighbors(self) -> list[Matrix.Cell]:
+            return list(self.iter_neighbors())
+
+        def iter_neighbors(self) -> Iterator[Matrix.Cell]:
+            """
+            Occupied neighbors, in the Matrix.Cell.neighbors() order
+            """
+            points = self.matrix.points
+            for dx, dy in self.matrix.offsets:
+                neighbor = points.get((self.x + dx, self.y + dy))
+                if neighbor is not None:
+                    yield neighbor
+
+    cell_class = Cell
+
+    def __init__(self, input_data: Optional[list[str]] = None, allow_diagonal: bool = True) -> None:
+        """
+        :param input_data: Text rows, characters other than blank become occupied cells
+        """
+        self.allow_diagonal = allow_diagonal
+        self.points: dict[tuple[int, int], Matrix.Cell] = {}
+        lines = [line.strip() for line in input_data or []]
+        self.max_x = len(lines[0]) - 1 if lines else -1
+        self.max_y = len(lines) - 1
+
+        for y, row in enumerate(lines):
+            for x, value in enumerate(row):
+                if value != self.blank:
+                    self.points[(x, y)] = self._init_value(x, y, value)
+
+    @classmethod
+    def from_values(cls, values: dict[tuple[int, int], Any], width: int, height: int,
+                    allow_diagonal: bool = True) -> SparseMatrix:
+        """
+        Build a matrix from already parsed values, positions holding the default value stay unoccupied
+        """
+        matrix = cls.__new__(cls)
+        SparseMatrix.__init__(matrix, None, allow_diagonal)
+        matrix.max_x = width - 1
+        matrix.max_y = height - 1
+        for (x, y), value in values.items():
+            if value != cls.default:
+                matrix.points[(x, y)] = matrix._cell_from_value(x, y, value)
+        return matrix
+
+    def _init_value(self, x, y, value: str) -> Matrix.Cell:
+        return self._cell_from_value(x, y, value)
+
+    def _cell_from_value(self, x, y, value) -> Matrix.Cell:
+        return self.cell_class(self, x, y, value)
+
+    @property
+    def width(self) -> int:
+        return self.max_x + 1
+
+    @property
+    def height(self) -> int:
+        return self.max_y + 1
+
+    @property
+    def offsets(self) -> tuple[tuple[int, int], ...]:
+        return DIAGONAL_OFFSETS if self.allow_diagonal else ORTHOGONAL_OFFSETS
+
+    @property
+    def cells(self) -> list[Matrix.Cell]:
+        """
+        Occupied cells in row-major order
+        """
+        return [self.points[position] for position in sorted(self.points, key=lambda position: position[::-1])]
+
+    def __iter__(self) -> Iterator[Matrix.Cell]:
+        return iter(self.cells)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def __contains__(self, coordinates: tuple[int, int]) -> bool:
+        return coordinates in self.points
+
+    def _check_bounds(self, x: int, y: int) -> None:
+        if not (0 <= x <= self.max_x and 0 <= y <= self.max_y):
+            raise KeyError((x, y))
+
+    def __getitem__(self, coordinates: tuple[int, int]) -> Optional[Matrix.Cell]:
+        """
+        :return: The cell at these coordinates, None when unoccupied
+        """
+        self._check_bounds(*coordinates)
+        return self.points.get(coordinates)
+
+    def __setitem__(self, coordinates: tuple[int, int], value: Any) -> None:
+        x, y = coordinates
+        self._check_bounds(x, y)
+        if value == self.default:
+            self.points.pop(coordinates, None)
+        elif coordinates in self.points:
+            self.points[coordinates].value = value
+        else:
+            self.points[coordinates] = self._cell_from_value(x, y, value)
+
+    def value_at(self, x: int, y: int) -> Any:
+        self._check_bounds(x, y)
+        cell = self.points.get((x, y))
+        return self.default if cell is None else cell.value
+
+    def save(self, file_path: str, compress: bool = True) -> None:
+        """
+        Write a binary snapshot of the dense values, empty positions holding the default value, or the blank
+        character without default: compression keeps sparse sheets small
+        """
+        values = [self._empty_value()] * (self.width * self.height)
+        for (x, y), cell in self.points.items():
+            values[y * self.width + x] = cell.value
+        save_snapshot(file_path, values, self.width, self.height, compress)
+
+    @classmethod
+    def load(cls, file_path: str, allow_diagonal: bool = True) -> SparseMatrix:
+        values, width, height = load_snapshot(file_path)
+        empty = cls._empty_value()
+        return cls.from_values({(index % width, index // width): value for index, value in enumerate(values)
+                                if value != empty}, width, height, allow_diagonal)
+
+    @classmethod
+    def _empty_value(cls) -> Any:
+        return cls.blank if cls.default is None else cls.default
+
+    def points_by_row(self) -> dict[int, list[SparseMatrix.Cell]]:
+        rows: dict[int, list[SparseMatrix.Cell]] = {}
+        for (_, y), cell in self.points.items():
+            rows.setdefault(y, []).append(cell)
+        return rows
+
+    def iter_lines(self) -> Iterator[str]:
+        """
+        Text of each row, empty positions showing blank: only one row is built at a time
+        """
+        rows = self.points_by_row()
+        empty_row = self.blank * self.width
+        for y in range(self.height):
+            if y not in rows:
+                yield empty_row
+                continue
+            row = [self.blank] * self.width
+            for cell in rows.pop(y):
+                row[cell.x] = str(cell)
+            yield ''.join(row)
+
+    def __repr__(self) -> str:
+        return "\n".join(self.iter_lines())
+
+    def __eq__(self, other: SparseMatrix | Matrix):
+        if isinstance(other, SparseMatrix):
+            return ((self.width, self.height) == (other.width, other.height)
+                    and {position: cell.value for position, cell in self.points.items()}
+                    == {position: cell.value for position, cell in other.points.items()})
+        return str(self) == str(other)
+
+    def _moved(self, move: Callable[[int, int], Optional[tuple[int, int]]], width: int, height: int) -> SparseMatrix:
+        values = {}
+        for (x, y), cell in self.points.items():
+            position = move(x, y)
+            if position is not None:
+                values[position] = cell.value
+        return self.from_values(values, width, height, self.allow_diagonal)
+
+    def vsplit(self, x: int) -> tuple[SparseMatrix, SparseMatrix]:
+        """
+        Halves on each side of column x
+        """
+        return (self._moved(lambda px, py: (px, py) if px < x else None, x, self.height),
+                self._moved(lambda px, py: (px - x - 1, py) if px > x else None, self.width - x - 1, self.height))
+
+    def hsplit(self, y: int) -> tuple[SparseMatrix, SparseMatrix]:
+        """
+        Halves on each side of row y
+        """
+        return (self._moved(lambda px, py: (px, py) if py < y else None, self.width, y),
+                self._moved(lambda px, py: (px, py - y - 1) if py > y else None, self.width, self.height - y - 1))
+
+    def vflip(self) -> SparseMatrix:
+        return self._moved(lambda px, py: (px, self.max_y - py), self.width, self.height)
+
+    def hflip(self) -> SparseMatrix:
+        return self._moved(lambda px, py: (self.max_x - px, py), self.width, self.height)
+
+
+class LazyMatrix:
+    """
+    Matrix computing its values on access through value_at(), which subclasses implement. Cells get created
+    (then kept, so that they stay the same objects) only when reached for, and neighbors are computed
+    arithmetically rather than read from a neighbor table the size of the whole grid.
+    """
+
+    class CellSequence(Sequence):
+        """
+        Row-major cells, created when accessed
+        """
+
+        def __init__(self, matrix: LazyMatrix) -> None:
+            self.matrix = matrix
+
+        def __len__(self) -> int:
+            return self.matrix.width * self.matrix.height
+
+        def __getitem__(self, index: int) -> Matrix.Cell:
+            if isinstance(index, slice):
+                return [self[position] for position in range(*index.indices(len(self)))]
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError(index)
+            return self.matrix.cell(index)
+
+    cell_class = Matrix.Cell
+    allow_diagonal = True
+    max_x = -1
+    max_y = -1
+
+    @property
+    def width(self) -> int:
+        return self.max_x + 1
+
+    @property
+    def height(self) -> int:
+        return self.max_y + 1
+
+    @property
+    def offsets(self) -> tuple[tuple[int, int], ...]:
+        return DIAGONAL_OFFSETS if self.allow_diagonal else ORTHOGONAL_OFFSETS
+
+    @property
+    def cells(self) -> LazyMatrix.CellSequence:
+        return LazyMatrix.CellSequence(self)
+
+    @property
+    def materialized(self) -> int:
+        """
+        :return: Number of cells created so far
+        """
+        return len(self._cells)
+
+    @abstractmethod
+    def value_at(self, x: int, y: int) -> Any:
+        pass
+
+    def _check_bounds(self, x: int, y: int) -> None:
+        if not (0 <= x <= self.max_x and 0 <= y <= self.max_y):
+            raise KeyError((x, y))
+
+    def _cell_from_value(self, x, y, value) -> Matrix.Cell:
+        return self.cell_class(self, x, y, value)
+
+    def cell(self, index: int) -> Matrix.Cell:
+        cell = self._cells.get(index)
+        if cell is None:
+            y, x = divmod(index, self.width)
+            cell = self._cells[index] = self._cell_from_value(x, y, self.value_at(x, y))
+        return cell
+
+    def __getitem__(self, coordinates: tuple[int, int]) -> Matrix.Cell:
+        col, row = coordinates
+        self._check_bounds(col, row)
+        return self.cell(row * self.width + col)
+
+    def neighbor_indices(self, index: int) -> list[int]:
+        width, height = self.width, self.height
+        y, x = divmod(index, width)
+        return [(y + dy) * width + x + dx for dx, dy in self.offsets
+                if 0 <= x + dx < width and 0 <= y + dy < height]
+
+    def save(self, file_path: str, compress: bool = False) -> None:
+        """
+        Write a binary snapshot of every value, computing them: load it back with Matrix.load() or a subclass
+        """
+        values = [self.value_at(x, y) for y in range(self.height) for x in range(self.width)]
+        save_snapshot(file_path, values, self.width, self.height, compress)
+
+    def iter_lines(self) -> Iterator[str]:
+        for y in range(self.height):
+            yield ''.join([str(self.value_at(x, y)) for x in range(self.width)])
+
+    def __repr__(self) -> str:
+        return "\n".join(self.iter_lines())
+
+    def __eq__(self, other):
+        return str(self) == str(other)
+
+
+class TiledMatrix(LazyMatrix):
+    """
+    Base matrix repeated over tiles_x by tiles_y tiles, the values of each tile derived from the base values
+    through tile_value(). Nothing is stored upfront, see LazyMatrix.
+    """
+
+    def __init__(self, base: Matrix, tiles_x: int, tiles_y: Optional[int] = None,
+                 transform: Optional[Callable[[Any, int, int], Any]] = None,
+                 allow_diagonal: Optional[bool] = None) -> None:
+        """
+        :param base: Tile content, anything with value_at(x, y), width and height
+        :param tiles_x: Number of tiles across
+        :param tiles_y: Number of tiles down, tiles_x by default
+        :param transform: Tile value function of (base value, tile column, tile row), unless tile_value is overridden
+        :param allow_diagonal: Connectivity, the base one by default
+        """
+        self.base = base
+        self.tiles_x = tiles_x
+        self.tiles_y = tiles_x if tiles_y is None else tiles_y
+        self.transform = transform
+        self.allow_diagonal = base.allow_diagonal if allow_diagonal is None else allow_diagonal
+        self.max_x = base.width * self.tiles_x - 1
+        self.max_y = base.height * self.tiles_y - 1
+        self._cells: dict[int, Matrix.Cell] = {}
+
+    def tile_value(self, value: Any, tile_x: int, tile_y: int) -> Any:
+        if self.transform is None:
+            return value
+        return self.transform(value, tile_x, tile_y)
+
+    def value_at(self, x: int, y: int) -> Any:
+        self._check_bounds(x, y)
+        tile_x, base_x = divmod(x, self.base.width)
+        tile_y, base_y = divmod(y, self.base.height)
+        return self.tile_value(self.base.value_at(base_x, base_y), tile_x, tile_y)
+
+
+GRID_MAGIC = b'AOCGRID1'
+GRID_HEADER = struct.Struct('<8sII')
+# Maps the ASCII digits to their values, leaving every other byte unchanged
+DIGIT_VALUES = bytes(byte - ord('0') if ord('0') <= byte <= ord('9') else byte for byte in range(256))
+
+
+def write_binary_grid(text_path: str, binary_path: str) -> tuple[int, int]:
+    """
+    Convert a text digit grid into the binary grid format: a GRID_HEADER (magic, width, height) followed by
+    one byte per cell holding the digit value, row after row. Lines are streamed, the grid never is in memory.
+    :return: width, height
+    """
+    width, height = 0, 0
+    with open(text_path, 'rb') as text_file, open(binary_path, 'wb') as binary_file:
+        binary_file.write(GRID_HEADER.pack(GRID_MAGIC, 0, 0))
+        for line in text_file:
+            line = line.rstrip(b'\r\n')
+            if not line:
+                continue
+            if height and len(line) != width:
+                raise ValueError(f'Line {height + 1} of {text_path} is {len(line)} wide instead of {width}')
+            width = len(line)
+            binary_file.write(line.translate(DIGIT_VALUES))
+            height += 1
+
+        binary_file.seek(0)
+        binary_file.write(GRID_HEADER.pack(GRID_MAGIC, width, height))
+
+    return width, height
+
+
+SNAPSHOT_MAGIC = b'AOCSNAP1'
+# Magic, flags, value kind, width, height
+SNAPSHOT_HEADER = struct.Struct('<8sBcII')
+SNAPSHOT_COMPRESSED = 1
+# Value kinds besides the array typecodes of the integer and float values
+BOOL_KIND = b'?'
+CHAR_KIND = b's'
+INTEGER_KINDS = (b'b', b'B', b'h', b'H', b'i', b'I', b'q')
+
+
+def _snapshot_kind(values: Sequence[Any]) -> bytes:
+    if all(type(value) is bool for value in values):
+        return BOOL_KIND
+    if all(type(value) is int for value in values):
+        lowest, highest = min(values, default=0), max(values, default=0)
+        for kind in INTEGER_KINDS:
+            bits = array(kind.decode()).itemsize * 8
+            signed = kind.islower()
+            if (-(2 ** (bits - 1)) if signed else 0) <= lowest and highest < 2 ** (bits - signed):
+                return kind
+    elif all(type(value) is float for value in values):
+        return b'd'
+    elif all(type(value) is str and len(value) == 1 and ord(value) < 256 for value in values):
+        return CHAR_KIND
+    raise TypeError('Only booleans, 64-bit integers, floats or single Latin-1 characters can be snapshotted')
+
+
+def encode_snapshot(values: Sequence[Any], width: int, height: int, compress: bool = False) -> bytes:
+    """
+    Binary snapshot of row-major values: a SNAPSHOT_HEADER (magic, flags, value kind, width, height) followed by
+    the values packed in the smallest little-endian array type holding them, optionally zlib-compressed
+    """
+    if len(values) != width * height:
+        raise ValueError(f'{len(values)} values do not fill a {width}x{height} grid')
+
+    kind = _snapshot_kind(values)
+    if kind == BOOL_KIND:
+        payload = bytes(values)
+    elif kind == CHAR_KIND:
+        payload = ''.join(values).encode('latin-1')
+    else:
+        packed = array(kind.decode(), values)
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        payload = packed.tobytes()
+
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload)
+        flags |= SNAPSHOT_COMPRESSED
+    return SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, flags, kind, width, height) + payload
+
+
+def decode_snapshot(data: bytes) -> tuple[list[Any], int, int]:
+    """
+    :return: Row-major values, width and height of an encode_snapshot() snapshot
+    """
+    if len(data) < SNAPSHOT_HEADER.size:
+        raise ValueError('Not a matrix snapshot')
+    magic, flags, kind, width, height = SNAPSHOT_HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError('Not a matrix snapshot')
+
+    payload = memoryview(data)[SNAPSHOT_HEADER.size:]
+    if flags & SNAPSHOT_COMPRESSED:
+        payload = zlib.decompress(payload)
+
+    if kind == BOOL_KIND:
+        values = [byte != 0 for byte in bytes(payload)]
+    elif kind == CHAR_KIND:
+        values = list(bytes(payload).decode('latin-1'))
+    else:
+        unpacked = array(kind.decode())
+        unpacked.frombytes(payload)
+        if sys.byteorder == 'big':
+            unpacked.byteswap()
+        values = unpacked.tolist()
+
+    if len(values) != width * height:
+        raise ValueError(f'Truncated snapshot: {len(values)} values for a {width}x{height} grid')
+    return values, width, height
+
+
+def save_snapshot(file_path: str, values: Sequence[Any], width: int, height: int, compress: bool = False) -> None:
+    with open(file_path, 'wb') as snapshot_file:
+        snapshot_file.write(encode_snapshot(values, width, height, compress))
+
+
+def load_snapshot(file_path: str) -> tuple[list[Any], int, int]:
+    """
+    Read a snapshot file in a single read
+    :return: Row-major values, width and height
+    """
+    with open(file_path, 'rb') as snapshot_file:
+        return decode_snapshot(snapshot_file.read())
+
+
+class MappedMatrix(LazyMatrix):
+    """
+    Read-only digit grid served from a memory-mapped file, either a fixed-width text grid or a binary grid
+    written by write_binary_grid(): values come straight from the page cache, so grids bigger than memory
+    can be scanned (row_values) and searched (cells are created on access, see LazyMatrix).
+    """
+
+    def __init__(self, file_path: str, allow_diagonal: bool = True) -> None:
+        self.file_path = file_path
+        self.allow_diagonal = allow_diagonal
+        self._cells: dict[int, Matrix.Cell] = {}
+        self._file = open(file_path, 'rb')
+        try:
+            self._mapping = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f'Cannot map the empty file {file_path}')
+
+        try:
+            if self._mapping[:len(GRID_MAGIC)] == GRID_MAGIC:
+                _, width, height = GRID_HEADER.unpack_from(self._mapping)
+                self.binary = True
+                self._start = GRID_HEADER.size
+                self._row_stride = width
+                self._zero = 0
+            else:
+                width, height = self._text_layout()
+                self.binary = False
+                self._start = 0
+                self._zero = ord('0')
+        except BaseException:
+            self.close()
+            raise
+        self.max_x = width - 1
+        self.max_y = height - 1
+
+    def _text_layout(self) -> tuple[int, int]:
+        mapping = self._mapping
+        end = len(mapping)
+        while end and mapping[end - 1:end] in (b'\n', b'\r', b' '):
+            end -= 1
+
+        line_end = mapping.find(b'\n', 0, end)
+        if line_end < 0:
+            self._row_stride = end
+            return end, 1 if end else 0
+
+        self._row_stride = line_end + 1
+        width = line_end - 1 if mapping[line_end - 1:line_end] == b'\r' else line_end
+        height = (end + self._row_stride - 1) // self._row_stride
+        if end != (height - 1) * self._row_stride + width:
+            raise ValueError(f'{self.file_path} is not a fixed-width grid')
+        return width, height
+
+    def __enter__(self) -> MappedMatrix:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict:
+        return {'file_path': self.file_path, 'allow_diagonal': self.allow_diagonal}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state['file_path'], state['allow_diagonal'])
+
+    def close(self) -> None:
+        self._mapping.close()
+        self._file.close()
+
+    def value_at(self, x: int, y: int) -> int:
+        self._check_bounds(x, y)
+        return self._mapping[self._start + y * self._row_stride + x] - self._zero
+
+    def row_values(self, y: int) -> bytes:
+        """
+        :return: Values of a row, one byte each
+        """
+        self._check_bounds(0, y)
+        start = self._start + y * self._row_stride
+        row = self._mapping[start:start + self.width]
+        return row if self.binary else row.translate(DIGIT_VALUES)
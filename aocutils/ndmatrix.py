@@ -0,0 +1,283 @@
+"""
+Matrix backend storing the values in a contiguous numpy array instead of one Cell object per position.
+
+Grid-wide work goes through vectorized neighbor gathering, masks and reductions, while Cell objects remain
+available as thin views created on access, so code written against aocutils.matrix.Matrix keeps working.
+numpy is only imported by the days using this module.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Sequence
+from typing import Any, Callable, Iterator, Optional
+
+import numpy as np
+
+from aocutils.matrix import DIAGONAL_OFFSETS, GRID_HEADER, GRID_MAGIC, ORTHOGONAL_OFFSETS, Matrix
+
+log = logging.getLogger(__name__)
+
+
+def parse_digits(input_data: list[str], dtype: Any = np.uint8) -> np.ndarray:
+    """
+    Parse lines of digits into a 2D array, without going through one Python object per digit
+    """
+    lines = [line.strip() for line in input_data]
+    lines = [line for line in lines if line]
+    if not lines:
+        return np.zeros((0, 0), dtype=dtype)
+
+    width = len(lines[0])
+    if any(len(line) != width for line in lines):
+        raise ValueError('Matrix lines must all have the same length')
+
+    digits = np.frombuffer(''.join(lines).encode('ascii'), dtype=np.uint8) - ord('0')
+    if digits.size and digits.max() > 9:
+        raise ValueError('Matrix lines must only contain digits')
+    return digits.reshape(len(lines), width).astype(dtype, copy=False)
+
+
+class ArrayMatrix:
+    """
+    Grid of numbers stored as a (rows, columns) numpy array, indexed like Matrix with (x, y) coordinates
+    """
+
+    class Cell(Matrix.Cell):
+        """
+        View over one array position: reading or writing value goes straight to the array
+        """
+        __slots__ = ()
+
+        def __init__(self, matrix: ArrayMatrix, x: int, y: int) -> None:
+            self.matrix = matrix
+            self.x = x
+            self.y = y
+            self.index = y * matrix.width + x
+
+        @property
+        def value(self) -> Any:
+            return self.matrix.values[self.y, self.x].item()
+
+        @value.setter
+        def value(self, value: Any) -> None:
+            self.matrix.values[self.y, self.x] = value
+
+    class CellSequence(Sequence):
+        """
+        Row-major cell views, created when accessed
+        """
+
+        def __init__(self, matrix: ArrayMatrix) -> None:
+            self.matrix = matrix
+
+        def __len__(self) -> int:
+            return self.matrix.values.size
+
+        def __getitem__(self, index: int) -> ArrayMatrix.Cell:
+            if isinstance(index, slice):
+                return [self[position] for position in range(*index.indices(len(self)))]
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError(index)
+            y, x = divmod(index, self.matrix.width)
+            return self.matrix.cell_class(self.matrix, x, y)
+
+        def __iter__(self) -> Iterator[ArrayMatrix.Cell]:
+            cell_class = self.matrix.cell_class
+            for y in range(self.matrix.height):
+                for x in range(self.matrix.width):
+                    yield cell_class(self.matrix, x, y)
+
+    cell_class = Cell
+
+    def __init__(self, input_data: list[str], allow_diagonal: bool = True, dtype: Any = np.uint8) -> None:
+        self.allow_diagonal = allow_diagonal
+        self.values = parse_digits(input_data, dtype)
+
+    @classmethod
+    def from_array(cls, values: np.ndarray, allow_diagonal: bool = True) -> ArrayMatrix:
+        """
+        Wrap an existing 2D array, without copying it
+        """
+        if values.ndim != 2:
+            raise ValueError(f'Expected a 2D array, got {values.ndim} dimensions')
+
+        matrix = cls.__new__(cls)
+        matrix.allow_diagonal = allow_diagonal
+        matrix.values = values
+        return matrix
+
+    @classmethod
+    def memmap(cls, file_path: str, allow_diagonal: bool = True, writable: bool = False) -> ArrayMatrix:
+        """
+        Map a binary grid written by aocutils.matrix.write_binary_grid(), values are paged in as they are used
+        :param writable: Map in copy-on-write mode, changes never reach the file
+        """
+        with open(file_path, 'rb') as grid_file:
+            magic, width, height = GRID_HEADER.unpack(grid_file.read(GRID_HEADER.size))
+        if magic != GRID_MAGIC:
+            raise ValueError(f'{file_path} is not a binary grid')
+
+        values = np.memmap(file_path, dtype=np.uint8, mode='c' if writable else 'r', offset=GRID_HEADER.size,
+                           shape=(height, width))
+        return cls.from_array(values, allow_diagonal)
+
+    @property
+    def height(self) -> int:
+        return self.values.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.values.shape[1]
+
+    @property
+    def max_x(self) -> int:
+        return self.width - 1
+
+    @property
+    def max_y(self) -> int:
+        return self.height - 1
+
+    @property
+    def cells(self) -> ArrayMatrix.CellSequence:
+        return ArrayMatrix.CellSequence(self)
+
+    @property
+    def offsets(self) -> tuple[tuple[int, int], ...]:
+        return DIAGONAL_OFFSETS if self.allow_diagonal else ORTHOGONAL_OFFSETS
+
+    def neighbor_indices(self, index: int) -> list[int]:
+        """
+        :return: Row-major indices of the neighbors of the cell at index, computed from the offsets: no per-cell
+            table gets built, grid-wide work goes through neighbor_values()
+        """
+        width, height = self.width, self.height
+        y, x = divmod(index, width)
+        return [(y + dy) * width + x + dx for dx, dy in self.offsets
+                if 0 <= x + dx < width and 0 <= y + dy < height]
+
+    def __getitem__(self, coordinates: tuple[int, int]) -> ArrayMatrix.Cell:
+        col, row = coordinates
+        if not (0 <= col < self.width and 0 <= row < self.height):
+            raise KeyError(coordinates)
+        return self.cell_class(self, col, row)
+
+    def iter_lines(self) -> Iterator[str]:
+        for y in range(self.height):
+            yield ''.join([str(value) for value in self.values[y].tolist()])
+
+    def __repr__(self) -> str:
+        return "\n".join(self.iter_lines())
+
+    def __eq__(self, other: ArrayMatrix | Matrix):
+        if isinstance(other, ArrayMatrix):
+            return np.array_equal(self.values, other.values)
+        return str(self) == str(other)
+
+    def value_at(self, x: int, y: int) -> Any:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise KeyError((x, y))
+        return self.values[y, x].item()
+
+    def copy(self) -> ArrayMatrix:
+        return self.from_array(self.values.copy(), self.allow_diagonal)
+
+    def neighbor_values(self, fill: Any = 0) -> np.ndarray:
+        """
+        Gather every cell neighbors at once
+        :param fill: Value given to the neighbors falling outside the grid
+        :return: (neighbors, rows, columns) array, neighbors in the Cell.neighbors() order
+        """
+        padded = np.pad(self.values, 1, constant_values=fill)
+        return np.stack([padded[1 + dy:1 + dy + self.height, 1 + dx:1 + dx + self.width]
+                         for dx, dy in self.offsets])
+
+    def neighbor_mask(self) -> np.ndarray:
+        """
+        :return: (neighbors, rows, columns) booleans, False where a neighbor falls outside the grid
+        """
+        inside = np.ones(self.values.shape, dtype=bool)
+        return ArrayMatrix.from_array(inside, self.allow_diagonal).neighbor_values(False)
+
+    def neighbor_count(self, mask: np.ndarray) -> np.ndarray:
+        """
+        :param mask: Booleans shaped like the matrix
+        :return: Number of neighbors of each cell where the mask is set
+        """
+        return ArrayMatrix.from_array(mask.astype(np.uint8), self.allow_diagonal).neighbor_values(0).sum(axis=0)
+
+    def neighbor_min(self) -> np.ndarray:
+        return self.neighbor_values(self._max_fill()).min(axis=0)
+
+    def neighbor_max(self) -> np.ndarray:
+        return self.neighbor_values(self._min_fill()).max(axis=0)
+
+    def neighbor_sum(self) -> np.ndarray:
+        return self.neighbor_values(0).sum(axis=0)
+
+    def stencil(self, weights: dict[tuple[int, int], Any]) -> np.ndarray:
+        """
+        Convolution-style weighted sum of each cell surroundings, positions outside the matrix counting as 0
+        :param weights: Weight by (dx, dy) offset, (0, 0) being the cell itself
+        """
+        reach = max([max(abs(dx), abs(dy)) for dx, dy in weights] + [0])
+        padded = np.pad(self.values.astype(np.result_type(self.values, np.asarray(list(weights.values())))), reach)
+        result = np.zeros_like(padded[reach:reach + self.height, reach:reach + self.width])
+        for (dx, dy), weight in weights.items():
+            result += weight * padded[reach + dy:reach + dy + self.height, reach + dx:reach + dx + self.width]
+        return result
+
+    def map_values(self, function: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+        """
+        :param function: Vectorized function of the whole values array, e.g. a numpy ufunc
+        """
+        return function(self.values)
+
+    def _max_fill(self) -> Any:
+        if np.issubdtype(self.values.dtype, np.integer):
+            return np.iinfo(self.values.dtype).max
+        return np.inf
+
+    def _min_fill(self) -> Any:
+        if np.issubdtype(self.values.dtype, np.integer):
+            return np.iinfo(self.values.dtype).min
+        return -np.inf
+
+    def cells_where(self, condition: np.ndarray) -> list[ArrayMatrix.Cell]:
+        """
+        :param condition: Booleans shaped like the matrix, e.g. matrix.values < matrix.neighbor_min()
+        :return: Views over the cells where the condition holds, in row-major order
+        """
+        rows, columns = np.nonzero(condition)
+        return [self.cell_class(self, x, y) for y, x in zip(rows.tolist(), columns.tolist())]
+
+    def count(self, condition: Optional[np.ndarray] = None) -> int:
+        """
+        :return: Number of cells where the condition holds, or of non-zero cells without condition
+        """
+        return int(np.count_nonzero(self.values if condition is None else condition))
+
+    def sum(self, condition: Optional[np.ndarray] = None) -> int:
+        values = self.values if condition is None else self.values[condition]
+        return values.sum().item()
+
+    def vsplit(self, x: int) -> tuple[ArrayMatrix, ArrayMatrix]:
+        """
+        Halves on each side of column x, sharing the memory of this matrix
+        """
+        return (self.from_array(self.values[:, :x], self.allow_diagonal),
+                self.from_array(self.values[:, x + 1:], self.allow_diagonal))
+
+    def hsplit(self, y: int) -> tuple[ArrayMatrix, ArrayMatrix]:
+        """
+        Halves on each side of row y, sharing the memory of this matrix
+        """
+        return (self.from_array(self.values[:y], self.allow_diagonal),
+                self.from_array(self.values[y + 1:], self.allow_diagonal))
+
+    def vflip(self) -> ArrayMatrix:
+        return self.from_array(self.values[::-1], self.allow_diagonal)
+
+    def hflip(self) -> ArrayMatrix:
+        return self.from_array(self.values[:, ::-1], self.allow_diagonal)
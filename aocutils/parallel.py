@@ -0,0 +1,287 @@
+"""
+Row-band parallelism for the Matrix bulk operations on big grids: stencils, component labelling and automaton steps.
+
+Values are copied once into multiprocessing.shared_memory blocks of 64-bit integers. Each worker of a process pool
+processes a band of rows, reading the halo rows around its band straight from the shared input block and writing
+its rows to the shared output block: only block names, band bounds and small results get pickled, never cells.
+Rules and predicates are sent to the workers, so they have to be module-level functions.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing.shared_memory import SharedMemory
+from time import perf_counter_ns
+from typing import Any, Callable, Iterable, Optional
+
+from aocutils.matrix import NO_COMPONENT, Automaton, Matrix, fill_components, neighbor_table, stencil_rows
+
+log = logging.getLogger(__name__)
+
+# Below this many cells, process start-up and copies cost more than the work itself: the serial Matrix methods run
+PARALLEL_MIN_CELLS = 250_000
+TYPECODE = 'q'
+
+
+class SharedGrid:
+    """
+    Row-major integer values in a shared memory block, created by the caller or attached to by name in the workers
+    """
+
+    def __init__(self, size: int, values: Optional[Iterable[int]] = None, name: Optional[str] = None) -> None:
+        item_size = array(TYPECODE).itemsize
+        self.owner = name is None
+        self.memory = SharedMemory(name, create=self.owner, size=max(1, size) * item_size)
+        self.values = self.memory.buf[:size * item_size].cast(TYPECODE)
+        if values is not None:
+            try:
+                self.values[:] = array(TYPECODE, values)
+            except BaseException:
+                self.close()
+                raise
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def __enter__(self) -> SharedGrid:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def to_list(self) -> list[int]:
+        return self.values.tolist()
+
+    def close(self) -> None:
+        # Views over the block must be released before it can be closed
+        self.values.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+def bands(height: int, count: int) -> list[tuple[int, int]]:
+    """
+    Split rows into at most count contiguous bands
+    :return: First and last (excluded) row of each band
+    """
+    count = max(1, min(count, height))
+    size, remainder = divmod(height, count)
+    limits = [0]
+    for band in range(count):
+        limits.append(limits[-1] + size + (band < remainder))
+    return [(first, last) for first, last in zip(limits, limits[1:]) if first < last]
+
+
+def _pool_size(workers: Optional[int]) -> int:
+    return workers or os.cpu_count() or 1
+
+
+def _use_serial(matrix: Matrix, workers: Optional[int], min_cells: int) -> bool:
+    return _pool_size(workers) < 2 or matrix.width * matrix.height < min_cells
+
+
+@lru_cache(maxsize=1)
+def _band_neighbor_table(width: int, height: int, allow_diagonal: bool) -> tuple[array, array]:
+    # Workers step the same grid again and again, and exit with their pool, taking the table along
+    return neighbor_table(width, height, allow_diagonal)
+
+
+def _stencil_band(source: str, target: str, width: int, height: int, weights: dict[tuple[int, int], Any],
+                  first_row: int, last_row: int) -> None:
+    with SharedGrid(width * height, name=source) as values, SharedGrid(width * height, name=target) as result:
+        result.values[first_row * width:last_row * width] = array(
+            TYPECODE, stencil_rows(values.values, width, height, weights, first_row, last_row))
+
+
+def parallel_stencil(matrix: Matrix, weights: dict[tuple[int, int], int], values: Optional[list[int]] = None,
+                     workers: Optional[int] = None, min_cells: int = PARALLEL_MIN_CELLS) -> list[int]:
+    """
+    Matrix.stencil() computed by row bands over a process pool
+    :param workers: Process pool size, defaults to the CPU count
+    :param min_cells: Smallest grid worth going parallel for
+    """
+    if _use_serial(matrix, workers, min_cells):
+        return matrix.stencil(weights, values)
+
+    values = matrix.values() if values is None else values
+    width, height = matrix.width, matrix.height
+    with SharedGrid(len(values), values) as source, SharedGrid(len(values)) as target, \
+            ProcessPoolExecutor(max_workers=_pool_size(workers)) as executor:
+        futures = [executor.submit(_stencil_band, source.name, target.name, width, height, weights, first, last)
+                   for first, last in bands(height, _pool_size(workers))]
+        for future in futures:
+            future.result()
+        return target.to_list()
+
+
+def _label_band(source: str, target: str, width: int, height: int, allow_diagonal: bool,
+                barrier: Optional[Callable[[int], bool]], first_row: int, last_row: int) -> list[int]:
+    # Labels are numbered from the band first position, so that they are unique across bands
+    first, last = first_row * width, last_row * width
+    offsets, indices = _band_neighbor_table(width, height, allow_diagonal)
+    unlabelled = NO_COMPONENT - 1
+    with SharedGrid(width * height, name=source) as values, SharedGrid(width * height, name=target) as labels:
+        band_values = values.values[first:last].tolist()
+        labels.values[first:last] = array(TYPECODE, [
+            NO_COMPONENT if barrier is not None and barrier(value) else unlabelled for value in band_values])
+        return fill_components(labels.values, offsets, indices, first, last, unlabelled, first)
+
+
+def _relabel_band(target: str, width: int, height: int, renumbering: dict[int, int], first_row: int,
+                  last_row: int) -> None:
+    first, last = first_row * width, last_row * width
+    with SharedGrid(width * height, name=target) as labels:
+        labels.values[first:last] = array(TYPECODE, [
+            renumbering.get(label, NO_COMPONENT) for label in labels.values[first:last].tolist()])
+
+
+def _find(parents: dict[int, int], label: int) -> int:
+    root = label
+    while parents[root] != root:
+        root = parents[root]
+    while parents[label] != root:
+        parents[label], label = root, parents[label]
+    return root
+
+
+def parallel_label_components(matrix: Matrix, barrier: Optional[Callable[[int], bool]] = None,
+                              values: Optional[list[int]] = None, workers: Optional[int] = None,
+                              min_cells: int = PARALLEL_MIN_CELLS) -> tuple[array, list[int]]:
+    """
+    Matrix.label_components() computed by row bands over a process pool: each band is labelled on its own,
+    then the components touching across band borders are merged with a union-find, and renumbered
+    :param workers: Process pool size, defaults to the CPU count
+    :param min_cells: Smallest grid worth going parallel for
+    """
+    if _use_serial(matrix, workers, min_cells):
+        return matrix.label_components(barrier, values)
+
+    values = matrix.values() if values is None else values
+    width, height = matrix.width, matrix.height
+    row_bands = bands(height, _pool_size(workers))
+    with SharedGrid(len(values), values) as source, SharedGrid(len(values)) as target, \
+            ProcessPoolExecutor(max_workers=_pool_size(workers)) as executor:
+        futures = [executor.submit(_label_band, source.name, target.name, width, height, matrix.allow_diagonal,
+                                   barrier, first, last)
+                   for first, last in row_bands]
+        band_sizes = {}
+        for (first, _), future in zip(row_bands, futures):
+            band_sizes.update({first * width + number: size for number, size in enumerate(future.result())})
+
+        # Merge the components touching across each band border
+        parents = {label: label for label in band_sizes}
+        labels = target.values
+        reach = (-1, 0, 1) if matrix.allow_diagonal else (0,)
+        for first, _ in row_bands[1:]:
+            above, below = (first - 1) * width, first * width
+            for x in range(width):
+                if labels[above + x] == NO_COMPONENT:
+                    continue
+                for dx in reach:
+                    if 0 <= x + dx < width and labels[below + x + dx] != NO_COMPONENT:
+                        roots = sorted((_find(parents, labels[above + x]), _find(parents, labels[below + x + dx])))
+                        parents[roots[1]] = roots[0]
+
+        # Band labels grow with the first position of their component, so do roots: keep their order
+        roots = sorted({_find(parents, label) for label in parents})
+        numbers = {root: number for number, root in enumerate(roots)}
+        renumbering = {label: numbers[_find(parents, label)] for label in parents}
+        sizes = [0] * len(roots)
+        for label, size in band_sizes.items():
+            sizes[renumbering[label]] += size
+
+        futures = [executor.submit(_relabel_band, target.name, width, height, renumbering, first, last)
+                   for first, last in row_bands]
+        for future in futures:
+            future.result()
+        result = array(TYPECODE)
+        result.frombytes(target.values.tobytes())
+
+    return result, sizes
+
+
+def _automaton_band(source: str, target: str, width: int, height: int, allow_diagonal: bool,
+                    rule: Callable[[int, list[int]], int], first_row: int, last_row: int) -> int:
+    first, last = first_row * width, last_row * width
+    offsets, indices = _band_neighbor_table(width, height, allow_diagonal)
+    with SharedGrid(width * height, name=source) as current, SharedGrid(width * height, name=target) as following:
+        values = current.values
+        band = [rule(values[index], [values[neighbor] for neighbor in indices[offsets[index]:offsets[index + 1]]])
+                for index in range(first, last)]
+        changed = sum(1 for index, value in zip(range(first, last), band) if value != values[index])
+        following.values[first:last] = array(TYPECODE, band)
+    return changed
+
+
+class ParallelAutomaton(Automaton):
+    """
+    Automaton stepping row bands over a process pool, its two buffers being shared memory blocks.
+    Dirty tracking works by band: a band is only computed when it or a band next to it changed in the previous step.
+    Use it as a context manager, or close() it, to stop the workers and free the blocks.
+    It always starts its pool: parallel_automaton() falls back to a serial Automaton when that does not pay off.
+    """
+
+    def __init__(self, matrix: Matrix, rule: Callable[[int, list[int]], int], values: Optional[list[int]] = None,
+                 workers: Optional[int] = None) -> None:
+        self.bands = bands(matrix.height, _pool_size(workers))
+        self._executor = ProcessPoolExecutor(max_workers=_pool_size(workers))
+        try:
+            super().__init__(matrix, rule, values)
+        except BaseException:
+            self._executor.shutdown()
+            raise
+
+    def _allocate(self, values: list[int]) -> None:
+        current = SharedGrid(len(values), values)
+        try:
+            self._buffers = [current, SharedGrid(len(values), values)]
+        except BaseException:
+            current.close()
+            raise
+        self.active = list(range(len(self.bands)))
+
+    @property
+    def values(self) -> list[int]:
+        return self._buffers[0].to_list()
+
+    def step(self) -> int:
+        start = perf_counter_ns()
+        current, following = self._buffers
+        width, height = self.matrix.width, self.matrix.height
+        futures = {band: self._executor.submit(_automaton_band, current.name, following.name, width, height,
+                                               self.matrix.allow_diagonal, self.rule, *self.bands[band])
+                   for band in self.active}
+        changes = {band: future.result() for band, future in futures.items()}
+
+        # Skipped bands did not change in the previous step, so both buffers already agree on them
+        self._buffers.reverse()
+        changed_bands = [band for band, changed in changes.items() if changed]
+        self.active = sorted({neighbor for band in changed_bands for neighbor in (band - 1, band, band + 1)
+                              if 0 <= neighbor < len(self.bands)})
+
+        self.steps += 1
+        self.elapsed_ns += perf_counter_ns() - start
+        return sum(changes.values())
+
+    def close(self) -> None:
+        self._executor.shutdown()
+        for buffer in self._buffers:
+            buffer.close()
+
+
+def parallel_automaton(matrix: Matrix, rule: Callable[[int, list[int]], int], values: Optional[list[int]] = None,
+                       workers: Optional[int] = None, min_cells: int = PARALLEL_MIN_CELLS) -> Automaton:
+    """
+    ParallelAutomaton, or a serial Automaton for a single worker or a grid smaller than min_cells.
+    Either way, use it as a context manager or close() it.
+    :param workers: Process pool size, defaults to the CPU count
+    :param min_cells: Smallest grid worth going parallel for
+    """
+    if _use_serial(matrix, workers, min_cells):
+        return Automaton(matrix, rule, values)
+    return ParallelAutomaton(matrix, rule, values, workers)
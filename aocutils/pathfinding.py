@@ -1,16 +1,141 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from queue import PriorityQueue
-from typing import Callable
+from array import array
+from collections.abc import Sized
+from typing import Any, Callable, Iterable, Optional
 
 from aocutils.matrix import Matrix
 
+# cost of the nodes no path reached yet
+UNREACHED = -1
+
 
 def manhattan_distance(a: Matrix.Cell, b: Matrix.Cell) -> int:
     return abs(a.x - b.x) + abs(a.y - b.y)
 
 
+def _index_typecode(size: int) -> str:
+    return 'i' if size < 2 ** 31 else 'q'
+
+
+class IndexedHeap(Sized):
+    """
+    Binary min-heap of integer ids from 0 to size - 1, each one queued at most once.
+    The heap position of every id is tracked in an array, so that lowering the priority of a queued id
+    (decrease-key) moves it in place instead of queuing a stale duplicate. Ties are never broken by comparing ids.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.ids: list[int] = []
+        self.priorities: list[Any] = []
+        self.positions = array(_index_typecode(size), [-1]) * size
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, node: int) -> bool:
+        return self.positions[node] >= 0
+
+    def push(self, node: int, priority: Any) -> None:
+        """
+        Queue a node, or move it to its new priority when it is already queued
+        """
+        position = self.positions[node]
+        if position < 0:
+            position = len(self.ids)
+            self.ids.append(node)
+            self.priorities.append(priority)
+            self._sift_up(position, node, priority)
+        elif priority < self.priorities[position]:
+            self._sift_up(position, node, priority)
+        else:
+            self._sift_down(position, node, priority)
+
+    def pop(self) -> tuple[int, Any]:
+        """
+        :return: Node having the lowest priority, and that priority
+        """
+        ids, priorities = self.ids, self.priorities
+        node, priority = ids[0], priorities[0]
+        self.positions[node] = -1
+        last, last_priority = ids.pop(), priorities.pop()
+        if ids:
+            self._sift_down(0, last, last_priority)
+        return node, priority
+
+    def _sift_up(self, position: int, node: int, priority: Any) -> None:
+        ids, priorities, positions = self.ids, self.priorities, self.positions
+        while position:
+            parent = (position - 1) >> 1
+            if not priority < priorities[parent]:
+                break
+            ids[position] = ids[parent]
+            priorities[position] = priorities[parent]
+            positions[ids[position]] = position
+            position = parent
+        ids[position] = node
+        priorities[position] = priority
+        positions[node] = position
+
+    def _sift_down(self, position: int, node: int, priority: Any) -> None:
+        ids, priorities, positions = self.ids, self.priorities, self.positions
+        size = len(ids)
+        child = 2 * position + 1
+        while child < size:
+            if child + 1 < size and priorities[child + 1] < priorities[child]:
+                child += 1
+            if not priorities[child] < priority:
+                break
+            ids[position] = ids[child]
+            priorities[position] = priorities[child]
+            positions[ids[position]] = position
+            position = child
+            child = 2 * position + 1
+        ids[position] = node
+        priorities[position] = priority
+        positions[node] = position
+
+
+def shortest_paths(size: int, start: int, neighbors: Callable[[int], Iterable[int]], weight: Callable[[int], int],
+                   target: Optional[int] = None,
+                   heuristic: Optional[Callable[[int], int | float]] = None) -> tuple[array, array]:
+    """
+    Dijkstra (A* with a heuristic) over nodes numbered from 0 to size - 1, costs and predecessors being kept in
+    flat arrays rather than in dicts: a grid of millions of cells costs a few bytes per cell
+    :param size: Number of nodes
+    :param start: Start node
+    :param neighbors: Nodes reachable from a node
+    :param weight: Non-negative cost of entering a node
+    :param target: Stop once this node is settled, every node gets settled by default
+    :param heuristic: Lower bound of the remaining cost from a node to the target, none for Dijkstra
+
+    :return: Cost of every node (UNREACHED when no path reaches it) and the node it is reached from (-1 for none)
+    :rtype: tuple[array, array]
+    """
+    cost = array('q', [UNREACHED]) * size
+    came_from = array(_index_typecode(size), [-1]) * size
+    frontier = IndexedHeap(size)
+    cost[start] = 0
+    frontier.push(start, heuristic(start) if heuristic else 0)
+
+    while frontier:
+        current, _ = frontier.pop()
+        if current == target:
+            break
+
+        current_cost = cost[current]
+        for neighbor in neighbors(current):
+            new_cost = current_cost + weight(neighbor)
+            known_cost = cost[neighbor]
+            if known_cost == UNREACHED or new_cost < known_cost:
+                cost[neighbor] = new_cost
+                came_from[neighbor] = current
+                frontier.push(neighbor, new_cost + heuristic(neighbor) if heuristic else new_cost)
+
+    return cost, came_from
+
+
 class PathFinder:
     @abstractmethod
     def find_path_to(self, target) -> list:
@@ -19,7 +144,9 @@ class PathFinder:
 
 class Dijkstra(PathFinder):
     """
-    Dijkstra Path finding
+    Dijkstra Path finding over the cells of a matrix, entering a cell costing its value.
+    The search runs on the cells row-major indices through the matrix neighbor indices: cells are only
+    reached for when rebuilding the path.
     """
 
     def __init__(self, matrix: Matrix, start: Matrix.Cell):
@@ -27,32 +154,37 @@ class Dijkstra(PathFinder):
         self.matrix = matrix
 
     def find_path_to(self, target: Matrix.Cell) -> list[Matrix.Cell]:
-        frontier = PriorityQueue()
-        frontier.put((0, self.start))
-        came_from: dict[Matrix.Cell, Matrix.Cell] = dict()
-        cost = dict()
-        cost[self.start] = 0
-        while not frontier.empty():
-            current: Matrix.Cell = frontier.get()[1]
-
-            if current == target:
-                break
-
-            for neighbor in current.neighbors():
-                new_cost = cost[current] + int(neighbor.value)
-                if neighbor not in cost or new_cost < cost[neighbor]:
-                    cost[neighbor] = new_cost
-                    priority = new_cost
-                    frontier.put((priority, neighbor))
-                    came_from[neighbor] = current
+        return self._search(target, None)
 
+    def _search(self, target: Matrix.Cell, heuristic: Optional[Callable[[int], int | float]]) -> list[Matrix.Cell]:
+        size = len(self.matrix.cells)
+        _, came_from = shortest_paths(size, self.start.index, self.matrix.neighbor_indices, self._weights(),
+                                      target.index, heuristic)
         return self._rebuild_path(target, came_from)
 
-    def _rebuild_path(self, to: Matrix.Cell, came_from: dict[Matrix.Cell, Matrix.Cell]) -> list[Matrix.Cell]:
-        current = to
+    def _weights(self) -> Callable[[int], int]:
+        # Dense matrices pay one pass over their values, lazy ones only compute the values the search reaches
+        if isinstance(self.matrix, Matrix):
+            return [int(value) for value in self.matrix.values()].__getitem__
+        width, value_at = self.matrix.width, self.matrix.value_at
+        weights = array('q', [UNREACHED]) * len(self.matrix.cells)
+
+        def weight(index: int) -> int:
+            known = weights[index]
+            if known == UNREACHED:
+                known = weights[index] = int(value_at(index % width, index // width))
+            return known
+
+        return weight
+
+    def _rebuild_path(self, to: Matrix.Cell, came_from: array) -> list[Matrix.Cell]:
+        cells = self.matrix.cells
+        current = to.index
         path: list[Matrix.Cell] = []
-        while current != self.start:
-            path.append(current)
+        while current != self.start.index:
+            if came_from[current] < 0:
+                raise KeyError(f'No path from {self.start!r} to {to!r}')
+            path.append(cells[current])
             current = came_from[current]
         path.append(self.start)
         path.reverse()
@@ -68,27 +200,17 @@ class AStar(Dijkstra):
     def find_path_to(self,
                      target: Matrix.Cell,
                      heuristic: Callable[[Matrix.Cell, Matrix.Cell], float | int] = None) -> list[Matrix.Cell]:
-        if heuristic is None:
-            heuristic = manhattan_distance
-
-        frontier = PriorityQueue()
-        frontier.put((0, self.start))
-        came_from: dict[Matrix.Cell, Matrix.Cell] = dict()
-        cost = dict()
-        cost[self.start] = 0
+        if heuristic is None or heuristic is manhattan_distance:
+            width = self.matrix.width
+            target_y, target_x = divmod(target.index, width)
 
-        while not frontier.empty():
-            current: Matrix.Cell = frontier.get()[1]
+            def index_heuristic(index: int) -> int:
+                y, x = divmod(index, width)
+                return abs(x - target_x) + abs(y - target_y)
+        else:
+            cells = self.matrix.cells
 
-            if current == target:
-                break
-
-            for neighbor in current.neighbors():
-                new_cost = cost[current] + int(neighbor.value)
-                if neighbor not in cost or new_cost < cost[neighbor]:
-                    cost[neighbor] = new_cost
-                    priority = new_cost + heuristic(target, neighbor)
-                    frontier.put((priority, neighbor))
-                    came_from[neighbor] = current
+            def index_heuristic(index: int) -> float | int:
+                return heuristic(target, cells[index])
 
-        return self._rebuild_path(target, came_from)
+        return self._search(target, index_heuristic)
@@ -0,0 +1,210 @@
+"""
+Profile a callable with cProfile or a sampling profiler, and save the results as pstats files and
+collapsed stacks ("frame;frame;frame count" lines) that flamegraph.pl, speedscope or inferno read.
+"""
+from __future__ import annotations
+
+import cProfile
+import logging
+import marshal
+import os
+import pstats
+import sys
+import threading
+from collections import Counter, defaultdict
+from os.path import basename, join
+from types import CodeType, FrameType
+from typing import Any, Callable, Optional
+
+CPROFILE = 'cprofile'
+SAMPLING = 'sampling'
+PROFILING_MODES = (CPROFILE, SAMPLING)
+
+FunctionKey = tuple[str, int, str]
+
+log = logging.getLogger(__name__)
+
+
+def frame_name(filename: str, line: int, name: str) -> str:
+    if filename == '~':
+        # Built-in functions
+        return name
+    return f'{name} ({basename(filename)}:{line})'
+
+
+def _code_key(code: CodeType) -> FunctionKey:
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+
+def write_collapsed(stacks: dict[tuple[str, ...], int], file_path: str) -> None:
+    with open(file_path, 'w') as collapsed_file:
+        for stack, count in sorted(stacks.items()):
+            if count > 0:
+                collapsed_file.write(f"{';'.join(stack)} {count}\n")
+
+
+def collapse_stats(stats: pstats.Stats, min_fraction: float = 0.001, max_depth: int = 128) -> dict[tuple, int]:
+    """
+    Estimate full call stacks from cProfile statistics, which only keep caller -> callee edges:
+    the time of each function is spread over its callers in proportion of the cumulative time of each edge.
+    :return: Microseconds of own time per estimated stack
+    """
+    raw_stats: dict = stats.stats
+    paths: dict[FunctionKey, list[tuple[tuple[FunctionKey, ...], float]]] = {}
+
+    def caller_paths(function: FunctionKey, visiting: frozenset) -> list[tuple[tuple[FunctionKey, ...], float]]:
+        if function in paths:
+            return paths[function]
+
+        callers = {caller: edge[3] for caller, edge in raw_stats[function][4].items()
+                   if caller in raw_stats and caller not in visiting}
+        total = sum(callers.values())
+        if not callers or total <= 0 or len(visiting) >= max_depth:
+            result = [((function,), 1.0)]
+        else:
+            result = []
+            for caller, cumulative in callers.items():
+                share = cumulative / total
+                for path, fraction in caller_paths(caller, visiting | {function}):
+                    if share * fraction >= min_fraction:
+                        result.append((path + (function,), share * fraction))
+            result = result or [((function,), 1.0)]
+
+        # Memoized even when a cycle was cut, recursive functions only get an estimate anyway
+        paths[function] = result
+        return result
+
+    stacks: dict[tuple, int] = defaultdict(int)
+    for function, (_, _, own_time, _, _) in raw_stats.items():
+        for path, fraction in caller_paths(function, frozenset()):
+            stacks[tuple(frame_name(*key) for key in path)] += round(own_time * fraction * 1_000_000)
+
+    return stacks
+
+
+class SamplingProfiler:
+    """
+    Snapshot the stack of the profiled thread from a background thread at a fixed interval. Like cProfile.Profile,
+    it can be given to pstats.Stats: each sample counts as one call lasting the interval.
+    """
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.samples: Counter[tuple[FunctionKey, ...]] = Counter()
+        self.stats: dict = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._target_id = 0
+        self._root_frame: Optional[FrameType] = None
+
+    def start(self) -> None:
+        self._target_id = threading.get_ident()
+        # Frames above the caller of start() do not belong to the profiled code
+        self._root_frame = sys._getframe(1)
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._sample, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+        self._root_frame = None
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._target_id)
+            stack = []
+            while frame is not None and frame is not self._root_frame:
+                stack.append(_code_key(frame.f_code))
+                frame = frame.f_back
+            # The profiled thread may already be waiting in stop()
+            if stack and stack[-1] != _code_key(SamplingProfiler.stop.__code__):
+                self.samples[tuple(reversed(stack))] += 1
+
+    def collapsed_stacks(self) -> dict[tuple[str, ...], int]:
+        """
+        :return: Samples per stack of frame names
+        """
+        stacks: dict[tuple[str, ...], int] = defaultdict(int)
+        for stack, count in self.samples.items():
+            stacks[tuple(frame_name(*key) for key in stack)] += count
+        return stacks
+
+    def create_stats(self) -> None:
+        """
+        Fill stats in the format pstats.Stats reads: {function: (primitive calls, calls, own time, cumulative time,
+        {caller: (primitive calls, calls, own time, cumulative time)})}, counting samples as calls
+        """
+        stats: dict = {}
+        for stack, count in self.samples.items():
+            duration = count * self.interval
+            # Recursive functions get their cumulative time once per sample, at their outermost frame
+            seen = set()
+            for depth, function in enumerate(stack):
+                leaf = depth == len(stack) - 1
+                primitive = function not in seen
+                seen.add(function)
+                primitive_calls, calls, own_time, cumulative_time, callers = stats.get(function, (0, 0, 0.0, 0.0, {}))
+                stats[function] = (primitive_calls + (count if primitive else 0), calls + count,
+                                   own_time + (duration if leaf else 0.0),
+                                   cumulative_time + (duration if primitive else 0.0), callers)
+                if depth > 0:
+                    edge = callers.get(stack[depth - 1], (0, 0, 0.0, 0.0))
+                    callers[stack[depth - 1]] = (edge[0] + (count if primitive else 0), edge[1] + count,
+                                                 edge[2] + (duration if leaf else 0.0),
+                                                 edge[3] + (duration if primitive else 0.0))
+        self.stats = stats
+
+    def dump_stats(self, file_path: str) -> None:
+        """
+        Write the stats as cProfile.Profile.dump_stats() does, for pstats.Stats(file_path) or snakeviz to read
+        """
+        self.create_stats()
+        with open(file_path, 'wb') as stats_file:
+            marshal.dump(self.stats, stats_file)
+
+
+def profile(function: Callable[[], Any], output_prefix: str, mode: str = CPROFILE,
+            interval: float = 0.001) -> Any:
+    """
+    Run a callable under a profiler and save its statistics next to output_prefix
+    :param function: Zero-argument callable to profile
+    :param output_prefix: Path prefix of the files written
+    :param mode: 'cprofile' writes <prefix>.pstats and estimated <prefix>.collapsed stacks,
+                 'sampling' writes <prefix>.collapsed stacks counted in samples and a <prefix>.pstats
+                 whose call counts are sample counts
+    :param interval: Seconds between two samples in sampling mode
+
+    :return: The callable result
+    """
+    if mode not in PROFILING_MODES:
+        raise ValueError(f'Unknown profiling mode: {mode}')
+
+    directory = os.path.dirname(output_prefix)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if mode == SAMPLING:
+        sampler = SamplingProfiler(interval)
+        sampler.start()
+        try:
+            return function()
+        finally:
+            sampler.stop()
+            if not sampler.samples:
+                log.warning('No sample taken in %s, the run was shorter than the %g s interval',
+                            output_prefix, interval)
+            sampler.dump_stats(output_prefix + '.pstats')
+            write_collapsed(sampler.collapsed_stacks(), output_prefix + '.collapsed')
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(function)
+    finally:
+        stats = pstats.Stats(profiler)
+        stats.dump_stats(output_prefix + '.pstats')
+        write_collapsed(collapse_stats(stats), output_prefix + '.collapsed')
+
+
+def profile_output_prefix(directory: str, exercise_name: str, part: str) -> str:
+    return join(directory, f'{exercise_name}.{part}')
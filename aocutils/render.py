@@ -0,0 +1,119 @@
+"""
+Streaming renderers for matrices: text to a terminal or a file, PGM (grayscale) and PPM (color) images,
+and terminal animations redrawing only what changed since the previous frame.
+
+Rows are produced and written one at a time, the whole picture never is in memory.
+Any matrix works: Matrix, SparseMatrix, LazyMatrix and aocutils.ndmatrix.ArrayMatrix all provide iter_lines().
+"""
+from __future__ import annotations
+
+import sys
+from typing import Any, BinaryIO, Callable, Iterator, Optional, TextIO
+
+from aocutils.matrix import Matrix, SparseMatrix
+
+ANSI_CLEAR = '\x1b[2J\x1b[H'
+
+
+def value_rows(matrix: Any) -> Iterator[list[Any]]:
+    """
+    Values of each row, empty positions of sparse matrices holding their default value
+    """
+    if isinstance(matrix, SparseMatrix):
+        rows = matrix.points_by_row()
+        for y in range(matrix.height):
+            row = [matrix.default] * matrix.width
+            for cell in rows.pop(y, ()):
+                row[cell.x] = cell.value
+            yield row
+    elif isinstance(matrix, Matrix):
+        for row in matrix.iter_rows():
+            yield [cell.value for cell in row]
+    else:
+        for y in range(matrix.height):
+            yield [matrix.value_at(x, y) for x in range(matrix.width)]
+
+
+def write_text(matrix: Any, stream: Optional[TextIO] = None) -> None:
+    """
+    Write the matrix text, row after row
+    :param stream: Text stream, the current sys.stdout by default
+    """
+    stream = sys.stdout if stream is None else stream
+    stream.writelines(line + "\n" for line in matrix.iter_lines())
+    stream.flush()
+
+
+def write_pgm(matrix: Any, stream: BinaryIO, level: Callable[[Any], int] = int,
+              max_level: Optional[int] = None) -> None:
+    """
+    Write a binary PGM (P5) grayscale image, one pixel per cell
+    :param level: Gray level of a value, from 0 (black) to max_level
+    :param max_level: White level, up to 255, the highest level by default at the cost of a first pass over the values
+    """
+    if max_level is None:
+        max_level = max([max(map(level, row), default=0) for row in value_rows(matrix)], default=0)
+    max_level = min(255, max(1, max_level))
+
+    stream.write(f'P5\n{matrix.width} {matrix.height}\n{max_level}\n'.encode('ascii'))
+    for row in value_rows(matrix):
+        stream.write(bytes(min(max_level, max(0, level(value))) for value in row))
+    stream.flush()
+
+
+def write_ppm(matrix: Any, stream: BinaryIO, color: Callable[[Any], tuple[int, int, int]]) -> None:
+    """
+    Write a binary PPM (P6) color image, one pixel per cell
+    :param color: (red, green, blue) of a value, each from 0 to 255
+    """
+    stream.write(f'P6\n{matrix.width} {matrix.height}\n255\n'.encode('ascii'))
+    for row in value_rows(matrix):
+        stream.write(bytes(component for value in row for component in color(value)))
+    stream.flush()
+
+
+class Animation:
+    """
+    Terminal animation of a matrix changing over time: the first frame is drawn in full, then each frame only moves
+    the cursor to the runs of characters that changed and rewrites them, through ANSI escape sequences
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        self.stream = sys.stdout if stream is None else stream
+        self.lines: Optional[list[str]] = None
+        self.frames = 0
+
+    def frame(self, matrix: Any) -> int:
+        """
+        Draw the matrix current state
+        :return: Number of characters written over the previous frame, all of them for a full redraw
+        """
+        lines = list(matrix.iter_lines())
+        previous, self.lines = self.lines, lines
+        self.frames += 1
+        if previous is None or len(previous) != len(lines) or any(
+                len(old) != len(new) for old, new in zip(previous, lines)):
+            self.stream.write(ANSI_CLEAR)
+            self.stream.writelines(line + "\n" for line in lines)
+            self.stream.flush()
+            return sum(len(line) for line in lines)
+
+        changed = 0
+        for y, (old, new) in enumerate(zip(previous, lines)):
+            if old == new:
+                continue
+            x = 0
+            while x < len(new):
+                if old[x] == new[x]:
+                    x += 1
+                    continue
+                end = x
+                while end < len(new) and old[end] != new[end]:
+                    end += 1
+                self.stream.write(f'\x1b[{y + 1};{x + 1}H{new[x:end]}')
+                changed += end - x
+                x = end
+
+        self.stream.write(f'\x1b[{len(lines) + 1};1H')
+        self.stream.flush()
+        return changed
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field, asdict
+from time import perf_counter_ns
+from typing import Iterable, Optional, TextIO
+
+from aocutils.aoc import Exercise, ExerciseReport, Verbosity
+from aocutils.cache import DEFAULT_ANSWER_STORE, DEFAULT_CACHE_DIR, AnswerStore, ModelCache
+from aocutils.days import ROOT_DIR, discover_days, input_file_path, load_exercise
+
+
+@dataclass
+class DayResult:
+    day: int
+    report: Optional[ExerciseReport] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class RunReport:
+    results: list[DayResult] = field(default_factory=list)
+    wall_ns: int = 0
+
+    def to_text(self) -> str:
+        lines = []
+        for result in self.results:
+            if result.error is not None:
+                lines.append(f'== Day {result.day:02d} failed\n{result.error}')
+            else:
+                lines.append(result.report.to_text())
+        cumulated = sum(result.report.total_ns for result in self.results if result.report is not None)
+        lines.append(f'Wall time {self.wall_ns / 1_000_000:.3f} ms for {cumulated / 1_000_000:.3f} ms of solving')
+        return "\n\n".join(lines)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), default=str, indent=2)
+
+    def write(self, stream: TextIO = sys.stdout, output_format: str = 'text') -> None:
+        if output_format == 'json':
+            stream.write(self.to_json() + "\n")
+        elif output_format == 'text':
+            stream.write(self.to_text() + "\n")
+        else:
+            raise ValueError(f'Unknown report format: {output_format}')
+
+
+def solve_day(day: int, input_path: Optional[str] = None, track_memory: bool = False,
+              root_dir: str = ROOT_DIR, model_cache_dir: Optional[str] = None,
+              answer_store_path: Optional[str] = None) -> DayResult:
+    """
+    Solve both parts of a day in quiet mode, discarding what the solver still prints along the way
+    """
+    verbosity, model_cache, answer_store = Exercise.verbosity, Exercise.model_cache, Exercise.answer_store
+    Exercise.set_verbosity(Verbosity.QUIET)
+    if model_cache_dir is not None:
+        Exercise.set_model_cache(ModelCache(model_cache_dir or DEFAULT_CACHE_DIR))
+    if answer_store_path is not None:
+        Exercise.set_answer_store(AnswerStore(answer_store_path or DEFAULT_ANSWER_STORE))
+    try:
+        exercise_class = load_exercise(day, root_dir)
+        input_data = exercise_class.read_input(input_path or input_file_path(day, root_dir))
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            report = exercise_class.solve_measured(input_data, track_memory)
+    except Exception:
+        return DayResult(day, error=traceback.format_exc())
+    finally:
+        Exercise.set_verbosity(verbosity)
+        Exercise.set_model_cache(model_cache)
+        if Exercise.answer_store is not answer_store:
+            Exercise.answer_store.close()
+            Exercise.set_answer_store(answer_store)
+
+    return DayResult(day, report)
+
+
+def run_days(days: Optional[Iterable[int]] = None, max_workers: Optional[int] = None,
+             track_memory: bool = False, root_dir: str = ROOT_DIR,
+             model_cache_dir: Optional[str] = None, answer_store_path: Optional[str] = None) -> RunReport:
+    """
+    Solve several days in parallel over a process pool
+    :param days: Days to solve, every discovered day when None
+    :param max_workers: Process pool size, defaults to the CPU count
+    :param track_memory: Record each step peak allocation
+    :param root_dir: Directory holding the dayNN.py scripts and input_data/
+    :param model_cache_dir: Reuse the parsed input models stored in this directory
+    :param answer_store_path: Reuse the answers stored in this SQLite file
+
+    :return: Every day result, ordered by day
+    :rtype: RunReport
+    """
+    if days is None:
+        days = discover_days(root_dir).keys()
+    days = sorted(set(days))
+
+    start = perf_counter_ns()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(solve_day, day, None, track_memory, root_dir, model_cache_dir, answer_store_path)
+                   for day in days]
+        results = [future.result() for future in futures]
+
+    return RunReport(results, perf_counter_ns() - start)
+
+
+if __name__ == '__main__':
+    run_days([int(day) for day in sys.argv[1:]] or None).write()
@@ -1,21 +1,25 @@
-from typing import Optional, Iterable
+import logging
+from collections import deque
+from typing import Iterator, Optional, Iterable
 
 from aocutils.aoc import Exercise
-from aocutils.file import read_integer_file, get_input_data_filepath
+from aocutils.file import MappedIntegers, read_integer_file, get_input_data_filepath
+
+log = logging.getLogger(__name__)
 
 
 def get_increment_value(current: int, previous: Optional[int] = None) -> int:
     if previous is None:
-        print(f"❌ {current} — No previous value")
+        log.info('❌ %d — No previous value', current)
         return 0
 
     if current > previous:
-        print(f"↗️ {current} — INCREASED")
+        log.info('↗️ %d — INCREASED', current)
         return 1
     elif current < previous:
-        print(f"↘️ {current} — decreased")
+        log.info('↘️ %d — decreased', current)
     else:
-        print(f"= {current} — no change")
+        log.info('= %d — no change', current)
 
     return 0
 
@@ -37,21 +41,42 @@ class SonarReport:
         return increase_count
 
 
+class WindowSums(Iterable):
+    """
+    Sums of every window of consecutive values, computed in a single pass over the values
+    """
+
+    def __init__(self, values: Iterable[int], size: int) -> None:
+        self.values = values
+        self.size = size
+
+    def __iter__(self) -> Iterator[int]:
+        window = deque(maxlen=self.size)
+        for value in self.values:
+            window.append(value)
+            if len(window) == self.size:
+                yield sum(window)
+
+
 class SmoothedSonarReport(SonarReport):
 
-    def __init__(self, sweep_values: list[int]) -> None:
-        smoothed_sweep_values = [
-            sum(sweep_values[window_start:(window_start + 3)]) for window_start in range(len(sweep_values) - 2)
-        ]
-        super().__init__(smoothed_sweep_values)
+    def __init__(self, sweep_values: Iterable[int]) -> None:
+        super().__init__(WindowSums(sweep_values, 3))
 
 
 class Day01(Exercise):
 
-    def __init__(self, input_data: list[int]) -> None:
+    def __init__(self, input_data: Iterable[int]) -> None:
         super().__init__(input_data)
         self.input_data = input_data
 
+    @classmethod
+    def read_input(cls, file_path: str, streaming: bool = False) -> list[int] | MappedIntegers:
+        # Both reports read the values in a single pass: streaming parses them from the mapped file on each pass
+        if streaming:
+            return MappedIntegers(file_path)
+        return list(read_integer_file(file_path))
+
     def part_one(self) -> int:
         return SonarReport(self.input_data).get_increases()
 
@@ -60,6 +85,5 @@ class Day01(Exercise):
 
 
 if __name__ == '__main__':
-    input_values = list(read_integer_file(get_input_data_filepath(__file__)))
-    exercise = Day01(input_values)
+    exercise = Day01(Day01.read_input(get_input_data_filepath(__file__)))
     exercise.solve_all()
@@ -1,3 +1,4 @@
+import logging
 from typing import Iterable
 
 from aocutils.aoc import Exercise
@@ -70,22 +71,27 @@ class Day02(Exercise):
 
     def part_one(self) -> int:
         yellow_submarine = ElvishSubmarine()
+        tracing = self.log.isEnabledFor(logging.INFO)
 
         for command in self._read_commands():
             yellow_submarine.run_command(command)
-            print(f"{command.get_symbol()}({command.get_amount()}) " +
-                  f"New Submarine position (depth: {yellow_submarine.depth}, pos: {yellow_submarine.position})")
+            if tracing:
+                self.log.info('%s(%d) New Submarine position (depth: %d, pos: %d)',
+                              command.get_symbol(), command.get_amount(),
+                              yellow_submarine.depth, yellow_submarine.position)
 
         return yellow_submarine.depth * yellow_submarine.position
 
     def part_two(self) -> int:
         yellow_submarine = AimingElvishSubmarine()
+        tracing = self.log.isEnabledFor(logging.INFO)
 
         for command in self._read_commands():
             yellow_submarine.run_command(command)
-            print(f"{command.get_symbol()}({command.get_amount()}) " +
-                  f"New Submarine position (depth: {yellow_submarine.depth}, pos: {yellow_submarine.position}, " +
-                  f"aim: {yellow_submarine.aim})")
+            if tracing:
+                self.log.info('%s(%d) New Submarine position (depth: %d, pos: %d, aim: %d)',
+                              command.get_symbol(), command.get_amount(),
+                              yellow_submarine.depth, yellow_submarine.position, yellow_submarine.aim)
 
         return yellow_submarine.depth * yellow_submarine.position
 
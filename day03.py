@@ -85,20 +85,20 @@ class DiagnosticReport:
 class Day03(Exercise):
     def part_one(self) -> int:
         report = DiagnosticReport(list(self.input_data))
-        print(f"Gamma rate: \t{report.gamma_rate} \t({bin(report.gamma_rate)})")
-        print(f"Epsilon rate: \t{report.epsilon_rate} \t({bin(report.epsilon_rate)})")
+        self.log.info('Gamma rate: \t%d \t(%s)', report.gamma_rate, format(report.gamma_rate, '#b'))
+        self.log.info('Epsilon rate: \t%d \t(%s)', report.epsilon_rate, format(report.epsilon_rate, '#b'))
         consumption = report.consumption()
-        print(f'Consumption: \t{consumption}')
+        self.log.info('Consumption: \t%d', consumption)
         return consumption
 
     def part_two(self) -> int:
         report = DiagnosticReport(list(self.input_data))
         oxygen_generator = report.rate_oxygen_generator()
-        print(f"O2 Generator rating {oxygen_generator} ({bin(oxygen_generator)})")
+        self.log.info('O2 Generator rating %d (%s)', oxygen_generator, format(oxygen_generator, '#b'))
         carbon_dioxyde_scrubber = report.rate_carbon_dioxyde_scrubber()
-        print(f"CO2 Generator rating {carbon_dioxyde_scrubber} ({bin(carbon_dioxyde_scrubber)})")
+        self.log.info('CO2 Generator rating %d (%s)', carbon_dioxyde_scrubber, format(carbon_dioxyde_scrubber, '#b'))
         life_support_rating = report.rate_life_support()
-        print(f"Life support rating {life_support_rating}")
+        self.log.info('Life support rating %d', life_support_rating)
         return life_support_rating
 
 
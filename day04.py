@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import logging
 from typing import Iterable, Sized, Optional
 
 from aocutils.aoc import Exercise
 from aocutils.file import get_input_data_filepath
 
+log = logging.getLogger(__name__)
+
 
 class BingoCard:
 
@@ -61,7 +64,7 @@ class BingoSystem:
             if not number_line:
                 if not len(card_rows):
                     continue
-                print(f'Creating a new BingoCard with rows {tuple(card_rows)}')
+                log.debug('Creating a new BingoCard with rows %s', card_rows)
                 self.cards.append(BingoCard(tuple(card_rows)))
                 card_rows = []
                 continue
@@ -82,7 +85,7 @@ class BingoSystem:
                 is_winning_column = card.is_winning_column(col)
 
                 if is_winning_row or is_winning_column:
-                    print(f"Winning card with draw {number}:\n{card}")
+                    log.info('Winning card with draw %d:\n%s', number, card)
                     winning_order.append(tuple([card, number]))
 
         return winning_order
@@ -95,10 +98,10 @@ class Day04(Exercise):
 
     def solve_for_card_at_index(self, index: int) -> int:
         winning_card, last_drawn = self.winning_order[index]
-        print(winning_card)
-        print(f'Winning draw: {last_drawn}')
+        self.log.info('%s', winning_card)
+        self.log.info('Winning draw: %d', last_drawn)
         unchecked = winning_card.unchecked_numbers()
-        print(f'Unchecked numbers: {unchecked} (sum: {sum(unchecked)})')
+        self.log.info('Unchecked numbers: %s (sum: %d)', unchecked, sum(unchecked))
 
         return sum(unchecked) * last_drawn
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 import re
 from collections.abc import Iterable
 from dataclasses import dataclass
@@ -7,13 +8,13 @@ from typing import Iterator, Sized
 
 from aocutils.aoc import Exercise
 from aocutils.file import get_input_data_filepath
+from aocutils.matrix import SparseMatrix
 
 
 @dataclass(repr=False)
 class Point:
     x: int
     y: int
-    value: int = 0
 
     def on_same_column_than(self, other_point: 'Point'):
         return self.x == other_point.x
@@ -27,13 +28,6 @@ class Point:
     def __repr__(self) -> str:
         return f"({self.x},{self.y})"
 
-    def __add__(self, other: 'Point'):
-        if not self.same_as(other):
-            raise Exception(f'Can only add points on matching position {self} vs. {other}')
-
-        self.value += 1
-        return self
-
 
 @dataclass
 class Segment(Iterable):
@@ -103,7 +97,11 @@ class SegmentIterator(Iterator):
             self._y_step = 1
 
 
-class VentMap:
+class VentMap(SparseMatrix):
+    """
+    Vent counts of the positions crossed by at least one segment
+    """
+    default = 0
 
     def __init__(self, lines: list[Segment]) -> None:
         super().__init__()
@@ -113,56 +111,53 @@ class VentMap:
             self.max_x = max([self.max_x, max(segment.start.x, segment.end.x)])
             self.max_y = max([self.max_y, max(segment.start.y, segment.end.y)])
 
-        self.map: tuple[Point] = tuple(Point(x, y)
-                                       for y in range(1 + self.max_y)
-                                       for x in range(1 + self.max_x))
-
         self.segments = tuple(lines)
 
-    def __repr__(self):
-        out = ''
-        for index, point in enumerate(self.map):
-            if point.value == 0:
-                out += '.'
-            else:
-                out += str(point.value)
-
-            if point.x == self.max_x:
-                out += "\n"
-
-        return out.strip()
-
     def draw_one(self, segment: Segment):
         for point in segment:
-            position = (point.y * self.max_x) + point.y + point.x
-            self.map[position] + point
+            vent = self.points.get((point.x, point.y))
+            if vent is None:
+                self.points[(point.x, point.y)] = self._cell_from_value(point.x, point.y, 1)
+            else:
+                vent.value += 1
 
-    def draw(self) -> str:
+    def plot(self) -> None:
         for segment in self.segments:
             self.draw_one(segment)
 
+    def draw(self) -> str:
+        self.plot()
+
         return str(self)
 
     def high_points(self) -> int:
-        return len([point for point in self.map if point.value >= 2])
+        return len([vent for vent in self.points.values() if vent.value >= 2])
 
 
 class Day05(Exercise):
 
     def __init__(self, input_data: Iterable[str] | Sized[str]) -> None:
         super().__init__(input_data)
-        self.segment_list = [Segment.from_string(line) for line in input_data]
+        self.segment_list = self.model('segments', lambda: [Segment.from_string(line) for line in input_data])
+
+    def log_map(self, vent_map: VentMap) -> None:
+        # A row per record, so that the map is never built as a single string
+        if self.log.isEnabledFor(logging.DEBUG):
+            for line in vent_map.iter_lines():
+                self.log.debug('%s', line)
 
     def part_one(self) -> int:
         orthogonal_segments = [segment for segment in self.segment_list if not segment.is_oblique()]
         part_one_map = VentMap(orthogonal_segments)
-        print(part_one_map.draw())
+        part_one_map.plot()
+        self.log_map(part_one_map)
 
         return part_one_map.high_points()
 
     def part_two(self) -> int:
         part_two_map = VentMap(self.segment_list)
-        print(part_two_map.draw())
+        part_two_map.plot()
+        self.log_map(part_two_map)
 
         return part_two_map.high_points()
 
@@ -1,8 +1,11 @@
+import logging
 from collections.abc import Sized
 
 from aocutils.aoc import Exercise
 from aocutils.file import get_input_data_filepath
 
+log = logging.getLogger(__name__)
+
 
 class LanternFishGeneration(Sized):
 
@@ -14,7 +17,7 @@ class LanternFishGeneration(Sized):
         initial_state = [int(fish) for fish in starting_generation.strip().split(',')]
         self._current_generation = [initial_state.count(age) for age in range(9)
                                     ]
-        print(f'Initial state: {self}')
+        log.info('Initial state: %s', self)
 
     def _decay(self):
         reseted_or_new_fishes = self._current_generation.pop(0)
@@ -22,9 +25,11 @@ class LanternFishGeneration(Sized):
         self._current_generation.append(reseted_or_new_fishes)
 
     def pass_days(self, day_count: int):
+        tracing = log.isEnabledFor(logging.INFO)
         for day in range(day_count):
             self._decay()
-            print(f'After day {str(day+1)}: {self._current_generation}')
+            if tracing:
+                log.info('After day %d: %s', day + 1, self._current_generation)
 
     def __repr__(self) -> str:
         return str({age: count for age, count in enumerate(self._current_generation)})
@@ -33,12 +38,12 @@ class LanternFishGeneration(Sized):
 class Day06(Exercise):
 
     def part_one(self) -> int:
-        generation = LanternFishGeneration(list(self.input_data)[0])
+        generation = LanternFishGeneration(self.input_data[0])
         generation.pass_days(80)
         return len(generation)
 
     def part_two(self) -> int:
-        generation = LanternFishGeneration(list(self.input_data)[0])
+        generation = LanternFishGeneration(self.input_data[0])
         generation.pass_days(256)
         return len(generation)
 
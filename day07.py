@@ -1,8 +1,11 @@
+import logging
 from statistics import median
 
 from aocutils.aoc import Exercise
 from aocutils.file import get_input_data_filepath
 
+log = logging.getLogger(__name__)
+
 
 class ConstantCostCrabFormation:
 
@@ -12,10 +15,12 @@ class ConstantCostCrabFormation:
 
     def fuel_consumption(self) -> int:
         total = 0
+        tracing = log.isEnabledFor(logging.INFO)
 
         for pos in self.positions:
             distance = self.distance(pos)
-            print(f'From {pos} to {self.target_position}: {distance} fuel units')
+            if tracing:
+                log.info('From %d to %d: %d fuel units', pos, self.target_position, distance)
             total += distance
 
         return int(total)
@@ -58,12 +63,12 @@ class LinearCostCrabFormation:
 class Day07(Exercise):
 
     def part_one(self) -> int:
-        crabs = ConstantCostCrabFormation([int(pos) for pos in list(self.input_data)[0].split(',')])
+        crabs = ConstantCostCrabFormation([int(pos) for pos in self.input_data[0].split(',')])
         return crabs.fuel_consumption()
 
     def part_two(self) -> int:
-        crabs = LinearCostCrabFormation([int(pos) for pos in list(self.input_data)[0].split(',')])
-        print(f'Moving every crabs to {crabs.target_position}')
+        crabs = LinearCostCrabFormation([int(pos) for pos in self.input_data[0].split(',')])
+        self.log.info('Moving every crabs to %d', crabs.target_position)
         return crabs.fuel_consumption()
 
 
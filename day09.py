@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import math
 from collections.abc import Sized
-from typing import Any
 
 from aocutils.aoc import Exercise
 from aocutils.matrix import Matrix
@@ -10,20 +9,7 @@ from aocutils.file import get_input_data_filepath
 
 
 class MapPoint(Matrix.Cell):
-
-    def __init__(self, matrix: Matrix, x: int, y: int, value: Any) -> None:
-        super().__init__(matrix, x, y, value)
-
-        self.basin_id = None
-
-        if self.value >= 9:
-            self.basin_id = -1
-
-    def __hash__(self) -> int:
-        return super().__hash__()
-
-    def __eq__(self, other: MapPoint):
-        return self.x == other.x and self.y == other.y and self.value == other.value and self.basin_id == other.basin_id
+    __slots__ = ()
 
     def is_lowest(self) -> bool:
         return self.value < min([point.value for point in self.neighbors()])
@@ -31,43 +17,43 @@ class MapPoint(Matrix.Cell):
 
 class Basin(Sized):
 
-    def __init__(self, basin_id: int, starting_point: MapPoint) -> None:
+    def __init__(self, basin_id: int, size: int) -> None:
         self.id = basin_id
-        self.points = {starting_point}
-        self.propagate(starting_point)
+        self.size = size
 
     def __len__(self) -> int:
-        return len(self.points)
-
-    def propagate(self, from_point: MapPoint):
-        if from_point.basin_id is not None:
-            return
-        from_point.basin_id = self.id
-        self.points.add(from_point)
-        for neighbor in from_point.neighbors():
-            self.propagate(neighbor)
+        return self.size
 
 
 class HeightMap(Matrix):
+    cell_class = MapPoint
 
     def _init_value(self, x, y, value) -> Matrix.Cell:
-        return MapPoint(self, x, y, int(value))
+        return self._cell_from_value(x, y, int(value))
 
     def low_points(self) -> list[MapPoint]:
-        return [point for point in self.cells if point.is_lowest()]
+        heights = self.values()
+        lowest_neighbors = self.neighbor_min(heights)
+        return [point for point, height, lowest_neighbor in zip(self.cells, heights, lowest_neighbors)
+                if lowest_neighbor is None or height < lowest_neighbor]
 
     def basins(self) -> list[Basin]:
-        return [Basin(basin_id, point) for basin_id, point in enumerate(self.low_points())]
+        # Basins are the areas enclosed by height 9 locations, each one flowing down to a single low point
+        _, sizes = self.label_components(lambda height: height >= 9)
+        return [Basin(basin_id, size) for basin_id, size in enumerate(sizes)]
 
 
 class Day09(Exercise):
 
+    def height_map(self) -> HeightMap:
+        return self.model('height_map', lambda: HeightMap(list(self.input_data), allow_diagonal=False))
+
     def part_one(self) -> int:
-        height_map = HeightMap(list(self.input_data), allow_diagonal=False)
+        height_map = self.height_map()
         return sum([1 + point.value for point in height_map.low_points()])
 
     def part_two(self) -> int:
-        height_map = HeightMap(list(self.input_data), allow_diagonal=False)
+        height_map = self.height_map()
         basins = sorted(height_map.basins(), key=len)
         return math.prod([len(basin) for basin in basins[-3:]])
 
@@ -192,7 +192,7 @@ class Day10(Exercise):
                 if closing_error.token in set(self.PARSING_SCORING_TABLE.keys()):
                     score += self.PARSING_SCORING_TABLE[closing_error.token]
                 else:
-                    print(f'Unknown invalid closing token: {closing_error.token}')
+                    self.log.warning('Unknown invalid closing token: %s', closing_error.token)
 
         return score
 
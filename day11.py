@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from aocutils.aoc import Exercise
-from aocutils.matrix import Matrix
+from aocutils.matrix import Matrix, StateHistory, fingerprint
 from aocutils.file import get_input_data_filepath
 
 
 class FlashingOctopus(Matrix.Cell):
+    __slots__ = ('flashed',)
 
     def __init__(self, octopus_map: OctopusesMap, x: int, y: int, energy_level: int = 0) -> None:
         super().__init__(octopus_map, x, y, energy_level)
@@ -19,42 +20,51 @@ class FlashingOctopus(Matrix.Cell):
         return True
 
     def reset(self):
-        self.value = 0
+        self.matrix.set_value(self.x, self.y, 0)
         self.flashed = False
 
     def _propagate_energy(self):
         for octopus in self.neighbors():
-            octopus.value += 1
+            self.matrix.set_value(octopus.x, octopus.y, octopus.value + 1)
 
 
 class OctopusesMap(Matrix):
+    cell_class = FlashingOctopus
 
     def _init_value(self, x, y, value) -> Matrix.Cell:
-        return FlashingOctopus(self, x, y, int(value))
+        return self._cell_from_value(x, y, int(value))
 
     def tick(self) -> int:
 
         # Increase energy level
-        for octopus in self.cells:
-            octopus.value += 1
-
-        # Make octopuses flash and propagate energy until no flash happens
-        turn_flashes = None
-        tick_flashes = 0
-        while turn_flashes is None or 0 < turn_flashes:
-            turn_flashes = len([octopus.flashed for octopus in self.cells if octopus.flash()])
-            tick_flashes += turn_flashes
+        energy = self.map_values(lambda level: level + 1)
+        flashed = [False] * len(energy)
+
+        # Make octopuses flash and propagate energy, a whole wave of flashes at a time, until no flash happens
+        flashing = [index for index, level in enumerate(energy) if level > 9]
+        while flashing:
+            for index in flashing:
+                flashed[index] = True
+            next_flashing = []
+            for index in flashing:
+                for neighbor in self.neighbor_indices(index):
+                    energy[neighbor] += 1
+                    if energy[neighbor] == 10 and not flashed[neighbor]:
+                        next_flashing.append(neighbor)
+            flashing = next_flashing
 
         # Reset flashed octopuses
-        for octopus in [flashed for flashed in self.cells if flashed.flashed]:
-            octopus.reset()
+        self.set_values([0 if done else level for level, done in zip(energy, flashed)])
 
-        return tick_flashes
+        return sum(flashed)
 
 
 class Day11(Exercise):
+    def octopus_map(self) -> OctopusesMap:
+        return self.model('octopus_map', lambda: OctopusesMap(list(self.input_data)))
+
     def part_one(self) -> int:
-        octopus_map = OctopusesMap(list(self.input_data))
+        octopus_map = self.octopus_map()
 
         total_flashes = 0
         for _ in range(0, 100):
@@ -63,12 +73,16 @@ class Day11(Exercise):
         return total_flashes
 
     def part_two(self) -> int:
-        octopus_map = OctopusesMap(list(self.input_data))
+        octopus_map = self.octopus_map()
 
-        target_value = '0' * len(octopus_map.cells)
+        # Fingerprints make the check O(1) per tick, the values are only compared when they match
+        synchronized = fingerprint([0] * len(octopus_map.cells))
+        history = StateHistory()
         tick_count = 0
 
-        while str(octopus_map).replace("\n", "") != target_value:
+        while octopus_map.fingerprint != synchronized or any(octopus_map.values()):
+            if history.record(octopus_map) is not None:
+                raise ValueError(f'Octopuses are back to their tick {tick_count} state without synchronizing')
             octopus_map.tick()
             tick_count += 1
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 from collections import Counter
 from typing import Callable, Iterable, Sized
 
@@ -8,6 +9,8 @@ from typing_extensions import TypeAlias
 from aocutils.aoc import Exercise
 from aocutils.file import get_input_data_filepath
 
+log = logging.getLogger(__name__)
+
 
 class Cave:
     CAVE_START = 'start'
@@ -55,6 +58,7 @@ class CaveMapVisitor:
         self.caves = caves
         self.visit_condition = visit_condition
         self.visited_paths = []
+        self.tracing = log.isEnabledFor(logging.INFO)
 
     def list_paths(self):
         self.visit_cave(self.start_cave, [])
@@ -66,7 +70,8 @@ class CaveMapVisitor:
     def visit_cave(self, cave: Cave, visited: list[Cave]):
         visited.append(cave)
         if cave == self.end_cave:
-            print(f'Found Path : {visited}')
+            if self.tracing:
+                log.info('Found Path : %s', visited)
             self.visited_paths.append(visited)
             return
         for neighbor in cave.neighbors:
@@ -111,7 +116,7 @@ class Day12(Exercise):
 
     def __init__(self, input_data: Iterable | Sized) -> None:
         super().__init__(input_data)
-        self.nodes = self.build_nodes(input_data)
+        self.nodes = self.model('caves', lambda: self.build_nodes(input_data))
 
     def part_one(self) -> int:
         cave_map = self.nodes
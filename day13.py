@@ -1,28 +1,24 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Sized
-from typing import Any
 
 from aocutils.aoc import Exercise
-from aocutils.matrix import Matrix
+from aocutils.matrix import Matrix, SparseMatrix
 from aocutils.file import get_input_data_filepath
 
 
-class TransparentSheet(Matrix, Sized):
-    class Dot(Matrix.Cell):
+class TransparentSheet(SparseMatrix):
+    """
+    Sheet holding only its dots: folding costs the number of dots, not the sheet area
+    """
+    blank = '0'
+    default = False
+
+    class Dot(SparseMatrix.Cell):
         """
         @field value: bool
         """
-
-        def __init__(self, matrix: Matrix, x: int, y: int, value: Any) -> None:
-            super().__init__(matrix, x, y, value == '1')
-
-        def __add__(self, other: TransparentSheet.Dot) -> TransparentSheet.Dot:
-            new_value = '0'
-            if self.value or other.value:
-                new_value = '1'
-            return TransparentSheet.Dot(self.matrix, self.x, self.y, new_value)
+        __slots__ = ()
 
         def __repr__(self) -> str:
             if self.value:
@@ -30,34 +26,27 @@ class TransparentSheet(Matrix, Sized):
 
             return '0'
 
+    cell_class = Dot
+
     @classmethod
     def create_from(cls, other: TransparentSheet) -> TransparentSheet:
         return cls(str(other).split("\n"))
 
     @classmethod
     def draw_from_points(cls, points: list[str]) -> TransparentSheet:
-        points: list[tuple] = [tuple(line.split(',')) for line in points]
-        max_x = max([int(point[0]) for point in points])
-        max_y = max([int(point[1]) for point in points])
-        transparent = [['0' for _ in range(max_x + 1)] for _ in range(max_y + 1)]
-        for (x, y) in points:
-            transparent[int(y)][int(x)] = '1'
+        dots = [tuple(int(coordinate) for coordinate in line.split(',')) for line in points]
+        max_x = max([dot[0] for dot in dots])
+        max_y = max([dot[1] for dot in dots])
 
-        return cls([''.join(line) for line in transparent])
+        return cls.from_values({dot: True for dot in dots}, max_x + 1, max_y + 1)
 
     def __add__(self, other: TransparentSheet) -> TransparentSheet:
-        new_matrix = TransparentSheet.create_from(self)
-
-        for index, dot in enumerate(self.cells):
-            new_matrix.cells[index] = dot + other.cells[index]
-
-        return new_matrix
-
-    def __len__(self) -> int:
-        return sum([1 for dot in self.cells if dot.value])
+        dots = {position: True for position in self.points}
+        dots.update({position: True for position in other.points})
+        return self.from_values(dots, max(self.width, other.width), max(self.height, other.height))
 
     def _init_value(self, x, y, value: str) -> Matrix.Cell:
-        return TransparentSheet.Dot(self, x, y, value)
+        return self._cell_from_value(x, y, value == '1')
 
     def vfold(self, column: int) -> TransparentSheet:
         left: TransparentSheet
@@ -82,7 +71,7 @@ class Day13(Exercise):
         blank_line = input_data.index('')
         points = input_data[:blank_line]
         self.folds = input_data[blank_line + 1:]
-        self.transparent = TransparentSheet.draw_from_points(points)
+        self.transparent = self.model('sheet', lambda: TransparentSheet.draw_from_points(points))
 
     def part_one(self) -> int:
         return len(self.apply_folding(self.folds[:1]))
@@ -94,18 +83,16 @@ class Day13(Exercise):
     def apply_folding(self, folds: list[str]) -> TransparentSheet:
         working_matrix = self.transparent
         pattern = re.compile(r'fold along (?P<axe>[xy])=(?P<position>\d+)')
-        print(working_matrix)
-        print('')
+        self.log.debug('%s\n', working_matrix)
         for fold in folds:
             matches = pattern.search(fold).groupdict()
-            print(f"Applying fold on {matches['axe']}={matches['position']}")
+            self.log.info('Applying fold on %s=%s', matches['axe'], matches['position'])
             if 'y' == matches['axe']:
                 working_matrix = working_matrix.hfold(int(matches['position']))
             else:
                 working_matrix = working_matrix.vfold(int(matches['position']))
 
-            print(working_matrix)
-            print('')
+            self.log.debug('%s\n', working_matrix)
 
         return working_matrix
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 from collections import Counter, defaultdict
 from typing import Iterable, Sized
 
@@ -61,10 +62,12 @@ class Day14(Exercise):
                       for pair, insert in [line.strip().split(' -> ') for line in self.input_data[2:] if 0 < len(line)]}
 
     def develop_polymer(self, polymer, steps: int) -> Polymer:
+        tracing = self.log.isEnabledFor(logging.INFO)
         for run in range(steps):
-            print(f'Run #{run + 1}')
             polymer.apply_rules(self.rules)
-            print(polymer.pairs)
+            if tracing:
+                self.log.info('Run #%d', run + 1)
+                self.log.debug('%s', polymer.pairs)
         return polymer
 
     def part_one(self) -> int:
@@ -2,70 +2,55 @@ from __future__ import annotations
 
 from aocutils.aoc import Exercise
 from aocutils.file import get_input_data_filepath
-from aocutils.matrix import Matrix
+from aocutils.matrix import Matrix, TiledMatrix
 from aocutils.pathfinding import Dijkstra
 
 
 class RiskMap(Matrix):
     class RiskLevel(Matrix.Cell):
-
-        def __hash__(self) -> int:
-            return hash(f'({str(self.x)}, {str(self.y)})={str(self.value)}')
-
-        def __eq__(self, other: Matrix.Cell):
-            return super().__eq__(other) and self.x == other.x and self.y == other.y
+        __slots__ = ()
 
         def __repr__(self) -> str:
             return f'({self.x},{self.y})={self.value}'
 
+    cell_class = RiskLevel
+
     def _init_value(self, x, y, value) -> RiskMap.RiskLevel:
-        return RiskMap.RiskLevel(self, x, y, int(value))
+        return self._cell_from_value(x, y, int(value))
+
 
+class ExtendedRiskMap(TiledMatrix):
+    """
+    Risk map repeated over extension_factor x extension_factor tiles, each tile adding its column and row
+    to the risk levels, wrapped back into 1..9. Risk levels are only computed when the search reaches them.
+    """
 
-class ExtendedRiskMap(RiskMap):
+    cell_class = RiskMap.RiskLevel
 
     def __init__(self, input_data: list[str], extension_factor: int) -> None:
         self.original_input_data = input_data
-        scaled_input_data: list[str] = []
-        scaled_columns: list[str] = []
-
-        def limit(value: int) -> int:
-            if value > 9:
-                return value - 9
-            return value
-
-        for line in input_data:
-            new_line = ''
-            for offset in range(extension_factor):
-                new_line += ''.join([str(limit(offset + int(digit)))
-                                     for digit in line.strip()])
-            scaled_columns.append(new_line)
-
-        for offset in range(extension_factor):
-            for line in scaled_columns:
-                scaled_input_data.append(''.join([str(limit(offset + int(digit)))
-                                                  for digit in line]))
+        super().__init__(RiskMap(input_data, allow_diagonal=False), extension_factor)
 
-        super().__init__(scaled_input_data, allow_diagonal=False)
+    def tile_value(self, value: int, tile_x: int, tile_y: int) -> int:
+        return (value + tile_x + tile_y - 1) % 9 + 1
 
 
 class Day15(Exercise):
 
     def part_one(self) -> int:
-        risk_map = RiskMap(self.input_data, allow_diagonal=False)
+        risk_map = self.model('risk_map', lambda: RiskMap(self.input_data, allow_diagonal=False))
         return self.solve(risk_map)
 
     def part_two(self) -> int:
-        extended_map = ExtendedRiskMap(self.input_data, 5)
+        extended_map = self.model('extended_risk_map', lambda: ExtendedRiskMap(self.input_data, 5))
         return self.solve(extended_map)
 
-    @staticmethod
-    def solve(risk_map: RiskMap) -> int:
+    def solve(self, risk_map: RiskMap) -> int:
         pathfinder = Dijkstra(matrix=risk_map, start=risk_map.cells[0])
         path = pathfinder.find_path_to(risk_map.cells[-1])
 
         result = sum([cell.value for cell in path if cell != risk_map[(0, 0)]])
-        print(f'{path} = {result}')
+        self.log.info('%s = %d', path, result)
         return result
 
 
@@ -16,6 +16,12 @@ class Packet(ABC):
         self._version: int = version
         self.binary_content = binary_content
 
+    def __getstate__(self) -> dict:
+        # The binary stream is only read while parsing
+        state = self.__dict__.copy()
+        state['binary_content'] = None
+        return state
+
     def packet_version(self) -> int:
         return self._version
 
@@ -149,11 +155,14 @@ PACKET_TYPES = [
 
 
 class Day16(Exercise):
+    def transmission(self) -> Packet:
+        return self.model('transmission', lambda: Packet.read(self.input_data[0].strip()))
+
     def part_one(self) -> int:
-        return Packet.read(self.input_data[0].strip()).version()
+        return self.transmission().version()
 
     def part_two(self) -> int:
-        return Packet.read(self.input_data[0].strip()).value()
+        return self.transmission().value()
 
 
 if __name__ == '__main__':
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 import re
 from math import copysign
 from typing import Iterable, Sized
@@ -80,22 +81,28 @@ class Day17(Exercise):
         super().__init__(input_data)
         self.attempts = []
         self.successes = []
-        target = read_target_area(self.input_data.pop().strip())
+        target = read_target_area(self.input_data[-1].strip())
         self.log.info('Target area: %s', target)
 
         max_x = max(target.x_boundaries)
         min_y = min(target.y_boundaries)
+        debugging = self.log.isEnabledFor(logging.DEBUG)
+        tracing = self.log.isEnabledFor(logging.INFO)
         for x_velocity in range(max_x+1):
             for y_velocity in range(min_y-1, abs(min_y) + 1):
-                self.log.debug('Trying velocity (x: %d, y: %d)', x_velocity, y_velocity)
+                if debugging:
+                    self.log.debug('Trying velocity (x: %d, y: %d)', x_velocity, y_velocity)
                 attempt = LaunchAttempt((x_velocity, y_velocity), target)
                 self.attempts.append(attempt)
                 if attempt.is_successfull():
                     self.successes.append(attempt)
-                    self.log.info('(x: %d, y: %d)\t ⇒ Success in %d steps!', x_velocity, y_velocity, len(attempt.moves))
+                    if tracing:
+                        self.log.info('(x: %d, y: %d)\t ⇒ Success in %d steps!',
+                                      x_velocity, y_velocity, len(attempt.moves))
 
-        print(f'Found {len(self.successes)} velocity configs in {len(self.attempts)} launch simulations.')
-        print(f'Longuest Trick shot : {max(len(attempt.moves) for attempt in self.successes)} steps')
+        self.log.info('Found %d velocity configs in %d launch simulations.', len(self.successes), len(self.attempts))
+        if self.log.isEnabledFor(logging.INFO):
+            self.log.info('Longuest Trick shot : %d steps', max(len(attempt.moves) for attempt in self.successes))
 
     def part_one(self) -> int:
         return max(success.max_height() for success in self.successes)
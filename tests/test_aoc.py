@@ -1,5 +1,8 @@
+import json
+from io import StringIO
 from unittest import TestCase
 
+from aocutils.aoc import Exercise, Verbosity
 from aocutils.matrix import Matrix
 
 INPUT_MATRIX = '''
@@ -70,3 +73,69 @@ class TestMatrix(TestCase):
         '''.strip().split("\n"))
 
         self.assertEqual(expected_flipped, self.input_matrix.hflip())
+
+
+class LineCountExercise(Exercise):
+
+    def part_one(self) -> int:
+        return len(self.input_data)
+
+    def part_two(self) -> int:
+        return sum(int(line) for line in self.input_data)
+
+
+class RenderCounter:
+    renders = 0
+
+    def __repr__(self) -> str:
+        RenderCounter.renders += 1
+        return 'rendered'
+
+
+class TracingExercise(LineCountExercise):
+
+    def part_one(self) -> int:
+        self.log.info('%s', RenderCounter())
+        return super().part_one()
+
+
+class TestExercise(TestCase):
+
+    def tearDown(self) -> None:
+        Exercise.set_verbosity(Verbosity.NORMAL)
+
+    def test_quiet_verbosity_does_not_render_traces(self):
+        Exercise.set_verbosity(Verbosity.QUIET)
+        RenderCounter.renders = 0
+
+        self.assertEqual(2, TracingExercise(['1', '2']).part_one())
+        self.assertEqual(0, RenderCounter.renders)
+
+    def test_normal_verbosity_renders_traces(self):
+        Exercise.set_verbosity(Verbosity.NORMAL)
+
+        with self.assertLogs('TracingExercise') as logs:
+            TracingExercise(['1', '2']).part_one()
+        self.assertEqual(['rendered'], [record.getMessage() for record in logs.records])
+
+    def test_solve_measured(self):
+        report = LineCountExercise.solve_measured(['1', '2', '3'])
+
+        self.assertEqual({'part_one': 3, 'part_two': 6}, report.answers)
+        self.assertEqual(['construction', 'part_one', 'part_two'], [step.name for step in report.steps])
+        self.assertTrue(all(step.duration_ns > 0 for step in report.steps))
+
+    def test_report_json(self):
+        report = LineCountExercise.solve_measured(['1', '2'], track_memory=False)
+        output = StringIO()
+        report.write(output, 'json')
+
+        as_json = json.loads(output.getvalue())
+        self.assertEqual('LineCountExercise', as_json['exercise'])
+        self.assertEqual(3, as_json['answers']['part_two'])
+        self.assertEqual(3, len(as_json['steps']))
+
+    def test_report_text(self):
+        report = LineCountExercise.solve_measured(['1', '2'])
+
+        self.assertIn('» Solution for part one is 2.', report.to_text())
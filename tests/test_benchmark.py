@@ -0,0 +1,68 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from aocutils.benchmark import (BASELINE_FORMAT, DEFAULT_BASELINE_PATH, MIN_TIME_DELTA_NS, Baseline,
+                                BenchmarkResult, collect_benchmarks, compare, run_benchmarks)
+
+
+class TestBenchmark(TestCase):
+
+    def test_collect_benchmarks(self):
+        names = collect_benchmarks()
+
+        self.assertIn('day01', names)
+        self.assertIn('day17', names)
+        for primitive in ('matrix.construction', 'matrix.neighbors', 'dijkstra.find_path_to', 'string.hex2bin'):
+            self.assertIn(primitive, names)
+
+    def test_run_benchmarks(self):
+        results = run_benchmarks(['day06', 'dijkstra.find_path_to'], scale=0.01, rounds=2)
+
+        self.assertEqual(['day06', 'dijkstra.find_path_to'], list(results.keys()))
+        for result in results.values():
+            self.assertEqual(2, result.rounds)
+            self.assertLessEqual(result.best_ns, result.median_ns)
+            self.assertGreater(result.peak_memory, 0)
+
+    def test_unknown_benchmark(self):
+        with self.assertRaises(KeyError):
+            run_benchmarks(['day99'])
+
+    def test_compare(self):
+        baseline = Baseline(0.05, {'fast': {'best_ns': 10_000_000, 'peak_memory': 1_000_000},
+                                   'tiny': {'best_ns': 10_000, 'peak_memory': 1_000}})
+        results = {'fast': BenchmarkResult('fast', 14_000_000, 14_000_000, 2_000_000),
+                   'tiny': BenchmarkResult('tiny', 10_000 + MIN_TIME_DELTA_NS // 2, 0, 1_500),
+                   'new': BenchmarkResult('new', 1, 1)}
+
+        comparisons = {comparison.name: comparison for comparison in compare(results, baseline, tolerance=0.25)}
+
+        self.assertTrue(comparisons['fast'].slower)
+        self.assertTrue(comparisons['fast'].heavier)
+        self.assertAlmostEqual(1.4, comparisons['fast'].time_ratio)
+        # Far slower in ratio, but within timer noise
+        self.assertFalse(comparisons['tiny'].regressed)
+        self.assertFalse(comparisons['new'].regressed)
+        self.assertIn('no baseline', comparisons['new'].to_text())
+        self.assertFalse(compare(results, baseline, tolerance=0.5, memory_tolerance=1)[0].regressed)
+
+    def test_baseline_round_trip(self):
+        with TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'baseline.json')
+            baseline = Baseline(0.1)
+            baseline.update({'day06': BenchmarkResult('day06', 5, 6, 7, 2)})
+            baseline.save(file_path)
+
+            loaded = Baseline.load(file_path)
+            self.assertEqual(0.1, loaded.scale)
+            self.assertEqual({'best_ns': 5, 'median_ns': 6, 'peak_memory': 7, 'rounds': 2}, loaded.results['day06'])
+
+            with open(file_path, 'w') as baseline_file:
+                json.dump({'format': BASELINE_FORMAT + 1}, baseline_file)
+            with self.assertRaises(ValueError):
+                Baseline.load(file_path)
+
+    def test_stored_baseline_covers_every_benchmark(self):
+        self.assertEqual(set(collect_benchmarks()), set(Baseline.load(DEFAULT_BASELINE_PATH).results))
@@ -0,0 +1,165 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from aocutils.aoc import Exercise
+from aocutils.cache import AnswerStore, ModelCache
+from day09 import Day09, HeightMap
+from day14 import Day14
+from day16 import Day16
+
+
+class TestModelCache(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.sut = ModelCache(self.directory.name)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_put_and_get(self):
+        self.sut.put('grid', [[1, 2], [3, 4]])
+
+        self.assertIn('grid', self.sut)
+        self.assertEqual([[1, 2], [3, 4]], self.sut.get('grid'))
+
+    def test_get_missing_key(self):
+        with self.assertRaises(KeyError):
+            self.sut.get('missing')
+
+    def test_get_or_build_only_builds_once(self):
+        builds = []
+
+        def builder():
+            builds.append(1)
+            return {'built': len(builds)}
+
+        self.assertEqual({'built': 1}, self.sut.get_or_build('model', builder))
+        self.assertEqual({'built': 1}, self.sut.get_or_build('model', builder))
+        self.assertEqual(1, len(builds))
+
+    def test_evict_least_recently_used(self):
+        sut = ModelCache(self.directory.name, max_bytes=2500)
+        sut.put('first', b'1' * 1000)
+        sut.put('second', b'2' * 1000)
+        os.utime(sut._path('first'), ns=(0, 0))
+        os.utime(sut._path('second'), ns=(1, 1))
+        sut.get('first')
+        sut.put('third', b'3' * 1000)
+
+        self.assertIn('first', sut)
+        self.assertNotIn('second', sut)
+        self.assertIn('third', sut)
+        self.assertLessEqual(sut.size(), 2500)
+
+
+class TestExerciseModel(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        Exercise.set_model_cache(ModelCache(self.directory.name))
+
+    def tearDown(self) -> None:
+        Exercise.set_model_cache(None)
+        self.directory.cleanup()
+
+    def test_model_is_loaded_from_cache(self):
+        input_data = ['2199943210', '3987894921', '9856789892', '8767896789', '9899965678']
+        Day09(input_data).height_map()
+
+        cached = Day09(list(input_data)).model('height_map', lambda: self.fail('Model should be cached'))
+        self.assertIsInstance(cached, HeightMap)
+        self.assertEqual(15, Day09(input_data).part_one())
+
+    def test_model_depends_on_input(self):
+        self.assertEqual(16, Day16(['8A004A801A8002F478']).part_one())
+        self.assertEqual(12, Day16(['620080001611562C8802118E34']).part_one())
+        self.assertEqual(12, Day16(['620080001611562C8802118E34']).part_one())
+
+
+class TestAnswerStore(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.sut = AnswerStore(os.path.join(self.directory.name, 'answers.sqlite3'))
+
+    def tearDown(self) -> None:
+        self.sut.close()
+        self.directory.cleanup()
+
+    def test_put_and_get(self):
+        self.sut.put('Day13', 'part_two', 'digest', 'v1', '#..#\n.##.')
+
+        self.assertEqual('#..#\n.##.', self.sut.get('Day13', 'part_two', 'digest', 'v1'))
+        with self.assertRaises(KeyError):
+            self.sut.get('Day13', 'part_one', 'digest', 'v1')
+
+    def test_stale_version_is_dropped(self):
+        self.sut.put('Day12', 'part_two', 'digest', 'v1', 36)
+
+        with self.assertRaises(KeyError):
+            self.sut.get('Day12', 'part_two', 'digest', 'v2')
+        self.assertEqual(0, len(self.sut))
+
+    def test_invalidate(self):
+        for exercise in ('Day12', 'Day17'):
+            for part in ('part_one', 'part_two'):
+                self.sut.put(exercise, part, 'digest', 'v1', 1)
+
+        self.assertEqual(1, self.sut.invalidate('Day12', 'part_two'))
+        self.assertEqual(2, self.sut.invalidate('Day17'))
+        self.assertEqual(1, len(self.sut))
+        self.sut.clear()
+        self.assertEqual(0, len(self.sut))
+
+    def test_evict_least_recently_used(self):
+        sut = AnswerStore(self.sut.file_path, max_entries=2)
+        sut.put('Day01', 'part_one', 'digest', 'v1', 1)
+        sut.put('Day02', 'part_one', 'digest', 'v1', 2)
+        sut.get('Day01', 'part_one', 'digest', 'v1')
+        sut.put('Day03', 'part_one', 'digest', 'v1', 3)
+
+        self.assertEqual(1, sut.get('Day01', 'part_one', 'digest', 'v1'))
+        self.assertEqual(3, sut.get('Day03', 'part_one', 'digest', 'v1'))
+        with self.assertRaises(KeyError):
+            sut.get('Day02', 'part_one', 'digest', 'v1')
+        sut.close()
+
+    def test_unserializable_answer_is_not_stored(self):
+        with self.assertLogs('aocutils.cache', 'WARNING'):
+            self.assertFalse(self.sut.put('Day01', 'part_one', 'digest', 'v1', object()))
+
+
+class TestExerciseAnswerStore(TestCase):
+    INPUT = ['NNCB', '', 'CH -> B', 'HH -> N', 'CB -> H', 'NH -> C', 'HB -> C', 'HC -> B', 'HN -> C', 'NN -> C',
+             'BH -> H', 'NC -> B', 'NB -> B', 'BN -> B', 'BB -> N', 'BC -> B', 'CC -> N', 'CN -> C']
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        Exercise.set_answer_store(AnswerStore(os.path.join(self.directory.name, 'answers.sqlite3')))
+
+    def tearDown(self) -> None:
+        Exercise.answer_store.close()
+        Exercise.set_answer_store(None)
+        self.directory.cleanup()
+
+    def test_stored_answer_skips_solving(self):
+        self.assertEqual(1588, Day14(self.INPUT).solve_part('part_one'))
+
+        exercise = Day14(self.INPUT)
+        exercise.part_one = lambda: self.fail('Answer should be stored')
+        self.assertEqual(1588, exercise.solve_part('part_one'))
+
+    def test_solve_measured_skips_construction(self):
+        Day14.solve_measured(self.INPUT, track_memory=False)
+        report = Day14.solve_measured(self.INPUT, track_memory=False)
+
+        self.assertEqual({'part_one': 1588, 'part_two': 2188189693529}, report.answers)
+        self.assertEqual(['stored answers'], [step.name for step in report.steps])
+
+    def test_answer_depends_on_input(self):
+        Day14(self.INPUT).solve_part('part_one')
+
+        self.assertIsNone(Day14.stored_answers(self.INPUT[:-1], ['part_one']))
+        self.assertIsNone(Day14.stored_answers(self.INPUT, ['part_one', 'part_two']))
@@ -94,6 +94,19 @@ class TestVentMap(TestCase):
 
         self.assertEqual(EXPECTED_COMPLETE_MAP, sut.draw())
 
+    def test_draw_uses_the_cell_class(self):
+        class Vent(VentMap.Cell):
+            __slots__ = ()
+
+        class CustomVentMap(VentMap):
+            cell_class = Vent
+
+        sut = CustomVentMap([Segment.from_string('0,0 -> 2,0'), Segment.from_string('1,0 -> 1,1')])
+        sut.plot()
+
+        self.assertTrue(all(isinstance(vent, Vent) for vent in sut.cells))
+        self.assertEqual([1, 2, 1, 1], [vent.value for vent in sut.cells])
+
 
 class TestDay05(TestCase):
     def test_part_one(self):
@@ -103,3 +116,10 @@ class TestDay05(TestCase):
     def test_part_two(self):
         sut = Day05(EXAMPLE_INPUT.split("\n"))
         self.assertEqual(EXPECTED_COMPLETE_RESULT, sut.part_two())
+
+    def test_maps_go_to_the_debug_log(self):
+        sut = Day05(EXAMPLE_INPUT.split("\n"))
+        with self.assertLogs(sut.log, 'DEBUG') as logs:
+            sut.part_two()
+
+        self.assertEqual(EXPECTED_COMPLETE_MAP.split("\n"), [record.getMessage() for record in logs.records])
@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from day15 import Day15, ExtendedRiskMap
+from day15 import Day15, ExtendedRiskMap, RiskMap
 
 EXAMPLE_INPUT = '''
 1163751742
@@ -90,3 +90,22 @@ class TestExtendedRiskMap(TestCase):
         sut = ExtendedRiskMap(EXAMPLE_INPUT.split("\n"), 5)
         print(sut)
         self.assertEqual(EXAMPLE_MAP_PART_TWO, str(sut))
+
+    def test_large_extension_is_computed_on_demand(self):
+        sut = ExtendedRiskMap(EXAMPLE_INPUT.split("\n"), 100)
+
+        self.assertEqual((999, 999), (sut.max_x, sut.max_y))
+        self.assertEqual(1, sut.value_at(999, 999))
+        self.assertEqual([1, 2, 3, 4, 5, 6, 7, 8, 9, 1], [sut.value_at(10 * tile, 0) for tile in range(10)])
+        self.assertEqual(0, sut.materialized)
+
+
+class TestRiskMap(TestCase):
+    def test_flipped_views_keep_risk_levels(self):
+        sut = RiskMap(['123', '456'], allow_diagonal=False)
+        flipped = sut.vflip()
+
+        self.assertEqual(4, flipped[(0, 0)].value)
+        self.assertEqual([5, 1], [neighbor.value for neighbor in flipped[(0, 0)].neighbors()])
+        self.assertEqual([4, 5, 6, 1, 2, 3], flipped.values())
+        self.assertEqual([1, 2, 3, 4, 5, 6], sut.values())
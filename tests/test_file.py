@@ -0,0 +1,84 @@
+import os
+import pickle
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from aocutils.aoc import Exercise
+from aocutils.file import MappedIntegers, MappedLines
+from day01 import Day01
+from day02 import Day02
+from day06 import Day06
+
+COMMANDS = '''forward 5
+down 5
+forward 8
+up 3
+down 8
+forward 2'''
+
+
+class TestMappedLines(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, 'input.txt')
+        with open(self.file_path, 'w') as input_file:
+            input_file.write(COMMANDS)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_iterate_like_readlines(self):
+        with open(self.file_path) as input_file, MappedLines(self.file_path) as sut:
+            self.assertEqual(input_file.readlines(), list(sut))
+            self.assertEqual(list(sut), list(sut))
+
+    def test_random_access(self):
+        with MappedLines(self.file_path) as sut:
+            self.assertEqual(6, len(sut))
+            self.assertEqual('down 5\n', sut[1])
+            self.assertEqual('forward 2', sut[-1])
+            self.assertEqual(['forward 5\n', 'forward 8\n'], sut[0:4:2])
+            with self.assertRaises(IndexError):
+                sut[6]
+
+    def test_bytes_lines(self):
+        with MappedLines(self.file_path, as_bytes=True) as sut:
+            self.assertEqual(b'up 3\n', sut[3])
+
+    def test_empty_file(self):
+        empty_path = os.path.join(self.directory.name, 'empty.txt')
+        open(empty_path, 'w').close()
+
+        with MappedLines(empty_path) as sut:
+            self.assertEqual([], list(sut))
+            self.assertEqual(0, len(sut))
+
+    def test_pickle(self):
+        with MappedLines(self.file_path) as sut, pickle.loads(pickle.dumps(sut)) as copy:
+            self.assertEqual(list(sut), list(copy))
+
+    def test_streaming_exercise(self):
+        with Day02.read_input(self.file_path, streaming=True) as input_data:
+            self.assertIsInstance(input_data, MappedLines)
+            self.assertEqual(150, Day02(input_data).part_one())
+            self.assertEqual(900, Day02(input_data).part_two())
+
+    def test_streaming_integers(self):
+        file_path = os.path.join(self.directory.name, 'day01.txt')
+        with open(file_path, 'w') as input_file:
+            input_file.write("199\n200\n208\n210\n200\n207\n240\n269\n260\n263\n")
+
+        with Day01.read_input(file_path, streaming=True) as input_data:
+            self.assertIsInstance(input_data, MappedIntegers)
+            self.assertEqual(Day01.read_input(file_path), list(input_data))
+            self.assertEqual(7, Day01(input_data).part_one())
+            self.assertEqual(5, Day01(input_data).part_two())
+
+    def test_streaming_single_line_exercise(self):
+        file_path = os.path.join(self.directory.name, 'day06.txt')
+        with open(file_path, 'w') as input_file:
+            input_file.write("3,4,3,1,2\n")
+
+        with Exercise.read_input(file_path, streaming=True) as input_data:
+            self.assertEqual(5934, Day06(input_data).part_one())
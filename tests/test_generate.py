@@ -0,0 +1,45 @@
+from unittest import TestCase
+
+from aocutils.aoc import Exercise, Verbosity
+from aocutils.generate import GENERATORS, generate
+from aocutils.days import load_exercise
+
+
+class TestGenerate(TestCase):
+
+    def setUp(self) -> None:
+        Exercise.set_verbosity(Verbosity.QUIET)
+
+    def tearDown(self) -> None:
+        Exercise.set_verbosity(Verbosity.NORMAL)
+
+    def test_every_implemented_day_has_a_generator(self):
+        self.assertEqual(list(range(1, 18)), sorted(GENERATORS.keys()))
+
+    def test_reproducible(self):
+        for day in GENERATORS:
+            self.assertEqual(generate(day, 0.05, seed=3), generate(day, 0.05, seed=3))
+
+    def test_seed_changes_input(self):
+        self.assertNotEqual(generate(15, 0.05, seed=1), generate(15, 0.05, seed=2))
+
+    def test_scale_grows_input(self):
+        self.assertEqual(200, len(generate(1, 0.1)))
+        self.assertEqual(2000, len(generate(1, 1)))
+        self.assertEqual(100, len(generate(15, 1)))
+        self.assertEqual(200, len(generate(15, 4)))
+
+    def test_invalid_scale(self):
+        with self.assertRaises(ValueError):
+            generate(1, 0)
+
+    def test_generated_inputs_are_solvable(self):
+        for day in GENERATORS:
+            with self.subTest(day=day):
+                exercise_class = load_exercise(day)
+                input_data = generate(day, 0.02, seed=day)
+                if day == 1:
+                    input_data = [int(depth) for depth in input_data]
+
+                report = exercise_class.solve_measured(input_data, track_memory=False)
+                self.assertEqual({'part_one', 'part_two'}, set(report.answers.keys()))
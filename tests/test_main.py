@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from aocutils.__main__ import main
+from aocutils.aoc import Exercise, Verbosity
+from aocutils.days import ROOT_DIR
+
+
+class TestMain(TestCase):
+
+    def tearDown(self) -> None:
+        Exercise.set_verbosity(Verbosity.NORMAL)
+
+    def run_main(self, *argv: str) -> str:
+        output = StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(0, main(list(argv)))
+        return output.getvalue()
+
+    def test_run_single_part(self):
+        output = self.run_main('run', '6', '--part', '1', '-q')
+
+        self.assertIn('» Solution for part one is', output)
+        self.assertNotIn('part two', output)
+
+    def test_run_streaming_closes_the_input(self):
+        result = subprocess.run([sys.executable, '-X', 'dev', '-m', 'aocutils', 'run', '1', '--stream', '-q'],
+                                cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+
+        self.assertIn('» Solution for part two is', result.stdout)
+        self.assertNotIn('ResourceWarning', result.stderr)
+
+    def test_run_measured(self):
+        output = self.run_main('run', '14', '--measure', '-q')
+
+        self.assertIn('construction', output)
+        self.assertIn('» Solution for part two is', output)
+
+    def test_list(self):
+        self.assertIn("17\tday17", self.run_main('list'))
+
+    def test_generate(self):
+        self.assertRegex(self.run_main('generate', '17', '--seed', '2'), r'^target area: x=\d+\.\.\d+, y=')
+
+    def test_bench(self):
+        with TemporaryDirectory() as directory:
+            baseline_path = os.path.join(directory, 'baseline.json')
+            self.run_main('bench', 'day06', '--scale', '0.01', '--rounds', '1', '--baseline', baseline_path, '--update')
+            output = self.run_main('bench', 'day06', '--rounds', '1', '--baseline', baseline_path,
+                                   '--tolerance', '100')
+
+        self.assertIn('x baseline', output)
+        self.assertIn('0 regression(s) in 1 benchmark(s)', output)
+
+    def test_run_only_imports_requested_day(self):
+        script = ("import sys; from aocutils.__main__ import main; main(['run', '6', '-q']); "
+                  "print(sorted(name for name in sys.modules if name.startswith('day') "
+                  "or name in ('aocutils.runner', 'aocutils.generate', 'concurrent.futures')))")
+        output = subprocess.run([sys.executable, '-c', script], cwd=ROOT_DIR,
+                                capture_output=True, text=True, check=True).stdout
+
+        self.assertEqual("['day06']", output.strip().split("\n")[-1])
@@ -0,0 +1,514 @@
+import os
+import pickle
+import subprocess
+import sys
+from random import Random
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from aocutils.matrix import (NEIGHBOR_TABLE_CACHE_CELLS, NO_COMPONENT, SNAPSHOT_HEADER, Automaton, MappedMatrix,
+                             Matrix, SparseMatrix, StateHistory, TiledMatrix, decode_snapshot, encode_snapshot,
+                             fingerprint, neighbor_table, write_binary_grid)
+
+GRID = ['123', '456', '789', 'abc']
+
+
+class TestNeighborTable(TestCase):
+
+    def test_matches_direction_methods(self):
+        for allow_diagonal in (True, False):
+            matrix = Matrix(GRID, allow_diagonal)
+            for cell in matrix.cells:
+                with self.subTest(cell=(cell.x, cell.y), allow_diagonal=allow_diagonal):
+                    if allow_diagonal:
+                        expected = [cell.top_left(), cell.top(), cell.top_right(), cell.right(),
+                                    cell.bottom_right(), cell.bottom(), cell.bottom_left(), cell.left()]
+                    else:
+                        expected = [cell.top(), cell.right(), cell.bottom(), cell.left()]
+                    expected = [neighbor for neighbor in expected if neighbor is not None]
+
+                    self.assertEqual(expected, cell.neighbors())
+                    self.assertEqual(expected, list(cell.iter_neighbors()))
+
+    def test_csr_layout(self):
+        offsets, indices = neighbor_table(3, 4, False)
+
+        self.assertEqual(13, len(offsets))
+        self.assertEqual(len(indices), offsets[-1])
+        # Centre cell (1, 1): top, right, bottom, left
+        self.assertEqual([1, 5, 7, 3], list(indices[offsets[4]:offsets[5]]))
+
+    def test_table_is_shared_by_shape(self):
+        first, second = Matrix(GRID), Matrix(list(reversed(GRID)))
+
+        self.assertIs(first.neighbor_table, second.neighbor_table)
+        self.assertIsNot(first.neighbor_table, Matrix(GRID, allow_diagonal=False).neighbor_table)
+        self.assertEqual([1, 4, 3], list(first.neighbor_indices(0)))
+
+    def test_big_tables_are_not_shared(self):
+        width = NEIGHBOR_TABLE_CACHE_CELLS // 10 + 1
+        first, second = (Matrix(['0' * width] * 10, allow_diagonal=False) for _ in range(2))
+
+        self.assertIsNot(first.neighbor_table, second.neighbor_table)
+        self.assertIs(first.neighbor_table, first.neighbor_table)
+        self.assertEqual(list(first.neighbor_table[1]), list(second.neighbor_table[1]))
+
+
+class TestBulkOperations(TestCase):
+
+    def setUp(self) -> None:
+        self.sut = Matrix(['123', '456', '789'], allow_diagonal=False)
+        self.values = self.sut.map_values(int)
+
+    def test_values(self):
+        self.assertEqual(list('123456789'), self.sut.values())
+        self.sut.set_values(value * 2 for value in self.values)
+        self.assertEqual(18, self.sut[(2, 2)].value)
+        self.assertEqual(4, self.sut.count(lambda value: value > 10))
+        self.assertEqual(9, self.sut.count())
+
+    def test_neighbor_reductions_match_cells(self):
+        for cell, lowest, highest, total in zip(self.sut.cells, self.sut.neighbor_min(self.values),
+                                                self.sut.neighbor_max(self.values),
+                                                self.sut.neighbor_sum(self.values)):
+            with self.subTest(cell=(cell.x, cell.y)):
+                neighbors = [int(neighbor.value) for neighbor in cell.neighbors()]
+                self.assertEqual((min(neighbors), max(neighbors), sum(neighbors)), (lowest, highest, total))
+
+    def test_empty_neighborhood(self):
+        self.assertEqual([None], Matrix(['5']).neighbor_min())
+        self.assertEqual([0], Matrix(['5']).neighbor_sum([5]))
+
+    def test_stencil(self):
+        laplacian = {(0, 0): -4, (0, -1): 1, (1, 0): 1, (0, 1): 1, (-1, 0): 1}
+
+        self.assertEqual([a - 4 * b for a, b in zip(self.sut.neighbor_sum(self.values), self.values)],
+                         self.sut.stencil(laplacian, self.values))
+        self.assertEqual([2, 3, 0, 5, 6, 0, 8, 9, 0], self.sut.stencil({(1, 0): 1}, self.values))
+
+
+class TestFingerprint(TestCase):
+
+    def setUp(self) -> None:
+        self.sut = Matrix(GRID)
+
+    def test_follows_writes(self):
+        before = self.sut.fingerprint
+        self.sut.set_value(1, 2, 'z')
+
+        self.assertNotEqual(before, self.sut.fingerprint)
+        self.assertEqual(fingerprint(self.sut.values()), self.sut.fingerprint)
+        self.sut.set_values(list('123456789abc'))
+        self.assertEqual(before, self.sut.fingerprint)
+
+    def test_depends_on_positions(self):
+        self.assertNotEqual(fingerprint([1, 2, 3]), fingerprint([3, 2, 1]))
+        self.assertNotEqual(fingerprint([1, 2, 0]), fingerprint([0, 1, 2]))
+        self.assertEqual(Matrix(GRID).fingerprint, self.sut.fingerprint)
+
+    def test_stable_across_processes(self):
+        code = 'from aocutils.matrix import Matrix; print(Matrix(%r).fingerprint)' % GRID
+        for seed in ('1', '2'):
+            with self.subTest(seed=seed):
+                output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                        env={**os.environ, 'PYTHONHASHSEED': seed}).stdout
+                self.assertEqual(self.sut.fingerprint, int(output))
+
+    def test_equality(self):
+        other = Matrix(GRID)
+        self.assertEqual(other, self.sut)
+        other.set_value(0, 0, '0')
+        self.assertNotEqual(other, self.sut)
+        self.assertNotEqual(Matrix(GRID[:3]), self.sut)
+        self.assertEqual(Matrix(list(reversed(GRID))), self.sut.vflip())
+
+    def test_follows_direct_writes(self):
+        before = self.sut.fingerprint
+        self.sut[(0, 0)].value = '9'
+
+        self.assertEqual(fingerprint(self.sut.values()), self.sut.fingerprint)
+        self.sut[(0, 0)].value = '1'
+        self.assertEqual(before, self.sut.fingerprint)
+
+    def test_unverified_history_sees_direct_writes(self):
+        history = StateHistory(verify=False)
+        self.assertIsNone(history.record(self.sut))
+        self.sut[(0, 0)].value = '9'
+
+        self.assertIsNone(history.record(self.sut))
+
+    def test_equality_after_direct_writes(self):
+        _ = self.sut.fingerprint
+        self.sut[(0, 0)].value = '9'
+
+        self.assertEqual(Matrix(['923'] + GRID[1:]), self.sut)
+
+    def test_views_follow_their_source(self):
+        view = self.sut.hflip()
+        before = view.fingerprint
+        self.sut.set_value(0, 0, 'z')
+
+        self.assertNotEqual(before, view.fingerprint)
+        self.assertEqual(fingerprint(view.values()), view.fingerprint)
+
+
+class TestComponentLabels(TestCase):
+
+    def test_labels_and_sizes(self):
+        sut = Matrix(['#..#', '#.##', '##..', '.#..'], allow_diagonal=False)
+        labels, sizes = sut.label_components(lambda value: value == '#')
+
+        self.assertEqual([NO_COMPONENT, 0, 0, NO_COMPONENT, NO_COMPONENT, 0, NO_COMPONENT, NO_COMPONENT,
+                          NO_COMPONENT, NO_COMPONENT, 1, 1, 2, NO_COMPONENT, 1, 1], list(labels))
+        self.assertEqual([3, 4, 1], sizes)
+
+    def test_diagonal_connectivity(self):
+        _, sizes = Matrix(['#.', '.#']).label_components(lambda value: value == '.')
+        self.assertEqual([2], sizes)
+        _, sizes = Matrix(['#.', '.#'], allow_diagonal=False).label_components(lambda value: value == '.')
+        self.assertEqual([1, 1], sizes)
+
+    def test_snake_shaped_component_does_not_recurse(self):
+        # One path winding through a 301x301 grid, far deeper than the recursion limit
+        rows = ['.' * 301 if y % 2 == 0 else ('#' * 300 + '.' if y % 4 == 1 else '.' + '#' * 300)
+                for y in range(301)]
+        labels, sizes = Matrix(rows, allow_diagonal=False).label_components(lambda value: value == '#')
+
+        self.assertEqual([151 * 301 + 150], sizes)
+        self.assertEqual(0, labels[-1])
+
+
+def life(value: str, neighbors: list[str]) -> str:
+    alive = neighbors.count('#')
+    return '#' if alive == 3 or (alive == 2 and value == '#') else '.'
+
+
+def binary_life(value: int, neighbors: list[int]) -> int:
+    alive = sum(neighbors)
+    return 1 if alive == 3 or (alive == 2 and value) else 0
+
+
+class TestAutomaton(TestCase):
+
+    def test_blinker(self):
+        sut = Automaton(Matrix(['.....', '.....', '.###.', '.....', '.....']), life)
+
+        sut.step()
+        self.assertEqual(list('.......#....#....#.......'), sut.values)
+        sut.step()
+        self.assertEqual(list('...........###...........'), sut.values)
+        self.assertEqual(2, sut.steps)
+        self.assertGreater(sut.steps_per_second, 0)
+
+    def test_quiescent_areas_are_skipped(self):
+        sut = Automaton(Matrix(['......', '.##...', '.##...', '......']), life)
+
+        self.assertEqual(0, sut.step())
+        self.assertTrue(sut.stable)
+        self.assertEqual(0, sut.run(10))
+
+    def test_matches_full_recomputation(self):
+        random = Random(21)
+        matrix = Matrix([''.join(random.choice('.#') for _ in range(16)) for _ in range(12)])
+        sut = Automaton(matrix, life)
+
+        expected = matrix.values()
+        for _ in range(20):
+            sut.step()
+            expected = [life(value, neighbors) for value, neighbors in
+                        zip(expected, matrix.neighbor_reduce(list, expected))]
+            self.assertEqual(expected, sut.values)
+
+        sut.write_back()
+        self.assertEqual(expected, matrix.values())
+
+    def test_batch_rule(self):
+        random = Random(22)
+        matrix = Matrix([''.join(random.choice('01') for _ in range(16)) for _ in range(12)])
+        cells = matrix.map_values(int)
+        expected = Automaton(matrix, binary_life, cells)
+
+        def batch_life(values: list[int], active: list[int]) -> list[int]:
+            # Neighbor counts of the whole grid in one stencil, only read for the active cells
+            alive = matrix.neighbor_sum(values)
+            return [1 if alive[index] == 3 or (alive[index] == 2 and values[index]) else 0 for index in active]
+
+        sut = Automaton(matrix, batch_life, cells, batch=True)
+        for _ in range(15):
+            self.assertEqual(expected.step(), sut.step())
+            self.assertEqual(expected.values, sut.values)
+            self.assertEqual(expected.active, sut.active)
+
+
+class TestStateHistory(TestCase):
+
+    def test_detects_repeated_configurations(self):
+        for verify in (True, False):
+            with self.subTest(verify=verify):
+                sut, matrix = StateHistory(verify), Matrix(['01', '23'])
+                states = ['0123', '1230', '2301', '1230']
+
+                steps = []
+                for state in states:
+                    matrix.set_values(list(state))
+                    steps.append(sut.record(matrix))
+
+                self.assertEqual([None, None, None, 1], steps)
+                self.assertEqual(4, len(sut))
+
+
+class TestMatrixView(TestCase):
+
+    def setUp(self) -> None:
+        self.sut = Matrix(GRID)
+
+    def test_splits(self):
+        left, right = self.sut.vsplit(1)
+        top, bottom = self.sut.hsplit(1)
+
+        self.assertEqual("1\n4\n7\na", str(left))
+        self.assertEqual("3\n6\n9\nc", str(right))
+        self.assertEqual("123", str(top))
+        self.assertEqual("789\nabc", str(bottom))
+        self.assertIsInstance(left, Matrix)
+        self.assertFalse(left.materialized)
+
+    def test_flips(self):
+        self.assertEqual("abc\n789\n456\n123", str(self.sut.vflip()))
+        self.assertEqual("321\n654\n987\ncba", str(self.sut.hflip()))
+        self.assertEqual("cba\n987", str(self.sut.hsplit(1)[1].vflip().hflip()))
+        self.assertEqual('8', self.sut.vflip().hflip().value_at(1, 1))
+
+    def test_views_share_storage(self):
+        bottom = self.sut.hsplit(1)[1].hflip()
+        self.sut[(2, 3)].value = 'z'
+
+        self.assertEqual("987\nzba", str(bottom))
+        self.assertIs(self.sut.cells[9], list(bottom.iter_rows())[1][2])
+
+    def test_copy_on_cell_access(self):
+        bottom = self.sut.hsplit(1)[1]
+        cell = bottom[(0, 1)]
+        cell.value = 'z'
+
+        self.assertTrue(bottom.materialized)
+        self.assertEqual((0, 1), (cell.x, cell.y))
+        self.assertEqual("789\nzbc", str(bottom))
+        self.assertEqual("123\n456\n789\nabc", str(self.sut))
+        self.assertEqual(['8', 'z'], [neighbor.value for neighbor in bottom[(1, 1)].neighbors()][1::3])
+
+
+class TestSparseMatrix(TestCase):
+    ROWS = ['#..', '.#.', '..#', '#..']
+
+    def setUp(self) -> None:
+        self.sut = SparseMatrix(self.ROWS)
+
+    def test_only_occupied_cells_are_stored(self):
+        sut = SparseMatrix.from_values({(0, 0): 1, (99_999, 99_999): 2, (5, 5): None}, 100_000, 100_000)
+
+        self.assertEqual(2, len(sut))
+        self.assertEqual(2, len(sut.points))
+        self.assertIsNone(sut[(5, 5)])
+        self.assertIsNone(sut.value_at(5, 5))
+        self.assertEqual(2, sut[(99_999, 99_999)].value)
+        with self.assertRaises(KeyError):
+            _ = sut[(100_000, 0)]
+
+    def test_matches_dense_rendering(self):
+        self.assertEqual("\n".join(self.ROWS), str(self.sut))
+        self.assertEqual(4, len(self.sut))
+        self.assertEqual([(0, 0), (1, 1), (2, 2), (0, 3)], [(cell.x, cell.y) for cell in self.sut.cells])
+
+    def test_neighbors(self):
+        centre = self.sut[(1, 1)]
+
+        self.assertEqual([(0, 0), (2, 2)], [(cell.x, cell.y) for cell in centre.neighbors()])
+        self.assertEqual([], SparseMatrix(self.ROWS, allow_diagonal=False)[(1, 1)].neighbors())
+        self.assertIsNone(centre.top())
+        self.assertEqual(self.sut[(0, 0)], centre.top_left())
+
+    def test_split_and_flip(self):
+        left, right = self.sut.vsplit(1)
+        top, bottom = self.sut.hsplit(2)
+
+        self.assertEqual("#\n.\n.\n#", str(left))
+        self.assertEqual(".\n.\n#\n.", str(right))
+        self.assertEqual("#..\n.#.", str(top))
+        self.assertEqual("#..", str(bottom))
+        self.assertEqual("#..\n..#\n.#.\n#..", str(self.sut.vflip()))
+        self.assertEqual("..#\n.#.\n#..\n..#", str(self.sut.hflip()))
+
+    def test_setitem(self):
+        self.sut[(2, 0)] = '#'
+        self.sut[(0, 0)] = None
+
+        self.assertEqual("..#\n.#.\n..#\n#..", str(self.sut))
+        self.assertEqual(4, len(self.sut))
+        self.assertEqual(SparseMatrix(['..#', '.#.', '..#', '#..']), self.sut)
+
+
+class TestTiledMatrix(TestCase):
+
+    def setUp(self) -> None:
+        self.sut = TiledMatrix(Matrix(['12', '34']), 3, 2, transform=lambda value, tile_x, tile_y: f'{value}{tile_x}')
+
+    def test_values(self):
+        self.assertEqual((5, 3), (self.sut.max_x, self.sut.max_y))
+        self.assertEqual("102011211222\n304031413242\n102011211222\n304031413242", str(self.sut))
+        self.assertEqual('42', self.sut.value_at(5, 3))
+        self.assertEqual(0, self.sut.materialized)
+
+    def test_cells_are_created_on_access(self):
+        cell = self.sut[(5, 3)]
+
+        self.assertEqual('42', cell.value)
+        self.assertIs(cell, self.sut.cells[-1])
+        self.assertEqual(1, self.sut.materialized)
+        self.assertEqual(24, len(self.sut.cells))
+        with self.assertRaises(KeyError):
+            _ = self.sut[(6, 0)]
+
+    def test_neighbors(self):
+        matrix = Matrix(['123', '456', '789', 'abc'])
+        sut = TiledMatrix(matrix, 1)
+
+        for cell in matrix.cells:
+            with self.subTest(cell=(cell.x, cell.y)):
+                self.assertEqual([(neighbor.x, neighbor.y) for neighbor in cell.neighbors()],
+                                 [(neighbor.x, neighbor.y) for neighbor in sut[(cell.x, cell.y)].neighbors()])
+        self.assertEqual(['2', '4', '3'], [neighbor.value for neighbor in
+                                           TiledMatrix(matrix, 2, allow_diagonal=False)[(3, 0)].neighbors()][:3])
+
+
+class TestMappedMatrix(TestCase):
+    HEIGHT_MAP = ['2199943210', '3987894921', '9856789892', '8767896789', '9899965678']
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.text_path = os.path.join(self.directory.name, 'grid.txt')
+        with open(self.text_path, 'w', newline='') as grid_file:
+            grid_file.write("\r\n".join(self.HEIGHT_MAP) + "\r\n\r\n")
+        self.binary_path = os.path.join(self.directory.name, 'grid.bin')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_text_and_binary_grids_match_matrix(self):
+        self.assertEqual((10, 5), write_binary_grid(self.text_path, self.binary_path))
+        matrix = Matrix(self.HEIGHT_MAP, allow_diagonal=False)
+
+        for file_path in (self.text_path, self.binary_path):
+            with self.subTest(file_path=file_path), MappedMatrix(file_path, allow_diagonal=False) as sut:
+                self.assertEqual(file_path == self.binary_path, sut.binary)
+                self.assertEqual((matrix.max_x, matrix.max_y), (sut.max_x, sut.max_y))
+                self.assertEqual("\n".join(self.HEIGHT_MAP), str(sut))
+                self.assertEqual([9, 8, 5, 6, 7, 8, 9, 8, 9, 2], list(sut.row_values(2)))
+                self.assertEqual([int(cell.value) for cell in matrix[(4, 2)].neighbors()],
+                                 [cell.value for cell in sut[(4, 2)].neighbors()])
+                self.assertEqual(5, sut.materialized)
+
+    def test_pickle_reopens_the_file(self):
+        with MappedMatrix(self.text_path) as sut:
+            copy = pickle.loads(pickle.dumps(sut))
+
+        self.assertEqual(8, copy.value_at(9, 4))
+        copy.close()
+
+    def test_not_a_grid(self):
+        with open(self.text_path, 'w') as grid_file:
+            grid_file.write("123\n45\n")
+
+        with self.assertRaises(ValueError):
+            MappedMatrix(self.text_path)
+        with self.assertRaises(ValueError):
+            write_binary_grid(self.text_path, self.binary_path)
+
+
+class TestSnapshot(TestCase):
+
+    class DigitGrid(Matrix):
+        def _init_value(self, x, y, value) -> Matrix.Cell:
+            return self._cell_from_value(x, y, int(value))
+
+    class LightGrid(Matrix):
+        class Light(Matrix.Cell):
+            __slots__ = ()
+
+        cell_class = Light
+
+        def _init_value(self, x, y, value) -> Matrix.Cell:
+            return self._cell_from_value(x, y, value == '#')
+
+    def test_value_kinds(self):
+        for values, size in (([True, False, False, True], 1), (list('ab#.'), 1), ([0, 255, 3, 4], 1),
+                             ([-1, 2, 3, 4], 1), ([0, 1, 70_000, 2], 4), ([-2 ** 40, 0, 1, 2], 8),
+                             ([0.5, 1.0, -2.0, 3.25], 8)):
+            with self.subTest(values=values):
+                snapshot = encode_snapshot(values, 2, 2)
+
+                self.assertEqual(SNAPSHOT_HEADER.size + 4 * size, len(snapshot))
+                self.assertEqual((values, 2, 2), decode_snapshot(snapshot))
+                self.assertEqual((values, 2, 2), decode_snapshot(encode_snapshot(values, 2, 2, compress=True)))
+
+    def test_invalid_snapshots(self):
+        with self.assertRaises(TypeError):
+            encode_snapshot(['ab'], 1, 1)
+        with self.assertRaises(ValueError):
+            encode_snapshot([1, 2, 3], 2, 2)
+        with self.assertRaises(ValueError):
+            decode_snapshot(b'AOCGRID1' + bytes(16))
+        with self.assertRaises(ValueError):
+            decode_snapshot(encode_snapshot([1, 2, 3, 4], 2, 2)[:-1])
+
+    def test_save_and_load(self):
+        sut = self.DigitGrid(['123', '456'])
+        with TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'grid.snapshot')
+            sut.save(file_path, compress=True)
+            loaded = self.DigitGrid.load(file_path, allow_diagonal=False)
+
+        self.assertEqual(sut, loaded)
+        self.assertEqual(6, loaded[(2, 1)].value)
+        self.assertEqual(2, len(loaded[(0, 0)].neighbors()))
+        self.assertIsInstance(loaded, self.DigitGrid)
+
+    def test_pickles_as_snapshot(self):
+        sut = Matrix(['#' * 100] * 100)
+        loaded = pickle.loads(pickle.dumps(sut))
+
+        self.assertEqual(sut, loaded)
+        self.assertLess(len(pickle.dumps(sut)), 2 * 100 * 100 + 1000)
+        self.assertIs(loaded, loaded.cells[5].matrix)
+
+    def test_pickle_leaves_the_fingerprint_out(self):
+        sut = Matrix(GRID)
+        _ = sut.fingerprint
+        loaded = pickle.loads(pickle.dumps(sut))
+
+        self.assertIsNone(loaded._fingerprint)
+        self.assertEqual(Matrix(GRID).fingerprint, loaded.fingerprint)
+
+    def test_parsed_values_skip_the_text_parser(self):
+        sut = self.LightGrid(['#.', '.#'])
+        rebuilt = [self.LightGrid.from_values(sut.values(), 2, 2), pickle.loads(pickle.dumps(sut)),
+                   sut.vflip().vflip()]
+        rebuilt[2].materialize()
+
+        for matrix in rebuilt:
+            with self.subTest(matrix=type(matrix).__name__):
+                self.assertEqual([True, False, False, True], matrix.values())
+                self.assertIsInstance(matrix[(1, 1)], self.LightGrid.Light)
+
+    def test_sparse_and_lazy_matrices(self):
+        sparse = SparseMatrix(['#..', '...', '..#'])
+        tiled = TiledMatrix(self.DigitGrid(['12', '34']), 3, transform=lambda value, tx, ty: value + tx + ty)
+        with TemporaryDirectory() as directory:
+            sparse.save(os.path.join(directory, 'sparse'))
+            tiled.save(os.path.join(directory, 'tiled'))
+            loaded_sparse = SparseMatrix.load(os.path.join(directory, 'sparse'))
+            loaded_tiled = self.DigitGrid.load(os.path.join(directory, 'tiled'))
+
+        self.assertEqual(sparse, loaded_sparse)
+        self.assertEqual(2, len(loaded_sparse))
+        self.assertEqual(str(tiled), str(loaded_tiled))
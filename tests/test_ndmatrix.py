@@ -0,0 +1,123 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+
+from aocutils.matrix import Matrix, write_binary_grid
+from aocutils.ndmatrix import ArrayMatrix, parse_digits
+
+HEIGHT_MAP = ['2199943210', '3987894921', '9856789892', '8767896789', '9899965678']
+
+
+class TestArrayMatrix(TestCase):
+
+    def setUp(self) -> None:
+        self.sut = ArrayMatrix(HEIGHT_MAP, allow_diagonal=False)
+
+    def test_parse_digits(self):
+        values = parse_digits(['123\n', '456\n', '\n'])
+
+        self.assertEqual((2, 3), values.shape)
+        self.assertEqual(np.uint8, values.dtype)
+        self.assertEqual([[1, 2, 3], [4, 5, 6]], values.tolist())
+        with self.assertRaises(ValueError):
+            parse_digits(['12', '3'])
+        with self.assertRaises(ValueError):
+            parse_digits(['1#'])
+
+    def test_matches_matrix(self):
+        matrix = Matrix(HEIGHT_MAP, allow_diagonal=True)
+        sut = ArrayMatrix(HEIGHT_MAP, allow_diagonal=True)
+
+        self.assertEqual(str(matrix), str(sut))
+        self.assertEqual((matrix.max_x, matrix.max_y), (sut.max_x, sut.max_y))
+        self.assertEqual(len(matrix.cells), len(sut.cells))
+        for cell, view in zip(matrix.cells, sut.cells):
+            self.assertEqual((cell.x, cell.y), (view.x, view.y))
+            self.assertEqual([int(neighbor.value) for neighbor in cell.neighbors()],
+                             [neighbor.value for neighbor in view.neighbors()])
+
+    def test_cell_views(self):
+        cell = self.sut[(2, 1)]
+
+        self.assertEqual(8, cell.value)
+        self.assertEqual(cell, self.sut.cells[12])
+        self.assertEqual(self.sut.cells[-1], self.sut[(9, 4)])
+        cell.value = 0
+        self.assertEqual(0, self.sut.values[1, 2])
+        self.assertEqual(0, self.sut.cells[12].value)
+        with self.assertRaises(KeyError):
+            _ = self.sut[(10, 0)]
+        with self.assertRaises(KeyError):
+            _ = self.sut[(-1, 0)]
+
+    def test_cell_neighbors_build_no_table(self):
+        sut = ArrayMatrix.from_array(np.zeros((2000, 2000), dtype=np.uint8))
+
+        self.assertEqual([(4, 4), (5, 4), (6, 4), (6, 5), (6, 6), (5, 6), (4, 6), (4, 5)],
+                         [(neighbor.x, neighbor.y) for neighbor in sut[(5, 5)].neighbors()])
+        self.assertEqual(3, len(sut[(0, 0)].neighbors()))
+        self.assertFalse(hasattr(sut, 'neighbor_table'))
+
+    def test_neighbor_values(self):
+        neighbors = self.sut.neighbor_values(fill=9)
+
+        self.assertEqual((4, 5, 10), neighbors.shape)
+        # top, right, bottom, left of (0, 0)
+        self.assertEqual([9, 1, 3, 9], neighbors[:, 0, 0].tolist())
+        self.assertEqual([False, True, True, False], self.sut.neighbor_mask()[:, 0, 0].tolist())
+
+    def test_low_points(self):
+        low_points = self.sut.cells_where(self.sut.values < self.sut.neighbor_min())
+
+        self.assertEqual([1, 0, 5, 5], [point.value for point in low_points])
+        self.assertEqual(15, self.sut.sum(self.sut.values < self.sut.neighbor_min()) + len(low_points))
+
+    def test_neighbor_count(self):
+        sut = ArrayMatrix(['000', '000', '000'])
+        mask = np.zeros((3, 3), dtype=bool)
+        mask[1, 1] = True
+
+        self.assertEqual([[1, 1, 1], [1, 0, 1], [1, 1, 1]], sut.neighbor_count(mask).tolist())
+        self.assertEqual(1, sut.count(mask))
+
+    def test_bulk_operations_match_matrix(self):
+        matrix = Matrix(HEIGHT_MAP, allow_diagonal=False)
+        values = matrix.map_values(int)
+        weights = {(0, 0): 2, (1, 1): -1, (-2, 0): 3}
+
+        self.assertEqual(matrix.neighbor_sum(values), self.sut.neighbor_sum().ravel().tolist())
+        self.assertEqual(matrix.stencil(weights, values), self.sut.stencil(weights).ravel().tolist())
+        self.assertEqual(values, self.sut.map_values(lambda heights: heights.astype(int)).ravel().tolist())
+
+    def test_split_and_flip_share_memory(self):
+        left, right = self.sut.vsplit(4)
+        top, bottom = self.sut.hsplit(2)
+
+        self.assertEqual("2199\n3987\n9856\n8767\n9899", str(left))
+        self.assertEqual("87656\n98769\n29898\n12949\n01234", str(right.hflip().vflip()))
+        self.assertEqual("3987894921\n2199943210", str(top.vflip()))
+        self.assertEqual("8767896789\n9899965678", str(bottom))
+        left.values[0, 0] = 7
+        self.assertEqual(7, self.sut.values[0, 0])
+        self.assertEqual(self.sut, ArrayMatrix.from_array(self.sut.values.copy()))
+
+    def test_memmap_binary_grid(self):
+        with TemporaryDirectory() as directory:
+            text_path = os.path.join(directory, 'grid.txt')
+            binary_path = os.path.join(directory, 'grid.bin')
+            with open(text_path, 'w') as grid_file:
+                grid_file.write("\n".join(HEIGHT_MAP))
+            write_binary_grid(text_path, binary_path)
+
+            sut = ArrayMatrix.memmap(binary_path, allow_diagonal=False)
+            self.assertEqual(self.sut, sut)
+            self.assertEqual(4, sut.count(sut.values < sut.neighbor_min()))
+            with self.assertRaises(ValueError):
+                ArrayMatrix.memmap(text_path)
+
+            writable = ArrayMatrix.memmap(binary_path, writable=True)
+            writable[(0, 0)].value = 9
+            self.assertEqual(2, ArrayMatrix.memmap(binary_path).value_at(0, 0))
+            del sut, writable
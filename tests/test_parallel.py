@@ -0,0 +1,92 @@
+from random import Random
+from unittest import TestCase
+
+from aocutils.matrix import Automaton, Matrix
+from aocutils.parallel import (ParallelAutomaton, bands, parallel_automaton, parallel_label_components,
+                               parallel_stencil)
+
+
+def is_wall(value: int) -> bool:
+    return value == 9
+
+
+def life(value: int, neighbors: list[int]) -> int:
+    alive = sum(neighbors)
+    return 1 if alive == 3 or (alive == 2 and value) else 0
+
+
+def random_grid(seed: int, allow_diagonal: bool = True) -> Matrix:
+    random = Random(seed)
+    return Matrix([''.join(random.choice('0000009999') for _ in range(23)) for _ in range(17)], allow_diagonal)
+
+
+class TestParallel(TestCase):
+
+    def test_bands(self):
+        self.assertEqual([(0, 4), (4, 7), (7, 10)], bands(10, 3))
+        self.assertEqual([(0, 1), (1, 2)], bands(2, 8))
+        self.assertEqual([(0, 5)], bands(5, 1))
+
+    def test_stencil_matches_matrix(self):
+        matrix = random_grid(1)
+        values = matrix.map_values(int)
+        weights = {(0, 0): 2, (1, -1): -1, (0, 2): 3}
+
+        self.assertEqual(matrix.stencil(weights, values), parallel_stencil(matrix, weights, values, 3, min_cells=0))
+
+    def test_labels_match_matrix(self):
+        for allow_diagonal in (True, False):
+            with self.subTest(allow_diagonal=allow_diagonal):
+                matrix = random_grid(2, allow_diagonal)
+                values = matrix.map_values(int)
+                labels, sizes = parallel_label_components(matrix, is_wall, values, 4, min_cells=0)
+                expected_labels, expected_sizes = matrix.label_components(is_wall, values)
+
+                self.assertEqual(list(expected_labels), list(labels))
+                self.assertEqual(expected_sizes, sizes)
+
+    def test_component_crossing_every_band(self):
+        # A single path winding down through all the bands, and back up
+        matrix = Matrix(['0999', '0909', '0909', '0909', '0009'], allow_diagonal=False)
+        labels, sizes = parallel_label_components(matrix, is_wall, matrix.map_values(int), 5, min_cells=0)
+
+        self.assertEqual([10], sizes)
+        self.assertEqual(0, labels[6])
+
+    def test_small_grids_run_serially(self):
+        matrix = random_grid(3)
+
+        self.assertEqual(matrix.label_components(is_wall, matrix.map_values(int)),
+                         parallel_label_components(matrix, is_wall, matrix.map_values(int), 4))
+
+    def test_automaton_matches_serial_steps(self):
+        matrix = random_grid(4)
+        cells = [int(value == '9') for value in matrix.values()]
+        expected = Automaton(matrix, life, cells)
+        expected.run(12)
+
+        with ParallelAutomaton(matrix, life, cells, workers=3) as sut:
+            sut.run(12)
+            self.assertEqual(expected.values, sut.values)
+            self.assertEqual(expected.steps, sut.steps)
+
+    def test_automaton_skips_quiet_bands(self):
+        # A blinker across the first two bands, a still block in the last one
+        matrix = Matrix(['00000', '01110', '00000', '00000', '00000', '00000', '00110', '00110'])
+        with ParallelAutomaton(matrix, life, matrix.map_values(int), workers=4) as sut:
+            sut.step()
+            self.assertEqual([0, 1, 2], sut.active)
+            sut.run(3)
+            self.assertEqual(matrix.map_values(int), sut.values)
+            sut.write_back()
+            self.assertEqual(4, sut.steps)
+
+    def test_automaton_fallback(self):
+        matrix = random_grid(5)
+        cells = matrix.map_values(int)
+        with parallel_automaton(matrix, life, cells, workers=1, min_cells=0) as single_worker, \
+                parallel_automaton(matrix, life, cells, workers=2) as small_grid, \
+                parallel_automaton(matrix, life, cells, workers=2, min_cells=0) as parallel:
+            self.assertIs(Automaton, type(single_worker))
+            self.assertIs(Automaton, type(small_grid))
+            self.assertIsInstance(parallel, ParallelAutomaton)
@@ -0,0 +1,70 @@
+from random import Random
+from unittest import TestCase
+
+from aocutils.matrix import Matrix, TiledMatrix
+from aocutils.pathfinding import UNREACHED, AStar, Dijkstra, IndexedHeap, manhattan_distance, shortest_paths
+
+RISK_LEVELS = ['1163751742', '1381373672', '2136511328', '3694931569', '7463417111',
+               '1319128137', '1359912421', '3125421639', '1293138521', '2311944581']
+
+
+class RiskGrid(Matrix):
+    def _init_value(self, x, y, value) -> Matrix.Cell:
+        return self._cell_from_value(x, y, int(value))
+
+
+class TestIndexedHeap(TestCase):
+
+    def test_pops_in_priority_order(self):
+        random = Random('heap')
+        priorities = [random.randint(0, 50) for _ in range(200)]
+        sut = IndexedHeap(len(priorities))
+        for node, priority in enumerate(priorities):
+            sut.push(node, priority)
+
+        popped = [sut.pop() for _ in range(len(priorities))]
+        self.assertEqual(sorted(priorities), [priority for _, priority in popped])
+        self.assertEqual(set(range(len(priorities))), {node for node, _ in popped})
+        self.assertEqual(0, len(sut))
+
+    def test_decrease_and_increase_key(self):
+        sut = IndexedHeap(4)
+        for node, priority in enumerate([5, 6, 7, 8]):
+            sut.push(node, priority)
+        sut.push(3, 1)
+        sut.push(0, 9)
+
+        self.assertEqual(4, len(sut))
+        self.assertIn(3, sut)
+        self.assertEqual([(3, 1), (1, 6), (2, 7), (0, 9)], [sut.pop() for _ in range(4)])
+        self.assertNotIn(3, sut)
+
+
+class TestShortestPaths(TestCase):
+
+    def test_flat_graph(self):
+        edges = {0: [1, 2], 1: [3], 2: [3], 3: [], 4: [0]}
+        weights = [0, 5, 1, 1, 1]
+        cost, came_from = shortest_paths(5, 0, edges.__getitem__, weights.__getitem__)
+
+        self.assertEqual([0, 5, 1, 2, UNREACHED], list(cost))
+        self.assertEqual([-1, 0, 0, 2, -1], list(came_from))
+
+    def test_dijkstra_and_astar_agree(self):
+        grid = RiskGrid(RISK_LEVELS, allow_diagonal=False)
+        target = grid.cells[-1]
+        paths = [Dijkstra(grid, grid.cells[0]).find_path_to(target),
+                 AStar(grid, grid.cells[0]).find_path_to(target),
+                 AStar(grid, grid.cells[0]).find_path_to(target, manhattan_distance),
+                 AStar(grid, grid.cells[0]).find_path_to(target, lambda a, b: 0)]
+
+        for path in paths:
+            self.assertEqual(40, sum(cell.value for cell in path[1:]))
+            self.assertEqual((grid.cells[0], target), (path[0], path[-1]))
+
+    def test_lazy_matrix(self):
+        tiled = TiledMatrix(RiskGrid(RISK_LEVELS, allow_diagonal=False), 5,
+                            transform=lambda value, tile_x, tile_y: (value + tile_x + tile_y - 1) % 9 + 1)
+        path = Dijkstra(tiled, tiled.cells[0]).find_path_to(tiled.cells[-1])
+
+        self.assertEqual(315, sum(cell.value for cell in path[1:]))
@@ -0,0 +1,94 @@
+import os
+import pstats
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from aocutils.aoc import Exercise
+from aocutils.profiling import profile, SAMPLING
+from day14 import Day14
+
+EXAMPLE_INPUT = '''NNCB
+
+CH -> B
+HH -> N
+CB -> H
+NH -> C
+HB -> C
+HC -> B
+HN -> C
+NN -> C
+BH -> H
+NC -> B
+NB -> B
+BN -> B
+BB -> N
+BC -> B
+CC -> N
+CN -> C'''
+
+
+def fibonacci(rank: int) -> int:
+    return rank if rank < 2 else fibonacci(rank - 1) + fibonacci(rank - 2)
+
+
+def busy_loop() -> int:
+    total = 0
+    for value in range(300_000):
+        total += value % 7
+    return total
+
+
+class TestProfile(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.prefix = os.path.join(self.directory.name, 'profile', 'fibonacci')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def read_collapsed(self) -> list[str]:
+        with open(self.prefix + '.collapsed') as collapsed_file:
+            return collapsed_file.read().splitlines()
+
+    def test_cprofile(self):
+        self.assertEqual(6765, profile(lambda: fibonacci(20), self.prefix))
+
+        stats = pstats.Stats(self.prefix + '.pstats')
+        self.assertTrue(any(name == 'fibonacci' for _, _, name in stats.stats))
+        collapsed = self.read_collapsed()
+        self.assertTrue(collapsed)
+        for line in collapsed:
+            self.assertRegex(line, r'^\S.* \d+$')
+        self.assertTrue(any('fibonacci (test_profiling.py' in line for line in collapsed))
+
+    def test_sampling(self):
+        profile(busy_loop, self.prefix, SAMPLING, interval=0.0005)
+
+        stats = pstats.Stats(self.prefix + '.pstats')
+        busy_loop_stats = [entry for (_, _, name), entry in stats.stats.items() if name == 'busy_loop']
+        self.assertEqual(1, len(busy_loop_stats))
+        primitive_calls, calls, own_time, cumulative_time, _ = busy_loop_stats[0]
+        self.assertGreater(calls, 0)
+        self.assertLessEqual(own_time, cumulative_time)
+        self.assertGreater(cumulative_time, 0)
+        collapsed = self.read_collapsed()
+        self.assertTrue(any(line.split(';')[-1].startswith('busy_loop') for line in collapsed))
+        self.assertFalse(any('profile (profiling.py' in line for line in collapsed))
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            profile(busy_loop, self.prefix, 'tracing')
+
+
+class TestExerciseProfiling(TestCase):
+
+    def tearDown(self) -> None:
+        Exercise.set_profiling(None)
+
+    def test_solve_part_saves_profiles(self):
+        with TemporaryDirectory() as directory:
+            Exercise.set_profiling(directory)
+
+            self.assertEqual(1588, Day14(EXAMPLE_INPUT.split("\n")).solve_part('part_one'))
+            self.assertEqual({'Day14.part_one.pstats', 'Day14.part_one.collapsed'}, set(os.listdir(directory)))
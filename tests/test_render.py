@@ -0,0 +1,62 @@
+from io import BytesIO, StringIO
+from unittest import TestCase
+
+from aocutils.matrix import Matrix, SparseMatrix, TiledMatrix
+from aocutils.render import ANSI_CLEAR, Animation, value_rows, write_pgm, write_ppm, write_text
+
+
+class DigitGrid(Matrix):
+    def _init_value(self, x, y, value) -> Matrix.Cell:
+        return self._cell_from_value(x, y, int(value))
+
+
+class VentCounts(SparseMatrix):
+    default = 0
+
+
+class TestRender(TestCase):
+
+    def test_write_text(self):
+        for matrix in (Matrix(['123', '456']), SparseMatrix(['#..', '..#']), TiledMatrix(DigitGrid(['12']), 2, 1)):
+            with self.subTest(matrix=type(matrix).__name__):
+                stream = StringIO()
+                write_text(matrix, stream)
+                self.assertEqual(str(matrix) + "\n", stream.getvalue())
+
+    def test_value_rows(self):
+        sparse = VentCounts.from_values({(1, 0): 2, (0, 1): 1}, 3, 2)
+
+        self.assertEqual([[0, 2, 0], [1, 0, 0]], list(value_rows(sparse)))
+        self.assertEqual([[1, 2, 1, 2]], list(value_rows(TiledMatrix(DigitGrid(['12']), 2, 1))))
+
+    def test_write_pgm(self):
+        stream = BytesIO()
+        write_pgm(DigitGrid(['019', '350']), stream)
+
+        self.assertEqual(b'P5\n3 2\n9\n' + bytes([0, 1, 9, 3, 5, 0]), stream.getvalue())
+        stream = BytesIO()
+        write_pgm(VentCounts.from_values({(1, 0): 300}, 2, 1), stream, max_level=255)
+        self.assertEqual(b'P5\n2 1\n255\n' + bytes([0, 255]), stream.getvalue())
+
+    def test_write_ppm(self):
+        stream = BytesIO()
+        write_ppm(SparseMatrix(['#.']), stream, lambda value: (255, 0, 0) if value else (0, 0, 0))
+
+        self.assertEqual(b'P6\n2 1\n255\n' + bytes([255, 0, 0, 0, 0, 0]), stream.getvalue())
+
+    def test_animation_redraws_changed_cells(self):
+        stream = StringIO()
+        matrix = Matrix(['....', '....', '....'])
+        sut = Animation(stream)
+
+        self.assertEqual(12, sut.frame(matrix))
+        self.assertEqual(ANSI_CLEAR + "....\n....\n....\n", stream.getvalue())
+
+        stream.seek(0)
+        stream.truncate()
+        matrix.set_value(1, 1, '#')
+        matrix.set_value(2, 1, '#')
+        matrix.set_value(0, 2, '#')
+        self.assertEqual(3, sut.frame(matrix))
+        self.assertEqual('\x1b[2;2H##\x1b[3;1H#\x1b[4;1H', stream.getvalue())
+        self.assertEqual(2, sut.frames)
@@ -0,0 +1,37 @@
+from unittest import TestCase
+
+from aocutils.days import discover_days, load_exercise
+from aocutils.runner import run_days, solve_day
+from day14 import Day14
+
+
+class TestRunner(TestCase):
+
+    def test_discover_days(self):
+        days = discover_days()
+
+        self.assertEqual('day01', days[1])
+        self.assertEqual(list(range(1, len(days) + 1)), list(days.keys()))
+
+    def test_load_exercise(self):
+        self.assertIs(Day14, load_exercise(14))
+
+    def test_solve_day(self):
+        result = solve_day(6)
+
+        self.assertIsNone(result.error)
+        self.assertEqual('Day06', result.report.exercise)
+        self.assertEqual({'part_one', 'part_two'}, set(result.report.answers.keys()))
+
+    def test_solve_day_with_missing_input(self):
+        result = solve_day(6, input_path='/nonexistent/day06.txt')
+
+        self.assertIsNone(result.report)
+        self.assertIn('FileNotFoundError', result.error)
+
+    def test_run_days(self):
+        report = run_days([14, 6, 6], max_workers=2)
+
+        self.assertEqual([6, 14], [result.day for result in report.results])
+        self.assertTrue(all(result.error is None for result in report.results))
+        self.assertEqual(solve_day(6).report.answers, report.results[0].report.answers)